@@ -0,0 +1,207 @@
+import gzip
+import io
+from typing import Dict, List, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/xml",
+    "application/javascript",
+    "application/problem+json",
+)
+
+
+def available_encodings() -> List[str]:
+    """Content codings this process can produce, most preferred first.
+
+    The order breaks ties between encodings the client accepts equally.
+    """
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate(accept_encoding: str, available: List[str]) -> Optional[str]:
+    """Pick the coding to use from an Accept-Encoding header, or None for identity."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int, zstd_level: int):
+        self.encoding = encoding
+        if encoding == "zstd":
+            self._zstd = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+        elif encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._buffer = io.BytesIO()
+            self._gzip = gzip.GzipFile(mode="wb", fileobj=self._buffer, compresslevel=gzip_level)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "zstd":
+            return self._zstd.compress(data)
+        if self.encoding == "br":
+            return self._brotli.process(data)
+        self._gzip.write(data)
+        return self._drain()
+
+    def flush(self) -> bytes:
+        # Emit buffered output so streamed chunks reach the client promptly
+        if self.encoding == "zstd":
+            return self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        if self.encoding == "br":
+            return self._brotli.flush()
+        self._gzip.flush()
+        return self._drain()
+
+    def finish(self) -> bytes:
+        if self.encoding == "zstd":
+            return self._zstd.flush()
+        if self.encoding == "br":
+            return self._brotli.finish()
+        self._gzip.close()
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+class CompressionMiddleware:
+    """Negotiated zstd/brotli/gzip response compression.
+
+    Responses smaller than ``minimum_size``, already encoded, or of a
+    non-text content type (Arrow/Parquet exports, images) are sent as is.
+    Streaming responses are compressed chunk by chunk.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.zstd_level = zstd_level
+        self.available = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.available)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self, encoding, send).run(scope, receive)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.on_send)
+
+    async def on_send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            # Held back until the first body chunk shows whether to compress
+            self.start = message
+            return
+
+        if message["type"] != "http.response.body" or (self.start is None and self.compressor is None):
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            start, self.start = self.start, None
+            if self.passthrough or (not more_body and len(body) < self.middleware.minimum_size):
+                if not self.passthrough:
+                    MutableHeaders(raw=start["headers"]).add_vary_header("Accept-Encoding")
+                await self.send(start)
+                await self.send(message)
+                self.passthrough = True
+                return
+            self.compressor = _Compressor(
+                self.encoding,
+                self.middleware.gzip_level,
+                self.middleware.brotli_quality,
+                self.middleware.zstd_level,
+            )
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send(start)
+
+        if more_body:
+            data = self.compressor.compress(body) + self.compressor.flush()
+            await self.send({"type": "http.response.body", "body": data, "more_body": True})
+        else:
+            data = self.compressor.compress(body) + self.compressor.finish()
+            await self.send({"type": "http.response.body", "body": data})
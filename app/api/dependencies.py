@@ -0,0 +1,40 @@
+from typing import TYPE_CHECKING, Optional
+from fastapi import Depends, Request
+
+# Only for annotations: importing the container here would load the whole
+# service graph (sqlalchemy, redis, httpx, ...) when app.main is imported.
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from app.core.container import ServiceContainer
+    from app.db.repositories.domain_stats_repository import DomainStatsRepository
+    from app.db.repositories.schedule_repository import ScheduleRepository
+    from app.domain.services.ingest_service import IngestService
+    from app.infrastructure.cache.coalescer import IngestionCoalescer
+
+
+def get_container(request: Request) -> "ServiceContainer":
+    """Return the process-wide service container built by the app lifespan."""
+    return request.app.state.container
+
+
+def get_ingest_service(container: "ServiceContainer" = Depends(get_container)) -> "IngestService":
+    return container.ingest_service
+
+
+def get_coalescer(container: "ServiceContainer" = Depends(get_container)) -> "IngestionCoalescer":
+    return container.coalescer
+
+
+def get_session_factory(container: "ServiceContainer" = Depends(get_container)) -> "Optional[async_sessionmaker]":
+    """Session factory for the result store, or None when persistence is disabled."""
+    return container.session_factory
+
+
+def get_stats_repository(container: "ServiceContainer" = Depends(get_container)) -> "Optional[DomainStatsRepository]":
+    """Aggregate query repository, or None when persistence is disabled."""
+    return container.stats_repository
+
+
+def get_schedule_repository(container: "ServiceContainer" = Depends(get_container)) -> "Optional[ScheduleRepository]":
+    """Recrawl schedule repository, or None when persistence is disabled."""
+    return container.schedule_repository
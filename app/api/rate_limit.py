@@ -0,0 +1,76 @@
+import json
+import math
+from typing import Dict, Iterable
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.api.tenants import get_tenant
+
+# Operational endpoints are never limited
+EXEMPT_PATHS = ("/", "/health", "/ready", "/metrics", "/debug/loop", "/docs", "/redoc", "/openapi.json")
+
+
+class RateLimitMiddleware:
+    """Per-client, cost-weighted rate limiting for the API.
+
+    Clients are identified like the scheduler's tenants (a known API key,
+    else client IP). Each request is charged the cost configured for its
+    ``METHOD /path`` (a cost of 0 or less makes it free and unchecked),
+    and requests over quota get ``429`` with
+    ``Retry-After``. The limiter is the one on the app's service container;
+    without a container (app not started) requests pass through.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        costs: Dict[str, int],
+        default_cost: int = 1,
+        exempt_paths: Iterable[str] = EXEMPT_PATHS,
+    ):
+        self.app = app
+        self.costs = costs
+        self.default_cost = default_cost
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        container = getattr(scope["app"].state, "container", None)
+        limiter = getattr(container, "rate_limiter", None)
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        cost = self.costs.get(f"{scope['method']} {scope['path']}", self.default_cost)
+        if cost <= 0:
+            await self.app(scope, receive, send)
+            return
+        result = await limiter.check(get_tenant(Request(scope)), cost)
+        headers = [
+            (b"x-ratelimit-limit", str(result.limit).encode()),
+            (b"x-ratelimit-remaining", str(max(result.remaining, 0)).encode()),
+            (b"x-ratelimit-reset", str(math.ceil(result.reset_after)).encode()),
+        ]
+
+        if not result.allowed:
+            body = json.dumps({"detail": "Rate limit exceeded"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": headers + [
+                    (b"retry-after", str(max(1, math.ceil(result.retry_after))).encode()),
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
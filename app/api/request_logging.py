@@ -0,0 +1,47 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import structlog
+
+logger = structlog.get_logger("app.access")
+
+
+class RequestLoggingMiddleware:
+    """One access log event per request, written once the response has been sent (or the app failed).
+
+    Pure ASGI so requests do not pay for ``BaseHTTPMiddleware``'s extra task
+    and stream wrapping. Only the path is logged (not the full URL, which
+    would have to be reassembled), and server errors are logged as errors so
+    sampling the ``Request completed`` event never hides them.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            client = scope.get("client")
+            log = logger.error if status_code >= 500 else logger.info
+            log(
+                "Request completed",
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_code,
+                duration_ms=duration_ms,
+                client_ip=client[0] if client else None,
+            )
@@ -0,0 +1,40 @@
+import json
+from typing import Any
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def json_loads(data):
+    """Parse JSON with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson, skipping FastAPI's jsonable_encoder.
+
+    Pydantic models are serialized by pydantic-core directly, and bytes
+    (already encoded JSON, such as cached ingestion payloads) are sent as is.
+    Falls back to the standard library encoder without orjson.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        if orjson is not None:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, default=_default, separators=(",", ":")).encode("utf-8")
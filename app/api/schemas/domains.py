@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+from app.api.schemas.ingest import LinkResponse
+
+
+class DomainStatsResponse(BaseModel):
+    domain: str
+    link_count: int
+    internal_link_count: int
+    external_link_count: int
+    external_ratio: float
+    backlink_count: int
+    first_seen_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
+
+
+class ReferringDomainResponse(BaseModel):
+    backlink_domain: str
+    backlink_count: int
+    first_seen_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
+
+
+class DomainStatsPage(BaseModel):
+    items: List[DomainStatsResponse]
+    next_cursor: Optional[str] = None
+
+
+class ReferringDomainPage(BaseModel):
+    items: List[ReferringDomainResponse]
+    next_cursor: Optional[str] = None
+
+
+class DomainLinkPage(BaseModel):
+    items: List[LinkResponse]
+    next_cursor: Optional[str] = None
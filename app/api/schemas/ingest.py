@@ -7,6 +7,9 @@ class IngestRequest(BaseModel):
     url: HttpUrl = Field(..., description="URL of the page to ingest")
     include_backlinks: bool = Field(default=True, description="Whether to fetch backlinks")
     max_backlinks_per_link: int = Field(default=10, ge=1, le=50, description="Maximum backlinks per link")
+    incremental: bool = Field(default=False, description="Diff against the last stored snapshot and only resolve backlinks for added links")
+    backlink_budget: Optional[int] = Field(default=None, ge=0, le=5000, description="Total backlinks to look up for the page, split across links by score (default JOB_BACKLINK_BUDGET)")
+    backlink_time_budget: Optional[float] = Field(default=None, gt=0, le=3600, description="Seconds to spend on backlink lookups before returning partial results")
 
 
 class LinkResponse(BaseModel):
@@ -25,9 +28,16 @@ class BacklinkResponse(BaseModel):
     backlink_title: Optional[str] = None
     backlink_domain: str
     anchor_text: Optional[str] = None
+    target_url: Optional[str] = None
     created_at: Optional[datetime] = None
 
 
+class LinkDiffResponse(BaseModel):
+    added: List[str]
+    removed: List[str]
+    unchanged: List[str]
+
+
 class IngestResponse(BaseModel):
     job_id: str
     source_url: str
@@ -39,17 +49,20 @@ class IngestResponse(BaseModel):
     created_at: datetime
     completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
+    diff: Optional[LinkDiffResponse] = None
 
 
 class IngestSummaryResponse(BaseModel):
     url: str
     title: Optional[str] = None
     description: Optional[str] = None
+    canonical_url: Optional[str] = None
     total_links_found: int
     external_links: int
     internal_links: int
     content_type: Optional[str] = None
     status_code: Optional[int] = None
+    approximate: bool = Field(default=False, description="Counts cover only the first max_bytes of the page")
 
 
 
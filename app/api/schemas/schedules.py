@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field, HttpUrl
+from typing import List, Optional
+from datetime import datetime
+
+
+class ScheduleRequest(BaseModel):
+    url: HttpUrl = Field(..., description="Source URL to recrawl on a schedule")
+    interval_seconds: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Starting revisit interval; adapted to the page's change rate from then on"
+    )
+
+
+class ScheduleResponse(BaseModel):
+    source_url: str
+    interval_seconds: int
+    next_run_at: datetime
+    change_rate: Optional[float] = None  # Smoothed share of visits that found a change
+    job_id: int  # Job currently carrying the schedule
+    last_crawled_at: Optional[datetime] = None
+
+
+class SchedulePage(BaseModel):
+    items: List[ScheduleResponse]
+    next_cursor: Optional[str] = None
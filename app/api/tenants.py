@@ -0,0 +1,14 @@
+from starlette.requests import Request
+from app.core.config import settings
+
+
+def get_tenant(request: Request) -> str:
+    """Identify the caller for fair scheduling and quotas: a known API key, else client IP.
+
+    Unknown keys are ignored; honouring them would let a client pick a
+    fresh identity, and with it a fresh quota, on every request.
+    """
+    api_key = request.headers.get("x-api-key")
+    if api_key and api_key in settings.api_keys:
+        return f"key:{api_key}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
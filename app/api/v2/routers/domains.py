@@ -0,0 +1,55 @@
+from typing import TYPE_CHECKING, Optional
+from fastapi import APIRouter, Depends, Query
+from app.api.dependencies import get_stats_repository
+from app.api.schemas.domains import (
+    DomainLinkPage,
+    DomainStatsPage,
+    DomainStatsResponse,
+    ReferringDomainPage
+)
+from app.api.v2.services.domain_service import (
+    get_domain_service,
+    list_domain_links_service,
+    list_domains_service,
+    list_referring_domains_service
+)
+import structlog
+
+if TYPE_CHECKING:
+    from app.db.repositories.domain_stats_repository import DomainStatsRepository
+
+logger = structlog.get_logger(__name__)
+router = APIRouter()
+
+@router.get("/", response_model=DomainStatsPage)
+async def list_domains(
+    sort: str = Query(default="links", description="links or backlinks"),
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    repository: "Optional[DomainStatsRepository]" = Depends(get_stats_repository)
+):
+    return await list_domains_service(repository, sort, limit, cursor)
+
+@router.get("/referring", response_model=ReferringDomainPage)
+async def list_referring_domains(
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    repository: "Optional[DomainStatsRepository]" = Depends(get_stats_repository)
+):
+    return await list_referring_domains_service(repository, limit, cursor)
+
+@router.get("/{domain}", response_model=DomainStatsResponse)
+async def get_domain(
+    domain: str,
+    repository: "Optional[DomainStatsRepository]" = Depends(get_stats_repository)
+):
+    return await get_domain_service(repository, domain)
+
+@router.get("/{domain}/links", response_model=DomainLinkPage)
+async def list_domain_links(
+    domain: str,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    repository: "Optional[DomainStatsRepository]" = Depends(get_stats_repository)
+):
+    return await list_domain_links_service(repository, domain, limit, cursor)
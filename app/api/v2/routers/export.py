@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+from fastapi import APIRouter, Depends, Query
+from app.api.dependencies import get_session_factory
+from app.api.v2.services.export_service import export_results_service
+import structlog
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+logger = structlog.get_logger(__name__)
+router = APIRouter()
+
+@router.get("/{kind}")
+async def export_results(
+    kind: str,
+    format: str = Query(default="arrow", description="arrow (IPC stream) or parquet"),
+    job_id: Optional[int] = Query(default=None, description="Only links last seen by this job"),
+    domain: Optional[str] = Query(default=None, description="Link domain (links) or referring domain (backlinks)"),
+    since: Optional[datetime] = Query(default=None, description="Created at or after"),
+    until: Optional[datetime] = Query(default=None, description="Created before"),
+    session_factory: "Optional[async_sessionmaker]" = Depends(get_session_factory)
+):
+    return await export_results_service(session_factory, kind, format, job_id, domain, since, until)
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from typing import TYPE_CHECKING, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from app.api.dependencies import get_coalescer, get_ingest_service
+from app.api.tenants import get_tenant
+from app.api.responses import ORJSONResponse
 from app.api.schemas.ingest import IngestRequest, IngestResponse, IngestSummaryResponse
-from app.domain.services.ingest_service import IngestService
 from app.api.v2.services.ingest_service import (
     ingest_page_service,
     get_ingestion_summary_service,
@@ -8,25 +11,47 @@ from app.api.v2.services.ingest_service import (
     process_async_ingestion_service
 )
 import structlog
-from datetime import datetime
+
+if TYPE_CHECKING:
+    from app.domain.services.ingest_service import IngestService
+    from app.infrastructure.cache.coalescer import IngestionCoalescer
 
 logger = structlog.get_logger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 @router.post("/", response_model=IngestResponse)
-async def ingest_page(request: IngestRequest):
-    return await ingest_page_service(request)
+async def ingest_page(
+    request: IngestRequest,
+    ingest_service: "IngestService" = Depends(get_ingest_service),
+    coalescer: "IngestionCoalescer" = Depends(get_coalescer),
+    tenant: str = Depends(get_tenant)
+):
+    return await ingest_page_service(request, ingest_service, coalescer, tenant)
 
 @router.get("/summary", response_model=IngestSummaryResponse)
-async def get_ingestion_summary(url: str):
-    return await get_ingestion_summary_service(url)
+async def get_ingestion_summary(
+    url: str,
+    max_bytes: Optional[int] = Query(default=None, ge=1, description="Stop reading after this many bytes"),
+    ingest_service: "IngestService" = Depends(get_ingest_service),
+    tenant: str = Depends(get_tenant)
+):
+    return await get_ingestion_summary_service(url, ingest_service, tenant, max_bytes)
 
 @router.post("/async")
-async def ingest_page_async(request: IngestRequest, background_tasks: BackgroundTasks):
-    return await ingest_page_async_service(request, background_tasks)
-
-async def _process_async_ingestion(url: str):
-    await process_async_ingestion_service(url)
-
-
-
+async def ingest_page_async(
+    request: IngestRequest,
+    background_tasks: BackgroundTasks,
+    ingest_service: "IngestService" = Depends(get_ingest_service),
+    coalescer: "IngestionCoalescer" = Depends(get_coalescer),
+    tenant: str = Depends(get_tenant)
+):
+    return await ingest_page_async_service(request, background_tasks, ingest_service, coalescer, tenant)
+
+async def _process_async_ingestion(
+    request: IngestRequest,
+    key: str,
+    ingest_service: "IngestService",
+    coalescer: "IngestionCoalescer",
+    tenant: str
+):
+    await process_async_ingestion_service(request, key, ingest_service, coalescer, tenant)
@@ -0,0 +1,46 @@
+from typing import TYPE_CHECKING, Optional
+from fastapi import APIRouter, Depends, Query
+from app.api.dependencies import get_schedule_repository
+from app.api.schemas.schedules import SchedulePage, ScheduleRequest, ScheduleResponse
+from app.api.v2.services.schedule_service import (
+    get_schedule_service,
+    list_schedules_service,
+    schedule_service,
+    unschedule_service
+)
+import structlog
+
+if TYPE_CHECKING:
+    from app.db.repositories.schedule_repository import ScheduleRepository
+
+logger = structlog.get_logger(__name__)
+router = APIRouter()
+
+@router.put("/", response_model=ScheduleResponse)
+async def schedule_recrawl(
+    request: ScheduleRequest,
+    repository: "Optional[ScheduleRepository]" = Depends(get_schedule_repository)
+):
+    return await schedule_service(repository, request)
+
+@router.get("/", response_model=SchedulePage)
+async def list_schedules(
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    repository: "Optional[ScheduleRepository]" = Depends(get_schedule_repository)
+):
+    return await list_schedules_service(repository, limit, cursor)
+
+@router.get("/lookup", response_model=ScheduleResponse)
+async def get_schedule(
+    url: str = Query(..., description="Scheduled source URL"),
+    repository: "Optional[ScheduleRepository]" = Depends(get_schedule_repository)
+):
+    return await get_schedule_service(repository, url)
+
+@router.delete("/")
+async def unschedule_recrawl(
+    url: str = Query(..., description="Scheduled source URL"),
+    repository: "Optional[ScheduleRepository]" = Depends(get_schedule_repository)
+):
+    return await unschedule_service(repository, url)
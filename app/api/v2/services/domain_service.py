@@ -0,0 +1,122 @@
+import structlog
+from typing import TYPE_CHECKING, Optional
+from fastapi import HTTPException
+from app.api.schemas.domains import (
+    DomainLinkPage,
+    DomainStatsPage,
+    DomainStatsResponse,
+    ReferringDomainPage,
+    ReferringDomainResponse
+)
+from app.api.schemas.ingest import LinkResponse
+from app.db.cursors import InvalidCursor
+
+if TYPE_CHECKING:
+    from app.db.models.domain_stats import DomainStats
+    from app.db.repositories.domain_stats_repository import DomainStatsRepository
+
+logger = structlog.get_logger(__name__)
+
+
+def _require_store(repository: "Optional[DomainStatsRepository]") -> "DomainStatsRepository":
+    if repository is None:
+        raise HTTPException(status_code=503, detail="Result store is not enabled (set PERSIST_RESULTS=true)")
+    return repository
+
+
+def _to_response(row: "DomainStats") -> DomainStatsResponse:
+    return DomainStatsResponse(
+        domain=row.domain,
+        link_count=row.link_count,
+        internal_link_count=row.internal_link_count,
+        external_link_count=row.external_link_count,
+        external_ratio=row.external_link_count / row.link_count if row.link_count else 0.0,
+        backlink_count=row.backlink_count,
+        first_seen_at=row.first_seen_at,
+        last_seen_at=row.last_seen_at
+    )
+
+
+def list_domains_service(
+    repository: "Optional[DomainStatsRepository]",
+    sort: str,
+    limit: int,
+    cursor: Optional[str]
+):
+    async def inner():
+        store = _require_store(repository)
+        if sort not in store.sorts:
+            raise HTTPException(status_code=400, detail=f"Unsupported sort: {sort}")
+        try:
+            rows, next_cursor = await store.list_domains(sort, limit, cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return DomainStatsPage(items=[_to_response(row) for row in rows], next_cursor=next_cursor)
+    return inner()
+
+
+def list_referring_domains_service(
+    repository: "Optional[DomainStatsRepository]",
+    limit: int,
+    cursor: Optional[str]
+):
+    async def inner():
+        store = _require_store(repository)
+        try:
+            rows, next_cursor = await store.list_referring_domains(limit, cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return ReferringDomainPage(
+            items=[
+                ReferringDomainResponse(
+                    backlink_domain=row.backlink_domain,
+                    backlink_count=row.backlink_count,
+                    first_seen_at=row.first_seen_at,
+                    last_seen_at=row.last_seen_at
+                )
+                for row in rows
+            ],
+            next_cursor=next_cursor
+        )
+    return inner()
+
+
+def get_domain_service(repository: "Optional[DomainStatsRepository]", domain: str):
+    async def inner():
+        store = _require_store(repository)
+        row = await store.get_domain(domain)
+        if row is None:
+            raise HTTPException(status_code=404, detail=f"No stored links for domain: {domain}")
+        return _to_response(row)
+    return inner()
+
+
+def list_domain_links_service(
+    repository: "Optional[DomainStatsRepository]",
+    domain: str,
+    limit: int,
+    cursor: Optional[str]
+):
+    async def inner():
+        store = _require_store(repository)
+        try:
+            rows, next_cursor = await store.list_domain_links(domain, limit, cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return DomainLinkPage(
+            items=[
+                LinkResponse(
+                    url=row.url,
+                    title=row.title,
+                    description=row.description,
+                    source_url=row.source_url,
+                    domain=row.domain,
+                    is_external=row.is_external,
+                    link_text=row.link_text,
+                    created_at=row.created_at
+                )
+                for row in rows
+            ],
+            next_cursor=next_cursor
+        )
+    return inner()
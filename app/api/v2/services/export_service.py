@@ -0,0 +1,53 @@
+import structlog
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+logger = structlog.get_logger(__name__)
+
+def export_results_service(
+    session_factory: "Optional[async_sessionmaker]",
+    kind: str,
+    export_format: str,
+    job_id: Optional[int],
+    domain: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime]
+):
+    async def inner():
+        # Loads sqlalchemy and the models; deferred so importing the app stays cheap
+        from app.infrastructure.export.arrow_export import (
+            EXPORT_FORMATS,
+            EXPORT_KINDS,
+            MEDIA_TYPES,
+            ExportFilters,
+            ExportUnavailable,
+            stream_export,
+            require_pyarrow
+        )
+
+        if kind not in EXPORT_KINDS:
+            raise HTTPException(status_code=404, detail=f"Unknown export kind: {kind}")
+        if export_format not in EXPORT_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Unsupported format: {export_format}")
+        if session_factory is None:
+            raise HTTPException(status_code=503, detail="Result store is not enabled (set PERSIST_RESULTS=true)")
+        try:
+            require_pyarrow()
+        except ExportUnavailable as e:
+            raise HTTPException(status_code=501, detail=str(e))
+        
+        logger.info("Starting export", kind=kind, format=export_format, job_id=job_id, domain=domain)
+        filters = ExportFilters(job_id=job_id, domain=domain, since=since, until=until)
+        extension = "arrows" if export_format == "arrow" else "parquet"
+        return StreamingResponse(
+            stream_export(session_factory, kind, export_format, filters, settings.export_batch_size),
+            media_type=MEDIA_TYPES[export_format],
+            headers={"Content-Disposition": f'attachment; filename="{kind}.{extension}"'}
+        )
+    return inner()
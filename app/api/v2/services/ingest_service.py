@@ -1,63 +1,132 @@
 import structlog
 from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 from fastapi import HTTPException, BackgroundTasks
+from app.api.responses import ORJSONResponse, json_loads
 from app.api.schemas.ingest import IngestRequest, IngestResponse, IngestSummaryResponse
-from app.domain.services.ingest_service import IngestService
+from app.core.config import settings
+from app.domain.job_key import make_job_key
+from app.infrastructure.concurrency.scheduler import Priority, job_scope
+
+if TYPE_CHECKING:
+    from app.domain.services.ingest_service import IngestService
+    from app.infrastructure.cache.coalescer import IngestionCoalescer
 
 logger = structlog.get_logger(__name__)
 
-def ingest_page_service(request: IngestRequest):
+def _job_key(request: IngestRequest) -> str:
+    return make_job_key(
+        str(request.url),
+        include_backlinks=request.include_backlinks,
+        max_backlinks_per_link=request.max_backlinks_per_link,
+        incremental=request.incremental,
+        backlink_budget=request.backlink_budget,
+        backlink_time_budget=request.backlink_time_budget,
+    )
+
+def _is_cacheable(payload: str) -> bool:
+    # Failed or partial ingestions are retried by the next caller instead of being replayed
+    response = json_loads(payload)
+    return response["status"] == "completed" and response["error_message"] is None
+
+async def _run_ingestion(request: IngestRequest, job_id: str, ingest_service: "IngestService") -> str:
+    url = str(request.url)
+    result = await ingest_service.ingest_page(
+        url,
+        include_backlinks=request.include_backlinks,
+        max_backlinks_per_link=request.max_backlinks_per_link,
+        incremental=request.incremental,
+        backlink_budget=request.backlink_budget,
+        backlink_time_budget=request.backlink_time_budget
+    )
+    links_response = []
+    for link in result.links:
+        links_response.append({
+            "url": link.url,
+            "title": link.title,
+            "description": link.description,
+            "source_url": link.source_url,
+            "domain": link.domain,
+            "is_external": link.link_type == "external",
+            "link_text": link.link_text,
+            "created_at": link.created_at
+        })
+    backlinks_response = []
+    for backlink in result.backlinks:
+        backlinks_response.append({
+            "backlink_url": backlink.backlink_url,
+            "backlink_title": backlink.backlink_title,
+            "backlink_domain": backlink.backlink_domain,
+            "anchor_text": backlink.anchor_text,
+            "target_url": backlink.target_url,
+            "created_at": backlink.created_at
+        })
+    diff_response = None
+    if result.diff is not None:
+        diff_response = {
+            "added": result.diff.added,
+            "removed": result.diff.removed,
+            "unchanged": result.diff.unchanged
+        }
+    response = IngestResponse(
+        job_id=job_id,
+        source_url=url,
+        status=result.job.status,
+        total_links_found=result.total_links,
+        total_backlinks_found=result.total_backlinks,
+        links=links_response,
+        backlinks=backlinks_response,
+        created_at=result.job.created_at or datetime.now(),
+        completed_at=result.job.completed_at,
+        error_message=result.job.error_message,
+        diff=diff_response
+    )
+    return response.model_dump_json()
+
+async def _coalesced_ingestion(
+    request: IngestRequest,
+    key: str,
+    ingest_service: "IngestService",
+    coalescer: "IngestionCoalescer"
+) -> str:
+    job_id = f"job_{key[:16]}"
+    if not settings.ingest_coalescing_enabled:
+        return await _run_ingestion(request, job_id, ingest_service)
+    return await coalescer.run(
+        key, lambda: _run_ingestion(request, job_id, ingest_service), cacheable=_is_cacheable
+    )
+
+def ingest_page_service(
+    request: IngestRequest,
+    ingest_service: "IngestService",
+    coalescer: "IngestionCoalescer",
+    tenant: str
+):
     async def inner():
         try:
             logger.info("Received ingestion request", url=str(request.url))
-            ingest_service = IngestService()
-            result = await ingest_service.ingest_page(str(request.url))
-            links_response = []
-            for link in result.links:
-                links_response.append({
-                    "url": link.url,
-                    "title": link.title,
-                    "description": link.description,
-                    "source_url": link.source_url,
-                    "domain": link.domain,
-                    "is_external": link.link_type == "external",
-                    "link_text": link.link_text,
-                    "created_at": link.created_at
-                })
-            backlinks_response = []
-            for backlink in result.backlinks:
-                backlinks_response.append({
-                    "backlink_url": backlink.backlink_url,
-                    "backlink_title": backlink.backlink_title,
-                    "backlink_domain": backlink.backlink_domain,
-                    "anchor_text": backlink.anchor_text,
-                    "created_at": backlink.created_at
-                })
-            response = IngestResponse(
-                job_id=f"job_{hash(str(request.url))}",
-                source_url=str(request.url),
-                status=result.job.status,
-                total_links_found=result.total_links,
-                total_backlinks_found=result.total_backlinks,
-                links=links_response,
-                backlinks=backlinks_response,
-                created_at=result.job.created_at or datetime.now(),
-                completed_at=result.job.completed_at,
-                error_message=result.job.error_message
-            )
-            logger.info("Ingestion completed successfully", url=str(request.url), links_found=result.total_links, backlinks_found=result.total_backlinks)
-            return response
+            with job_scope(Priority.INTERACTIVE, tenant):
+                payload = await _coalesced_ingestion(request, _job_key(request), ingest_service, coalescer)
+            response = json_loads(payload)
+            logger.info("Ingestion completed successfully", url=str(request.url), links_found=response["total_links_found"], backlinks_found=response["total_backlinks_found"])
+            # The payload is already an encoded IngestResponse; send it without re-validating
+            return ORJSONResponse(payload.encode("utf-8"))
         except Exception as e:
             logger.error("Error during ingestion", url=str(request.url), error=str(e))
             raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
     return inner()
 
-def get_ingestion_summary_service(url: str):
+def get_ingestion_summary_service(
+    url: str,
+    ingest_service: "IngestService",
+    tenant: str,
+    max_bytes: Optional[int] = None
+):
     async def inner():
         try:
             logger.info("Received summary request", url=url)
-            ingest_service = IngestService()
-            summary = await ingest_service.get_ingestion_summary(url)
+            with job_scope(Priority.INTERACTIVE, tenant):
+                summary = await ingest_service.get_ingestion_summary(url, max_bytes=max_bytes)
             if "error" in summary:
                 raise HTTPException(status_code=400, detail=summary["error"])
             return IngestSummaryResponse(**summary)
@@ -68,12 +137,19 @@ def get_ingestion_summary_service(url: str):
             raise HTTPException(status_code=500, detail=f"Summary generation failed: {str(e)}")
     return inner()
 
-def ingest_page_async_service(request: IngestRequest, background_tasks: BackgroundTasks):
+def ingest_page_async_service(
+    request: IngestRequest,
+    background_tasks: BackgroundTasks,
+    ingest_service: "IngestService",
+    coalescer: "IngestionCoalescer",
+    tenant: str
+):
     async def inner():
         try:
             logger.info("Starting async ingestion", url=str(request.url))
-            job_id = f"async_job_{hash(str(request.url))}"
-            background_tasks.add_task(process_async_ingestion_service, str(request.url))
+            key = _job_key(request)
+            job_id = f"async_job_{key[:16]}"
+            background_tasks.add_task(_run_background_ingestion, request, key, ingest_service, coalescer, tenant)
             return {
                 "job_id": job_id,
                 "status": "queued",
@@ -84,11 +160,23 @@ def ingest_page_async_service(request: IngestRequest, background_tasks: Backgrou
             raise HTTPException(status_code=500, detail=f"Failed to queue job: {str(e)}")
     return inner()
 
-def process_async_ingestion_service(url: str):
+async def _run_background_ingestion(*args):
+    # BackgroundTasks only awaits coroutine functions; the service factory
+    # below is a plain function returning a coroutine.
+    await process_async_ingestion_service(*args)
+
+def process_async_ingestion_service(
+    request: IngestRequest,
+    key: str,
+    ingest_service: "IngestService",
+    coalescer: "IngestionCoalescer",
+    tenant: str
+):
     async def inner():
+        url = str(request.url)
         try:
-            ingest_service = IngestService()
-            await ingest_service.ingest_page(url)
+            with job_scope(Priority.BACKGROUND, tenant):
+                await _coalesced_ingestion(request, key, ingest_service, coalescer)
             logger.info("Async ingestion completed", url=url)
         except Exception as e:
             logger.error("Async ingestion failed", url=url, error=str(e))
@@ -0,0 +1,68 @@
+import structlog
+from typing import TYPE_CHECKING, Optional
+from fastapi import HTTPException
+from app.api.schemas.schedules import SchedulePage, ScheduleRequest, ScheduleResponse
+from app.db.cursors import InvalidCursor
+
+if TYPE_CHECKING:
+    from app.db.models.job import Job
+    from app.db.repositories.schedule_repository import ScheduleRepository
+
+logger = structlog.get_logger(__name__)
+
+
+def _require_store(repository: "Optional[ScheduleRepository]") -> "ScheduleRepository":
+    if repository is None:
+        raise HTTPException(status_code=503, detail="Result store is not enabled (set PERSIST_RESULTS=true)")
+    return repository
+
+
+def _to_response(row: "Job") -> ScheduleResponse:
+    return ScheduleResponse(
+        source_url=row.source_url,
+        interval_seconds=row.recrawl_interval,
+        next_run_at=row.next_run_at,
+        change_rate=row.change_rate,
+        job_id=row.id,
+        last_crawled_at=row.completed_at
+    )
+
+
+def schedule_service(repository: "Optional[ScheduleRepository]", request: ScheduleRequest):
+    async def inner():
+        store = _require_store(repository)
+        row = await store.schedule(str(request.url), request.interval_seconds)
+        logger.info("Recrawl scheduled", url=row.source_url, interval=row.recrawl_interval)
+        return _to_response(row)
+    return inner()
+
+
+def get_schedule_service(repository: "Optional[ScheduleRepository]", url: str):
+    async def inner():
+        store = _require_store(repository)
+        row = await store.get_schedule(url)
+        if row is None:
+            raise HTTPException(status_code=404, detail=f"URL is not scheduled: {url}")
+        return _to_response(row)
+    return inner()
+
+
+def unschedule_service(repository: "Optional[ScheduleRepository]", url: str):
+    async def inner():
+        store = _require_store(repository)
+        if not await store.unschedule(url):
+            raise HTTPException(status_code=404, detail=f"URL is not scheduled: {url}")
+        logger.info("Recrawl unscheduled", url=url)
+        return {"source_url": url, "scheduled": False}
+    return inner()
+
+
+def list_schedules_service(repository: "Optional[ScheduleRepository]", limit: int, cursor: Optional[str]):
+    async def inner():
+        store = _require_store(repository)
+        try:
+            rows, next_cursor = await store.list_schedules(limit, cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return SchedulePage(items=[_to_response(row) for row in rows], next_cursor=next_cursor)
+    return inner()
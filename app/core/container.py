@@ -0,0 +1,200 @@
+from typing import TYPE_CHECKING, List, Optional
+import structlog
+from app.core.config import settings
+
+# The service graph pulls in sqlalchemy, redis, httpx and httpcore. Those are
+# imported in startup() so that importing the app (and with it this module)
+# stays cheap; here they are only needed for annotations.
+if TYPE_CHECKING:
+    import httpx
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from app.db.repositories.domain_stats_repository import DomainStatsRepository
+    from app.db.repositories.ingestion_repository import IngestionRepository
+    from app.db.repositories.schedule_repository import ScheduleRepository
+    from app.domain.services.backlink_service import BacklinkService
+    from app.domain.services.ingest_service import IngestService
+    from app.infrastructure.cache.coalescer import IngestionCoalescer
+    from app.infrastructure.concurrency.limiter import AdaptiveLimiter
+    from app.infrastructure.concurrency.scheduler import JobScheduler
+    from app.infrastructure.dns.resolver import CachingResolver
+    from app.infrastructure.http.fetcher_httpx import HTTPFetcher
+    from app.infrastructure.monitoring.loop_monitor import LoopMonitor
+    from app.infrastructure.ratelimit.gcra import RateLimiter
+    from app.infrastructure.parsers.html import HTMLParser
+    from app.infrastructure.search_providers.base import BacklinkProvider
+
+logger = structlog.get_logger(__name__)
+
+WARM_UP_HTML = (
+    "<html><head><title>warm-up</title>"
+    '<meta name="description" content="warm-up"></head>'
+    '<body><a href="/a">a</a></body></html>'
+)
+
+
+def preload_parsers(html_parser: "Optional[HTMLParser]" = None) -> None:
+    """Load bs4 and the lxml tree builder by parsing a tiny document.
+
+    Both are imported lazily; this pays for them up front, in the API's
+    warm-up or in the Celery parent before it forks its pool.
+    """
+    if html_parser is None:
+        from app.infrastructure.parsers.html import HTMLParser
+        html_parser = HTMLParser()
+    html_parser.parse_links(WARM_UP_HTML, "https://warm-up.invalid/")
+    html_parser.extract_page_metadata(WARM_UP_HTML)
+
+
+class ServiceContainer:
+    """Process-wide service graph.
+
+    Built once at startup and shared by every request, so the connection pool,
+    parsers, providers and caches are reused instead of being rebuilt (and
+    leaked) per call. Usable as an async context manager for one-off scopes
+    such as worker tasks.
+    """
+
+    def __init__(self):
+        self.resolver: "Optional[CachingResolver]" = None
+        self.http_client: "Optional[httpx.AsyncClient]" = None
+        self.fetch_limiter: "Optional[AdaptiveLimiter]" = None
+        self.provider_limiter: "Optional[AdaptiveLimiter]" = None
+        self.fetch_scheduler: "Optional[JobScheduler]" = None
+        self.provider_scheduler: "Optional[JobScheduler]" = None
+        self.http_fetcher: "Optional[HTTPFetcher]" = None
+        self.html_parser: "Optional[HTMLParser]" = None
+        self.backlink_providers: "List[BacklinkProvider]" = []
+        self.backlink_service: "Optional[BacklinkService]" = None
+        self.session_factory: "Optional[async_sessionmaker]" = None
+        self.repository: "Optional[IngestionRepository]" = None
+        self.stats_repository: "Optional[DomainStatsRepository]" = None
+        self.schedule_repository: "Optional[ScheduleRepository]" = None
+        self.ingest_service: "Optional[IngestService]" = None
+        self.coalescer: "Optional[IngestionCoalescer]" = None
+        self.rate_limiter: "Optional[RateLimiter]" = None
+        self.loop_monitor: "Optional[LoopMonitor]" = None
+        self.is_warm = False
+
+    async def startup(self):
+        """Build the shared clients and services."""
+        import httpx
+        from app.db.repositories.domain_stats_repository import DomainStatsRepository
+        from app.db.repositories.ingestion_repository import IngestionRepository
+        from app.db.repositories.schedule_repository import ScheduleRepository
+        from app.db.session import get_session_factory, init_models
+        from app.domain.services.backlink_service import BacklinkService
+        from app.domain.services.ingest_service import IngestService
+        from app.infrastructure.cache.coalescer import IngestionCoalescer
+        from app.infrastructure.concurrency.limiter import build_fetch_limiter, build_provider_limiter
+        from app.infrastructure.concurrency.scheduler import build_fetch_scheduler, build_provider_scheduler
+        from app.infrastructure.dns.happy_eyeballs import build_transport
+        from app.infrastructure.dns.resolver import build_resolver
+        from app.infrastructure.http.fetcher_httpx import HTTPFetcher
+        from app.infrastructure.parsers.html import HTMLParser
+        from app.infrastructure.ratelimit.gcra import build_rate_limiter
+        from app.infrastructure.search_providers.registry import ProviderContext, build_providers
+
+        self.resolver = build_resolver()
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+        )
+        self.http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.http_timeout),
+            limits=limits,
+            transport=build_transport(self.resolver, limits, delay=settings.happy_eyeballs_delay),
+        )
+        self.fetch_limiter = build_fetch_limiter()
+        self.provider_limiter = build_provider_limiter()
+        self.fetch_scheduler = build_fetch_scheduler()
+        self.provider_scheduler = build_provider_scheduler()
+        self.http_fetcher = HTTPFetcher(
+            client=self.http_client,
+            limiter=self.fetch_limiter,
+            scheduler=self.fetch_scheduler,
+        )
+        self.html_parser = HTMLParser(client=self.http_client)
+
+        self.backlink_providers = build_providers(ProviderContext(
+            http_client=self.http_client,
+            http_fetcher=self.http_fetcher,
+            html_parser=self.html_parser,
+        ))
+        self.backlink_service = BacklinkService(
+            providers=self.backlink_providers,
+            limiter=self.provider_limiter,
+            scheduler=self.provider_scheduler,
+        )
+
+        if settings.persist_results:
+            try:
+                await init_models()
+                self.session_factory = get_session_factory()
+                self.repository = IngestionRepository(self.session_factory)
+                self.stats_repository = DomainStatsRepository(self.session_factory)
+                self.schedule_repository = ScheduleRepository(self.session_factory)
+            except Exception as e:
+                # Serve ingestions without persistence rather than failing startup
+                logger.error("Result store unavailable, persistence disabled", error=str(e))
+
+        self.ingest_service = IngestService(
+            http_fetcher=self.http_fetcher,
+            html_parser=self.html_parser,
+            backlink_service=self.backlink_service,
+            repository=self.repository,
+        )
+        self.coalescer = IngestionCoalescer(
+            settings.redis_url,
+            result_ttl=settings.ingest_result_ttl,
+            lock_ttl=settings.ingest_lock_ttl,
+            wait_timeout=settings.ingest_lock_wait_timeout,
+        )
+        if settings.rate_limit_enabled:
+            self.rate_limiter = build_rate_limiter()
+        logger.info("Service container started", providers=len(self.backlink_providers))
+
+    async def warm_up(self):
+        """Pay one-off initialization costs before the first request does.
+
+        Sets is_warm, which readiness reports, once parsers are loaded and
+        the Redis pool has a connection.
+        """
+        preload_parsers(self.html_parser)
+        if settings.ingest_coalescing_enabled:
+            await self.coalescer.warm_up()
+        self.is_warm = True
+        logger.info("Service container warmed up")
+
+    def start_loop_monitor(self):
+        """Watch this process's event loop for stalls (long-lived processes only)."""
+        from app.infrastructure.monitoring.loop_monitor import build_loop_monitor
+        self.loop_monitor = build_loop_monitor()
+        self.loop_monitor.start()
+
+    async def shutdown(self):
+        """Close every resource opened by startup()."""
+        self.is_warm = False
+        if self.loop_monitor is not None:
+            await self.loop_monitor.stop()
+            self.loop_monitor = None
+        if self.coalescer is not None:
+            await self.coalescer.close()
+        if self.rate_limiter is not None:
+            await self.rate_limiter.close()
+        for provider in self.backlink_providers:
+            await provider.close()
+        if self.http_client is not None:
+            await self.http_client.aclose()
+        if self.resolver is not None:
+            await self.resolver.close()
+        if self.repository is not None:
+            from app.db.session import dispose_engine
+            await dispose_engine()
+        logger.info("Service container stopped")
+
+    async def __aenter__(self) -> "ServiceContainer":
+        await self.startup()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.shutdown()
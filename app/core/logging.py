@@ -0,0 +1,240 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from typing import Any, BinaryIO, Dict, List, Mapping, Optional, Union
+
+import structlog
+
+from app.core.config import settings
+from app.core.metrics import LOG_EVENTS_DROPPED
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Levels that are never sampled away or dropped on a full queue
+_ALWAYS_KEPT = frozenset({"warning", "warn", "error", "exception", "critical", "fatal"})
+
+
+def add_logger_name(logger, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    name = getattr(logger, "name", None)
+    if name:
+        event_dict["logger"] = name
+    return event_dict
+
+
+class EventSampler:
+    """Processor keeping only a fraction of selected debug/info events.
+
+    ``rates`` maps event names to the share kept (0.0-1.0). Kept events carry
+    ``sample_rate`` so counts can be scaled back up. Warnings and errors are
+    never sampled.
+    """
+
+    def __init__(self, rates: Mapping[str, float], rng: Optional[random.Random] = None):
+        self.rates = {event: max(0.0, min(1.0, float(rate))) for event, rate in rates.items()}
+        self._random = (rng or random.Random()).random
+
+    def __call__(self, logger, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        if method_name in _ALWAYS_KEPT:
+            return event_dict
+        rate = self.rates.get(event_dict.get("event"))
+        if rate is None or rate >= 1.0:
+            return event_dict
+        if rate <= 0.0 or self._random() >= rate:
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = rate
+        return event_dict
+
+
+def _json_default(value: Any) -> str:
+    return str(value)
+
+
+def render_json(logger, method_name: str, event_dict: Dict[str, Any]) -> bytes:
+    """Final processor: one JSON document as bytes, via orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(event_dict, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(event_dict, default=_json_default).encode("utf-8")
+
+
+class QueueLogWriter:
+    """Writes rendered log lines from a background thread.
+
+    The event loop only pays for a queue put. When the queue is full,
+    debug/info lines are dropped at once; warnings and errors wait up to
+    ``put_timeout`` for room and are dropped after that, so an error storm
+    delays the loop by at most that much per line. Drops are counted.
+    """
+
+    def __init__(self, stream: Optional[BinaryIO] = None, maxsize: int = 10000, put_timeout: float = 0.05):
+        self.stream = stream if stream is not None else sys.stdout.buffer
+        self.maxsize = maxsize
+        self.put_timeout = put_timeout
+        self._start()
+
+    def _start(self) -> None:
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=self.maxsize)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def after_fork(self) -> None:
+        """Give a forked child (e.g. a prefork Celery worker) its own queue and writer thread.
+
+        Threads do not survive fork, and the inherited queue may hold the
+        parent's lines or a lock taken by the parent's writer.
+        """
+        self._start()
+
+    def put(self, line: bytes, block: bool) -> None:
+        try:
+            if block:
+                self._queue.put(line, timeout=self.put_timeout)
+            else:
+                self._queue.put_nowait(line)
+        except queue.Full:
+            LOG_EVENTS_DROPPED.labels("kept" if block else "droppable").inc()
+
+    def _run(self) -> None:
+        while True:
+            line = self._queue.get()
+            if line is None:
+                return
+            lines = [line]
+            # Batch whatever else is already queued into a single write
+            while len(lines) < 512:
+                try:
+                    line = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if line is None:
+                    self._write(lines)
+                    return
+                lines.append(line)
+            self._write(lines)
+
+    def _write(self, lines) -> None:
+        try:
+            self.stream.write(b"\n".join(lines) + b"\n")
+            self.stream.flush()
+        except (OSError, ValueError):
+            pass
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush queued lines and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+
+class _BytesLogger:
+    """structlog logger handing rendered lines to the current writer.
+
+    The writer is looked up per call so loggers cached before a
+    reconfiguration keep working.
+    """
+
+    def __init__(self, name: Optional[str] = None, *args: Any):
+        self.name = name
+
+    def _droppable(self, message: bytes) -> None:
+        if _writer is not None:
+            _writer.put(message, block=False)
+
+    def _kept(self, message: bytes) -> None:
+        if _writer is not None:
+            _writer.put(message, block=True)
+
+    debug = info = msg = _droppable
+    warning = warn = error = exception = critical = fatal = _kept
+
+
+class _SyncWriter:
+    """Writes lines inline; used when LOG_ASYNC is off."""
+
+    def __init__(self, stream: Optional[BinaryIO] = None):
+        self.stream = stream if stream is not None else sys.stdout.buffer
+        self._lock = threading.Lock()
+
+    def put(self, line: bytes, block: bool) -> None:
+        with self._lock:
+            self.stream.write(line + b"\n")
+            self.stream.flush()
+
+    def after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+    def close(self, timeout: float = 5.0) -> None:
+        pass
+
+
+LogWriter = Union[QueueLogWriter, _SyncWriter]
+
+_writer: Optional[LogWriter] = None
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    sample_rates: Optional[Mapping[str, float]] = None,
+    async_writer: Optional[bool] = None,
+    stream: Optional[BinaryIO] = None,
+) -> None:
+    """Configure structlog for the API and worker processes.
+
+    Calls below the configured level are no-ops on the bound logger, so no
+    event dict is built and no processor runs for them. Events that pass are
+    sampled, rendered to JSON and handed to the writer thread.
+    """
+    global _writer
+
+    level = (level or settings.log_level).upper()
+    sample_rates = settings.log_sample_rates if sample_rates is None else sample_rates
+    async_writer = settings.log_async if async_writer is None else async_writer
+
+    if _writer is not None:
+        _writer.close()
+    if async_writer:
+        _writer = QueueLogWriter(stream, maxsize=settings.log_queue_size, put_timeout=settings.log_put_timeout)
+    else:
+        _writer = _SyncWriter(stream)
+
+    processors: List[Any] = [structlog.contextvars.merge_contextvars]
+    if sample_rates:
+        processors.append(EventSampler(sample_rates))
+    processors += [
+        add_logger_name,
+        structlog.processors.add_log_level,
+        structlog.processors.TimeStamper(fmt="iso", utc=True),
+        structlog.processors.StackInfoRenderer(),
+        structlog.processors.format_exc_info,
+        render_json,
+    ]
+
+    structlog.configure(
+        processors=processors,
+        context_class=dict,
+        logger_factory=_BytesLogger,
+        wrapper_class=structlog.make_filtering_bound_logger(logging.getLevelName(level)),
+        cache_logger_on_first_use=True,
+    )
+
+
+def shutdown_logging() -> None:
+    """Flush and stop the log writer; registered to run at interpreter exit."""
+    if _writer is not None:
+        _writer.close()
+
+
+def _after_fork_in_child() -> None:
+    if _writer is not None:
+        _writer.after_fork()
+
+
+atexit.register(shutdown_logging)
+os.register_at_fork(after_in_child=_after_fork_in_child)
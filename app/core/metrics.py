@@ -0,0 +1,92 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# Adaptive concurrency
+CONCURRENCY_LIMIT = Gauge(
+    "link_ingestor_concurrency_limit",
+    "Current adaptive concurrency limit",
+    ["limiter", "key"],
+)
+CONCURRENCY_IN_FLIGHT = Gauge(
+    "link_ingestor_concurrency_in_flight",
+    "Requests currently holding an adaptive concurrency slot",
+    ["limiter", "key"],
+)
+CONCURRENCY_DROPS = Counter(
+    "link_ingestor_concurrency_drops_total",
+    "Samples that made an adaptive limiter back off",
+    ["limiter", "reason"],
+)
+CONCURRENCY_LATENCY = Histogram(
+    "link_ingestor_concurrency_latency_seconds",
+    "Latency of calls made under an adaptive limiter",
+    ["limiter"],
+)
+
+# Job scheduling
+SCHEDULER_QUEUE_DEPTH = Gauge(
+    "link_ingestor_scheduler_queue_depth",
+    "Work units waiting for scheduler capacity",
+    ["scheduler", "priority"],
+)
+SCHEDULER_WAIT = Histogram(
+    "link_ingestor_scheduler_wait_seconds",
+    "Time work units spent queued before being admitted",
+    ["scheduler", "priority"],
+)
+SCHEDULER_BUDGET_EXHAUSTED = Counter(
+    "link_ingestor_scheduler_budget_exhausted_total",
+    "Jobs that ran out of fetch or wall-time budget",
+    ["priority", "reason"],
+)
+
+# DNS resolution
+DNS_LOOKUPS = Counter(
+    "link_ingestor_dns_lookups_total",
+    "Hostname lookups by cache outcome (hit, negative_hit, miss, error)",
+    ["result"],
+)
+DNS_LATENCY = Histogram(
+    "link_ingestor_dns_resolve_seconds",
+    "Latency of hostname lookups that missed the cache",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+DNS_CACHE_ENTRIES = Gauge(
+    "link_ingestor_dns_cache_entries",
+    "Hostnames currently held in the DNS cache",
+)
+DNS_CONNECT_ATTEMPTS = Counter(
+    "link_ingestor_dns_connect_attempts_total",
+    "TCP connection attempts made while racing resolved addresses",
+    ["family", "outcome"],
+)
+
+# API rate limiting
+RATE_LIMIT_DECISIONS = Counter(
+    "link_ingestor_rate_limit_decisions_total",
+    "Rate limit checks by outcome (allowed, limited, local_allow, local_deny)",
+    ["result"],
+)
+
+# Logging
+LOG_EVENTS_DROPPED = Counter(
+    "link_ingestor_log_events_dropped_total",
+    "Log lines dropped because the log writer queue was full, by level class",
+    ["level"],
+)
+
+# Event loop health
+LOOP_LAG = Histogram(
+    "link_ingestor_event_loop_lag_seconds",
+    "How late the event loop ran a timer scheduled by the loop monitor",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+LOOP_STALLS = Counter(
+    "link_ingestor_event_loop_stalls_total",
+    "Event loop stalls over the monitor threshold, by blocking call site",
+    ["site"],
+)
+LOOP_STALL_SECONDS = Counter(
+    "link_ingestor_event_loop_stall_seconds_total",
+    "Time the event loop spent stalled, by blocking call site",
+    ["site"],
+)
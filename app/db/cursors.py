@@ -0,0 +1,27 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Sequence, Tuple
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(*values: Any) -> str:
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> Tuple[Any, ...]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if len(payload) != len(types):
+            raise ValueError("wrong cursor length")
+        return tuple(
+            datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for kind, value in zip(types, payload)
+        )
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
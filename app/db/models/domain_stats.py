@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from app.db.base import Base
+
+
+class DomainStats(Base):
+    """Per-domain link aggregates, maintained incrementally as jobs commit."""
+    __tablename__ = "domain_stats"
+    
+    domain = Column(String(255), primary_key=True)
+    link_count = Column(Integer, nullable=False, default=0)  # Active links pointing into the domain
+    internal_link_count = Column(Integer, nullable=False, default=0)
+    external_link_count = Column(Integer, nullable=False, default=0)
+    backlink_count = Column(Integer, nullable=False, default=0)  # Stored backlinks to the domain's links
+    first_seen_at = Column(DateTime(timezone=True), nullable=True)
+    last_seen_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Indexes for keyset pagination, in listing order (count descending, then domain)
+    __table_args__ = (
+        Index('idx_domain_stats_link_count', link_count.desc(), domain),
+        Index('idx_domain_stats_backlink_count', backlink_count.desc(), domain),
+    )
+
+
+class ReferringDomainStats(Base):
+    """Per-domain counts of stored backlinks originating from that domain."""
+    __tablename__ = "referring_domain_stats"
+    
+    backlink_domain = Column(String(255), primary_key=True)
+    backlink_count = Column(Integer, nullable=False, default=0)
+    first_seen_at = Column(DateTime(timezone=True), nullable=True)
+    last_seen_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Index for keyset pagination, in listing order (count descending, then domain)
+    __table_args__ = (
+        Index('idx_referring_domain_stats_count', backlink_count.desc(), backlink_domain),
+    )
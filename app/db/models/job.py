@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Index
+from sqlalchemy import Column, Integer, Float, String, Text, DateTime, Enum, Index
 from sqlalchemy.sql import func
 import enum
 from app.db.base import Base
@@ -20,14 +20,22 @@ class Job(Base):
     total_links_found = Column(Integer, default=0)
     total_backlinks_found = Column(Integer, default=0)
     error_message = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the fetched page body
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    # Recrawl schedule, carried forward to each new job of a scheduled source URL;
+    # only the latest job of a scheduled URL has next_run_at set
+    next_run_at = Column(DateTime(timezone=True), nullable=True)
+    recrawl_interval = Column(Integer, nullable=True)  # Seconds between visits
+    change_rate = Column(Float, nullable=True)  # Smoothed share of visits that found a change
+    
     # Indexes for performance
     __table_args__ = (
         Index('idx_jobs_status', 'status'),
         Index('idx_jobs_created', 'created_at'),
         Index('idx_jobs_source_url', 'source_url'),
+        Index('idx_jobs_next_run_at', 'next_run_at'),
     )
 
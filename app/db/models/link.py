@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 
@@ -14,13 +15,20 @@ class Link(Base):
     domain = Column(String(255), nullable=False, index=True)
     is_external = Column(Boolean, default=False, index=True)
     link_text = Column(Text, nullable=True)  # Anchor text
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=True, index=True)  # Last job that saw this link
+    last_seen_at = Column(DateTime(timezone=True), nullable=True)
+    removed_at = Column(DateTime(timezone=True), nullable=True)  # Set when the link disappears from the source page
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Relationship
+    backlinks = relationship("Backlink", back_populates="link")
+    
     # Indexes for performance
     __table_args__ = (
         Index('idx_links_domain_created', 'domain', 'created_at'),
         Index('idx_links_source_url', 'source_url'),
         Index('idx_links_url_hash', 'url'),
+        Index('idx_links_source_url_url', 'source_url', 'url', unique=True),
     )
 
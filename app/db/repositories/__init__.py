@@ -0,0 +1 @@
+# Repositories module initialization
@@ -0,0 +1,150 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, Set
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models.backlink import Backlink as BacklinkModel
+from app.db.models.domain_stats import DomainStats, ReferringDomainStats
+from app.db.models.link import Link as LinkModel
+
+LINK_COUNTERS = ("link_count", "internal_link_count", "external_link_count", "backlink_count")
+
+
+class AggregateDeltas:
+    """Counter changes accumulated while a job's rows are written."""
+
+    def __init__(self):
+        self.domains: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(LINK_COUNTERS, 0))
+        self.referring_domains: Dict[str, int] = defaultdict(int)
+        self.seen_domains: Set[str] = set()
+        self.seen_referring_domains: Set[str] = set()
+
+    def link(self, domain: str, is_external: bool, delta: int):
+        counters = self.domains[domain]
+        counters["link_count"] += delta
+        counters["external_link_count" if is_external else "internal_link_count"] += delta
+
+    def backlink(self, target_domain: str, backlink_domain: str, delta: int):
+        self.domains[target_domain]["backlink_count"] += delta
+        self.referring_domains[backlink_domain] += delta
+        if delta > 0:
+            self.seen_referring_domains.add(backlink_domain)
+
+    def see_domains(self, domains: Iterable[str]):
+        self.seen_domains.update(domains)
+        for domain in domains:
+            # Touch so last_seen_at is refreshed even when counts do not change
+            self.domains[domain]
+
+
+def _insert(session: AsyncSession, model):
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"Aggregate upserts are not implemented for {dialect}")
+
+
+async def apply_deltas(session: AsyncSession, deltas: AggregateDeltas, now: datetime):
+    """Fold one job's counter changes into the aggregate tables with bulk upserts."""
+    # Sorted keys give concurrent jobs a consistent lock order
+    if deltas.domains:
+        rows = [
+            dict(
+                domain=domain,
+                first_seen_at=now,
+                last_seen_at=now if domain in deltas.seen_domains else None,
+                **counters
+            )
+            for domain, counters in sorted(deltas.domains.items())
+        ]
+        stmt = _insert(session, DomainStats).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DomainStats.domain],
+            set_={
+                **{
+                    name: getattr(DomainStats, name) + getattr(stmt.excluded, name)
+                    for name in LINK_COUNTERS
+                },
+                "last_seen_at": func.coalesce(stmt.excluded.last_seen_at, DomainStats.last_seen_at),
+            }
+        )
+        await session.execute(stmt)
+
+    if deltas.referring_domains:
+        rows = [
+            dict(
+                backlink_domain=domain,
+                backlink_count=count,
+                first_seen_at=now,
+                last_seen_at=now if domain in deltas.seen_referring_domains else None
+            )
+            for domain, count in sorted(deltas.referring_domains.items())
+        ]
+        stmt = _insert(session, ReferringDomainStats).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ReferringDomainStats.backlink_domain],
+            set_={
+                "backlink_count": ReferringDomainStats.backlink_count + stmt.excluded.backlink_count,
+                "last_seen_at": func.coalesce(
+                    stmt.excluded.last_seen_at, ReferringDomainStats.last_seen_at
+                ),
+            }
+        )
+        await session.execute(stmt)
+
+
+async def rebuild_aggregates(session: AsyncSession):
+    """Recompute both aggregate tables from scratch (backfill or repair)."""
+    await session.execute(delete(DomainStats))
+    await session.execute(delete(ReferringDomainStats))
+
+    active = LinkModel.removed_at.is_(None)
+    backlink_counts = (
+        select(LinkModel.domain, func.count(BacklinkModel.id).label("backlink_count"))
+        .join(BacklinkModel, BacklinkModel.link_id == LinkModel.id)
+        .where(active)
+        .group_by(LinkModel.domain)
+        .subquery()
+    )
+    link_stats = (
+        select(
+            LinkModel.domain,
+            func.count(LinkModel.id),
+            func.sum(case((LinkModel.is_external, 0), else_=1)),
+            func.sum(case((LinkModel.is_external, 1), else_=0)),
+            func.coalesce(func.max(backlink_counts.c.backlink_count), 0),
+            func.min(LinkModel.created_at),
+            func.max(func.coalesce(LinkModel.last_seen_at, LinkModel.created_at)),
+        )
+        .outerjoin(backlink_counts, backlink_counts.c.domain == LinkModel.domain)
+        .where(active)
+        .group_by(LinkModel.domain)
+    )
+    await session.execute(
+        DomainStats.__table__.insert().from_select(
+            ["domain", "link_count", "internal_link_count", "external_link_count",
+             "backlink_count", "first_seen_at", "last_seen_at"],
+            link_stats
+        )
+    )
+
+    referring_stats = (
+        select(
+            BacklinkModel.backlink_domain,
+            func.count(BacklinkModel.id),
+            func.min(BacklinkModel.created_at),
+            func.max(BacklinkModel.created_at),
+        )
+        .join(LinkModel, BacklinkModel.link_id == LinkModel.id)
+        .where(active)
+        .group_by(BacklinkModel.backlink_domain)
+    )
+    await session.execute(
+        ReferringDomainStats.__table__.insert().from_select(
+            ["backlink_domain", "backlink_count", "first_seen_at", "last_seen_at"],
+            referring_stats
+        )
+    )
@@ -0,0 +1,112 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, or_, select, tuple_
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.db.models.domain_stats import DomainStats, ReferringDomainStats
+from app.db.models.link import Link as LinkModel
+from app.db.cursors import decode_cursor, encode_cursor
+
+DOMAIN_SORTS = {
+    "links": DomainStats.link_count,
+    "backlinks": DomainStats.backlink_count,
+}
+
+
+def after_cursor(count, name, last_count: int, last_name: str):
+    """Rows after (last_count, last_name) in (count DESC, name ASC) order.
+
+    Mixed directions cannot be written as one row-value comparison. The
+    leading ``count <= last_count`` bound lets the index on
+    (count DESC, name) start its scan right at the cursor; the OR then
+    skips the already-served names that share last_count.
+    """
+    return and_(
+        count <= last_count,
+        or_(count < last_count, name > last_name),
+    )
+
+
+class DomainStatsRepository:
+    """Read side for the per-domain aggregate tables and links by domain.
+
+    Every listing uses keyset pagination over an indexed sort key, so the
+    cost of a page does not depend on how deep into the result it is. Each
+    page returns the cursor for the next one, or None on the last page.
+    """
+
+    # Sort names list_domains accepts
+    sorts = frozenset(DOMAIN_SORTS)
+
+    def __init__(self, session_factory: async_sessionmaker):
+        self.session_factory = session_factory
+
+    async def get_domain(self, domain: str) -> Optional[DomainStats]:
+        async with self.session_factory() as session:
+            return await session.get(DomainStats, domain)
+
+    async def list_domains(
+        self,
+        sort: str = "links",
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[DomainStats], Optional[str]]:
+        """Domains by descending link or backlink count (ties by domain name)."""
+        count = DOMAIN_SORTS[sort]
+        query = select(DomainStats).where(count > 0)
+        if cursor:
+            last_count, last_domain = decode_cursor(cursor, (int, str))
+            query = query.where(after_cursor(count, DomainStats.domain, last_count, last_domain))
+        query = query.order_by(count.desc(), DomainStats.domain).limit(limit + 1)
+
+        async with self.session_factory() as session:
+            rows = list((await session.execute(query)).scalars())
+        return self._page(rows, limit, lambda row: (getattr(row, count.key), row.domain))
+
+    async def list_referring_domains(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[ReferringDomainStats], Optional[str]]:
+        """Referring domains by descending stored backlink count."""
+        count = ReferringDomainStats.backlink_count
+        query = select(ReferringDomainStats).where(count > 0)
+        if cursor:
+            last_count, last_domain = decode_cursor(cursor, (int, str))
+            query = query.where(
+                after_cursor(count, ReferringDomainStats.backlink_domain, last_count, last_domain)
+            )
+        query = query.order_by(count.desc(), ReferringDomainStats.backlink_domain).limit(limit + 1)
+
+        async with self.session_factory() as session:
+            rows = list((await session.execute(query)).scalars())
+        return self._page(rows, limit, lambda row: (row.backlink_count, row.backlink_domain))
+
+    async def list_domain_links(
+        self,
+        domain: str,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[LinkModel], Optional[str]]:
+        """Active links into domain, newest first (served by idx_links_domain_created)."""
+        query = select(LinkModel).where(
+            LinkModel.domain == domain,
+            LinkModel.removed_at.is_(None)
+        )
+        if cursor:
+            last_created, last_id = decode_cursor(cursor, (datetime, int))
+            query = query.where(
+                tuple_(LinkModel.created_at, LinkModel.id) < tuple_(last_created, last_id)
+            )
+        query = query.order_by(LinkModel.created_at.desc(), LinkModel.id.desc()).limit(limit + 1)
+
+        async with self.session_factory() as session:
+            rows = list((await session.execute(query)).scalars())
+        return self._page(rows, limit, lambda row: (row.created_at, row.id))
+
+    @staticmethod
+    def _page(rows: list, limit: int, key) -> Tuple[list, Optional[str]]:
+        # One extra row is fetched to tell whether another page exists
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(*key(rows[-1]))
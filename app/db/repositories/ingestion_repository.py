@@ -0,0 +1,178 @@
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.db.models.backlink import Backlink as BacklinkModel
+from app.db.models.job import Job as JobModel, JobStatus
+from app.db.models.link import Link as LinkModel
+from app.db.repositories.aggregates import AggregateDeltas, apply_deltas
+from app.db.repositories.schedule_repository import carry_schedule
+from app.domain.services.recrawl_policy import RecrawlPolicy, build_recrawl_policy
+from app.domain.entities import Backlink, IngestionResult, Link, LinkSnapshot, LinkType
+
+
+class IngestionRepository:
+    """Stores ingestion results and serves the last link snapshot per source URL.
+
+    Links are kept as one row per (source_url, url). Re-ingesting a page
+    refreshes the rows it still links to and stamps ``removed_at`` on the ones
+    that disappeared, so the active rows always form the latest snapshot.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, recrawl_policy: Optional[RecrawlPolicy] = None):
+        self.session_factory = session_factory
+        self.recrawl_policy = recrawl_policy or build_recrawl_policy()
+
+    async def load_snapshot(self, source_url: str) -> Optional[LinkSnapshot]:
+        """Return the active links and backlinks last stored for source_url."""
+        async with self.session_factory() as session:
+            link_rows = (await session.execute(
+                select(LinkModel).where(
+                    LinkModel.source_url == source_url,
+                    LinkModel.removed_at.is_(None)
+                )
+            )).scalars().all()
+            if not link_rows:
+                return None
+
+            backlink_rows = (await session.execute(
+                select(BacklinkModel, LinkModel.url)
+                .join(LinkModel, BacklinkModel.link_id == LinkModel.id)
+                .where(
+                    LinkModel.source_url == source_url,
+                    LinkModel.removed_at.is_(None)
+                )
+            )).all()
+
+        links = {row.url: self._to_link(row) for row in link_rows}
+        backlinks: Dict[str, List[Backlink]] = {url: [] for url in links}
+        for row, target_url in backlink_rows:
+            backlinks[target_url].append(Backlink(
+                backlink_url=row.backlink_url,
+                backlink_title=row.backlink_title,
+                backlink_domain=row.backlink_domain,
+                anchor_text=row.anchor_text,
+                target_url=target_url,
+                created_at=row.created_at
+            ))
+        return LinkSnapshot(source_url=source_url, links=links, backlinks=backlinks)
+
+    async def save_result(
+        self,
+        result: IngestionResult,
+        refreshed_urls: Iterable[str]
+    ) -> int:
+        """Persist a job and its link snapshot; returns the new job id.
+
+        Backlinks are only replaced for ``refreshed_urls`` (links whose
+        backlinks were resolved by this run); stored backlinks for every
+        other link are left untouched, except for links that disappeared,
+        whose backlinks are dropped with them. The per-domain aggregate
+        tables and, for scheduled URLs, the recrawl schedule are updated in
+        the same transaction.
+        """
+        source_url = result.job.source_url
+        refreshed = set(refreshed_urls)
+        now = datetime.now(timezone.utc)
+        deltas = AggregateDeltas()
+        links_changed = False
+
+        async with self.session_factory() as session, session.begin():
+            job_row = JobModel(
+                source_url=source_url,
+                status=JobStatus(result.job.status),
+                total_links_found=result.total_links,
+                total_backlinks_found=result.total_backlinks,
+                error_message=result.job.error_message,
+                content_hash=result.job.content_hash,
+                started_at=result.job.started_at,
+                completed_at=result.job.completed_at
+            )
+            session.add(job_row)
+            await session.flush()
+
+            existing = {
+                row.url: row
+                for row in (await session.execute(
+                    select(LinkModel).where(LinkModel.source_url == source_url)
+                )).scalars()
+            }
+
+            rows_by_url: Dict[str, LinkModel] = {}
+            for link in result.links:
+                row = existing.get(link.url)
+                is_external = link.link_type == LinkType.EXTERNAL
+                if row is None:
+                    row = LinkModel(url=link.url, source_url=source_url)
+                    session.add(row)
+                    deltas.link(link.domain or "", is_external, 1)
+                    links_changed = True
+                elif row.removed_at is not None:
+                    deltas.link(link.domain or "", is_external, 1)
+                    links_changed = True
+                row.title = link.title
+                row.description = link.description
+                row.domain = link.domain or ""
+                row.is_external = is_external
+                row.link_text = link.link_text
+                row.job_id = job_row.id
+                row.last_seen_at = now
+                row.removed_at = None
+                rows_by_url[link.url] = row
+            deltas.see_domains({row.domain for row in rows_by_url.values()})
+
+            removed_ids = []
+            for url, row in existing.items():
+                if url not in rows_by_url and row.removed_at is None:
+                    row.removed_at = now
+                    removed_ids.append(row.id)
+                    deltas.link(row.domain, row.is_external, -1)
+                    links_changed = True
+
+            await session.flush()
+
+            refreshed_ids = [
+                rows_by_url[url].id for url in refreshed if url in rows_by_url
+            ]
+            stale_ids = refreshed_ids + removed_ids
+            if stale_ids:
+                stale = (await session.execute(
+                    select(LinkModel.domain, BacklinkModel.backlink_domain)
+                    .join(LinkModel, BacklinkModel.link_id == LinkModel.id)
+                    .where(BacklinkModel.link_id.in_(stale_ids))
+                )).all()
+                for target_domain, backlink_domain in stale:
+                    deltas.backlink(target_domain, backlink_domain, -1)
+                await session.execute(
+                    delete(BacklinkModel).where(BacklinkModel.link_id.in_(stale_ids))
+                )
+
+            for backlink in result.backlinks:
+                if backlink.target_url not in refreshed:
+                    continue
+                target = rows_by_url[backlink.target_url]
+                session.add(BacklinkModel(
+                    link_id=target.id,
+                    backlink_url=backlink.backlink_url,
+                    backlink_title=backlink.backlink_title,
+                    backlink_domain=backlink.backlink_domain or "",
+                    anchor_text=backlink.anchor_text
+                ))
+                deltas.backlink(target.domain, backlink.backlink_domain or "", 1)
+
+            await apply_deltas(session, deltas, now)
+            await carry_schedule(session, job_row, links_changed, now, self.recrawl_policy)
+            return job_row.id
+
+    @staticmethod
+    def _to_link(row: LinkModel) -> Link:
+        return Link(
+            url=row.url,
+            title=row.title,
+            description=row.description,
+            source_url=row.source_url,
+            domain=row.domain,
+            link_type=LinkType.EXTERNAL if row.is_external else LinkType.INTERNAL,
+            link_text=row.link_text,
+            created_at=row.created_at
+        )
@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.db.models.job import Job as JobModel, JobStatus
+from app.db.cursors import decode_cursor, encode_cursor
+from app.domain.services.recrawl_policy import RecrawlPolicy, build_recrawl_policy
+
+
+async def _scheduled_job(session: AsyncSession, source_url: str) -> Optional[JobModel]:
+    return (await session.execute(
+        select(JobModel)
+        .where(JobModel.source_url == source_url, JobModel.next_run_at.is_not(None))
+        .order_by(JobModel.id.desc())
+        .limit(1)
+    )).scalar_one_or_none()
+
+
+async def carry_schedule(
+    session: AsyncSession,
+    job_row: JobModel,
+    links_changed: bool,
+    now: datetime,
+    policy: RecrawlPolicy
+) -> None:
+    """Move a scheduled URL's recrawl state onto its newly stored job.
+
+    The visit is scored against the previous job's content hash and the
+    link-set change, the interval adapted, and the next run planned from now.
+    Does nothing for URLs that are not scheduled.
+    """
+    previous = await _scheduled_job(session, job_row.source_url)
+    if previous is None or previous.id == job_row.id:
+        return
+
+    change_rate = previous.change_rate
+    interval = previous.recrawl_interval or policy.default_interval
+    # A placeholder job (scheduled before any run) has nothing to compare against
+    if previous.content_hash is not None:
+        change_rate = policy.observe(
+            change_rate,
+            links_changed=links_changed,
+            content_changed=previous.content_hash != job_row.content_hash
+        )
+        interval = policy.next_interval(interval, change_rate)
+
+    job_row.change_rate = change_rate
+    job_row.recrawl_interval = interval
+    job_row.next_run_at = policy.next_run_at(now, interval)
+    previous.next_run_at = None
+
+
+class ScheduleRepository:
+    """Recrawl schedules, stored on the latest job of each scheduled source URL."""
+
+    def __init__(self, session_factory: async_sessionmaker, policy: Optional[RecrawlPolicy] = None):
+        self.session_factory = session_factory
+        self.policy = policy or build_recrawl_policy()
+
+    async def get_schedule(self, source_url: str) -> Optional[JobModel]:
+        async with self.session_factory() as session:
+            return await _scheduled_job(session, source_url)
+
+    async def schedule(self, source_url: str, interval: Optional[int] = None) -> JobModel:
+        """Schedule source_url for recrawls, or change an existing schedule's interval.
+
+        Stored jobs of the URL keep their history; the schedule goes on the
+        latest one. Changing the interval replans the next run.
+        """
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session, session.begin():
+            row = await _scheduled_job(session, source_url)
+            if row is not None:
+                if interval is not None:
+                    row.recrawl_interval = self.policy.clamp(interval)
+                    row.next_run_at = self.policy.first_run_at(now, row.recrawl_interval)
+                return row
+
+            interval = self.policy.clamp(interval or self.policy.default_interval)
+            row = (await session.execute(
+                select(JobModel)
+                .where(JobModel.source_url == source_url)
+                .order_by(JobModel.id.desc())
+                .limit(1)
+            )).scalar_one_or_none()
+            if row is None:
+                # Placeholder until the first run stores a real job
+                row = JobModel(source_url=source_url, status=JobStatus.PENDING)
+                session.add(row)
+            row.recrawl_interval = interval
+            row.next_run_at = self.policy.first_run_at(now, interval)
+            await session.flush()
+            return row
+
+    async def unschedule(self, source_url: str) -> bool:
+        async with self.session_factory() as session, session.begin():
+            row = await _scheduled_job(session, source_url)
+            if row is None:
+                return False
+            row.next_run_at = None
+            return True
+
+    async def list_schedules(
+        self,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[JobModel], Optional[str]]:
+        """Scheduled URLs, soonest next run first."""
+        query = select(JobModel).where(JobModel.next_run_at.is_not(None))
+        if cursor:
+            next_run_at, job_id = decode_cursor(cursor, (datetime, int))
+            query = query.where(or_(
+                JobModel.next_run_at > next_run_at,
+                and_(JobModel.next_run_at == next_run_at, JobModel.id > job_id)
+            ))
+        query = query.order_by(JobModel.next_run_at, JobModel.id).limit(limit + 1)
+
+        async with self.session_factory() as session:
+            rows = list((await session.execute(query)).scalars())
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].next_run_at, rows[-1].id)
+
+    async def claim_due(self, limit: int, lease: int) -> List[str]:
+        """Return up to limit URLs whose next run is due, leasing them.
+
+        Claimed schedules are pushed lease seconds ahead, so each is handed
+        to one worker job; if that run never completes, the URL comes due
+        again when the lease runs out. A completed run replaces the lease
+        with the adapted next run.
+        """
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session, session.begin():
+            rows = list((await session.execute(
+                select(JobModel)
+                .where(JobModel.next_run_at <= now)
+                .order_by(JobModel.next_run_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )).scalars())
+            for row in rows:
+                row.next_run_at = now + timedelta(seconds=lease)
+            return [row.source_url for row in rows]
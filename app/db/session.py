@@ -0,0 +1,42 @@
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.db.base import Base
+
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_engine() -> AsyncEngine:
+    """Return the process-wide async engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        options = {"pool_pre_ping": True}
+        if not settings.database_url.startswith("sqlite"):
+            options["pool_size"] = settings.database_pool_size
+        _engine = create_async_engine(settings.database_url, **options)
+    return _engine
+
+
+def get_session_factory() -> async_sessionmaker:
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = async_sessionmaker(get_engine(), expire_on_commit=False)
+    return _session_factory
+
+
+async def init_models():
+    """Create any missing tables."""
+    # Register every model on the metadata before creating tables
+    from app.db.models import backlink, domain_stats, job, link  # noqa: F401
+    
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def dispose_engine():
+    global _engine, _session_factory
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _session_factory = None
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 from enum import Enum
 
 
@@ -19,6 +19,8 @@ class Link:
     link_type: LinkType = LinkType.EXTERNAL
     link_text: Optional[str] = None
     created_at: Optional[datetime] = None
+    in_boilerplate: bool = False  # Found in nav/header/footer/sidebar markup
+    score: Optional[float] = None  # Backlink lookup priority, set by LinkScorer
     
     def __post_init__(self):
         if not self.domain and self.url:
@@ -33,21 +35,39 @@ class Backlink:
     backlink_title: Optional[str] = None
     backlink_domain: Optional[str] = None
     anchor_text: Optional[str] = None
+    target_url: Optional[str] = None  # Extracted link this backlink points to
     created_at: Optional[datetime] = None
 
 
 @dataclass
 class IngestionJob:
     source_url: str
+    id: Optional[int] = None
     status: str = "pending"
     total_links_found: int = 0
     total_backlinks_found: int = 0
     error_message: Optional[str] = None
+    content_hash: Optional[str] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     created_at: Optional[datetime] = None
 
 
+@dataclass
+class LinkSetDiff:
+    added: List[str]
+    removed: List[str]
+    unchanged: List[str]
+
+
+@dataclass
+class LinkSnapshot:
+    """Links (and their backlinks) stored for a source URL by an earlier ingestion."""
+    source_url: str
+    links: Dict[str, Link]
+    backlinks: Dict[str, List[Backlink]]
+
+
 @dataclass
 class IngestionResult:
     job: IngestionJob
@@ -55,4 +75,5 @@ class IngestionResult:
     backlinks: List[Backlink]
     total_links: int
     total_backlinks: int
+    diff: Optional[LinkSetDiff] = None
 
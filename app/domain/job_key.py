@@ -0,0 +1,39 @@
+import hashlib
+import json
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so equivalent spellings map to the same string."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    # Drop default ports, keep explicit non-default ones
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if parts.username:
+        credentials = parts.username
+        if parts.password:
+            credentials = f"{credentials}:{parts.password}"
+        netloc = f"{credentials}@{netloc}"
+
+    path = parts.path or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+
+    # Fragments never reach the server, so they are not part of the identity
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def make_job_key(url: str, **options: Any) -> str:
+    """Build a stable, content-addressed key for an ingestion request."""
+    payload = json.dumps(
+        {"url": normalize_url(url), "options": options},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -1,28 +1,33 @@
+import math
 from typing import List, Optional
 from app.domain.entities import Backlink
+from app.infrastructure.concurrency.limiter import AdaptiveLimiter, build_provider_limiter
+from app.infrastructure.concurrency.scheduler import BudgetExceeded, JobScheduler, build_provider_scheduler
 from app.infrastructure.search_providers.base import BacklinkProvider
-from app.infrastructure.search_providers.bing import BingBacklinkProvider
-from app.infrastructure.search_providers.in_domain import InDomainBacklinkProvider
-from app.core.config import settings
+from app.infrastructure.search_providers.registry import ProviderContext, build_providers
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 
 class BacklinkService:
-    def __init__(self):
-        self.providers: List[BacklinkProvider] = []
+    def __init__(
+        self,
+        providers: Optional[List[BacklinkProvider]] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[JobScheduler] = None
+    ):
+        self.limiter = limiter or build_provider_limiter()
+        self.scheduler = scheduler or build_provider_scheduler()
         
-        # Initialize providers based on configuration
-        if settings.bing_api_key:
-            self.providers.append(BingBacklinkProvider(settings.bing_api_key))
-        
-        # Always add in-domain provider as fallback
-        self.providers.append(InDomainBacklinkProvider())
+        # Initialize providers from the BACKLINK_PROVIDERS setting unless given
+        if providers is None:
+            providers = build_providers(ProviderContext())
+        self.providers: List[BacklinkProvider] = providers
     
     async def get_backlinks(self, url: str, limit: int = 10) -> List[Backlink]:
         """Get backlinks for a given URL using multiple providers."""
-        logger.info("Fetching backlinks", url=url, limit=limit)
+        logger.debug("Fetching backlinks", url=url, limit=limit)
         
         all_backlinks = []
         
@@ -31,8 +36,13 @@ class BacklinkService:
                 if len(all_backlinks) >= limit:
                     break
                 
-                remaining_limit = limit - len(all_backlinks)
-                backlinks = await provider.get_backlinks(url, remaining_limit)
+                # A provider's weight caps its share of the requested backlinks
+                remaining_limit = min(
+                    limit - len(all_backlinks),
+                    max(1, math.ceil(limit * provider.weight))
+                )
+                async with self.limiter.acquire(provider.provider_name), self.scheduler.slot():
+                    backlinks = await provider.get_backlinks(url, remaining_limit)
                 
                 # Deduplicate backlinks
                 for backlink in backlinks:
@@ -41,11 +51,13 @@ class BacklinkService:
                         if len(all_backlinks) >= limit:
                             break
                 
-                logger.info("Provider returned backlinks", 
+                logger.debug("Provider returned backlinks", 
                            provider=provider.__class__.__name__,
                            count=len(backlinks),
                            url=url)
                 
+            except BudgetExceeded:
+                raise
             except Exception as e:
                 logger.error("Error with backlink provider", 
                            provider=provider.__class__.__name__,
@@ -55,7 +67,7 @@ class BacklinkService:
         
         # Limit to requested number
         result = all_backlinks[:limit]
-        logger.info("Total backlinks found", 
+        logger.debug("Total backlinks found", 
                    url=url, 
                    total=len(result), 
                    requested=limit)
@@ -79,7 +91,7 @@ class BacklinkService:
                 "url": url,
                 "sample_backlinks_count": len(sample_backlinks),
                 "providers_available": len(self.providers),
-                "has_bing_provider": any(isinstance(p, BingBacklinkProvider) for p in self.providers)
+                "has_bing_provider": any(p.provider_name == "bing_search" for p in self.providers)
             }
         except Exception as e:
             logger.error("Error getting backlink summary", url=url, error=str(e))
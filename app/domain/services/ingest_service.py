@@ -1,8 +1,16 @@
-from typing import List, Optional
-from app.domain.entities import Link, Backlink, IngestionJob, IngestionResult
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from app.domain.entities import Link, Backlink, IngestionJob, IngestionResult, LinkSnapshot
 from app.infrastructure.http.fetcher_httpx import HTTPFetcher
 from app.infrastructure.parsers.html import HTMLParser
+from app.infrastructure.parsers.summary import SummaryParser
 from app.domain.services.backlink_service import BacklinkService
+from app.domain.services.link_diff import diff_link_sets
+from app.domain.services.link_scoring import LinkScorer, allocate_backlink_budget
+from app.db.repositories.ingestion_repository import IngestionRepository
+from app.infrastructure.concurrency.scheduler import BudgetExceeded
 from app.core.config import settings
 import structlog
 
@@ -10,17 +18,61 @@ logger = structlog.get_logger(__name__)
 
 
 class IngestService:
-    def __init__(self):
-        self.http_fetcher = HTTPFetcher()
-        self.html_parser = HTMLParser()
-        self.backlink_service = BacklinkService()
+    def __init__(
+        self,
+        http_fetcher: Optional[HTTPFetcher] = None,
+        html_parser: Optional[HTMLParser] = None,
+        backlink_service: Optional[BacklinkService] = None,
+        repository: Optional[IngestionRepository] = None,
+        link_scorer: Optional[LinkScorer] = None
+    ):
+        self.http_fetcher = http_fetcher or HTTPFetcher()
+        self.html_parser = html_parser or HTMLParser()
+        self._backlink_service = backlink_service
+        self.repository = repository
+        self.link_scorer = link_scorer or LinkScorer()
     
-    async def ingest_page(self, url: str) -> IngestionResult:
-        """Main method to ingest a page and extract all links with backlinks."""
-        logger.info("Starting page ingestion", url=url)
+    @property
+    def backlink_service(self) -> BacklinkService:
+        """Backlink service, built on first use so links-only ingestions never pay for it."""
+        if self._backlink_service is None:
+            self._backlink_service = BacklinkService()
+        return self._backlink_service
+    
+    async def ingest_page(
+        self,
+        url: str,
+        include_backlinks: bool = True,
+        max_backlinks_per_link: Optional[int] = None,
+        incremental: bool = False,
+        backlink_budget: Optional[int] = None,
+        backlink_time_budget: Optional[float] = None
+    ) -> IngestionResult:
+        """Main method to ingest a page and extract all links with backlinks.
+        
+        In incremental mode the parsed links are diffed against the snapshot
+        stored by the previous ingestion of the same URL: backlinks are only
+        resolved for added links, stored backlinks are reused for unchanged
+        ones, and the diff is returned with the result.
+        
+        Links to resolve are scored and ``backlink_budget`` backlinks are
+        split across them by score (at most ``max_backlinks_per_link`` each),
+        so boilerplate and low-value links may get no lookup at all. With
+        ``backlink_time_budget`` set, lookups still running after that many
+        seconds are cancelled and the result is marked partial.
+        """
+        logger.info("Starting page ingestion", url=url, include_backlinks=include_backlinks, incremental=incremental)
+        
+        if max_backlinks_per_link is None:
+            max_backlinks_per_link = settings.max_backlinks_per_link
+        if backlink_budget is None:
+            backlink_budget = settings.job_backlink_budget
+        if backlink_time_budget is None:
+            backlink_time_budget = settings.job_backlink_time_budget
         
         # Create job
-        job = IngestionJob(source_url=url)
+        now = datetime.now(timezone.utc)
+        job = IngestionJob(source_url=url, created_at=now, started_at=now)
         
         try:
             # Fetch the page
@@ -35,10 +87,11 @@ class IngestService:
                     total_links=0,
                     total_backlinks=0
                 )
+            job.content_hash = hashlib.sha256(page_data["content"].encode("utf-8")).hexdigest()
             
             # Parse links from HTML
             raw_links = self.html_parser.parse_links(page_data["content"], url)
-            logger.info("Extracted raw links", count=len(raw_links), url=url)
+            logger.debug("Extracted raw links", count=len(raw_links), url=url)
             
             # Convert to domain entities
             links = []
@@ -49,7 +102,8 @@ class IngestService:
                     link_text=raw_link.get("link_text", ""),
                     source_url=url,
                     domain=raw_link["domain"],
-                    link_type="external" if raw_link["is_external"] else "internal"
+                    link_type="external" if raw_link["is_external"] else "internal",
+                    in_boilerplate=raw_link.get("in_boilerplate", False)
                 )
                 links.append(link)
             
@@ -57,30 +111,69 @@ class IngestService:
             unique_links = self._deduplicate_links(links)
             job.total_links_found = len(unique_links)
             
+            # Compare with the last stored snapshot
+            snapshot = None
+            diff = None
+            if incremental:
+                snapshot = await self._load_snapshot(url)
+                diff = diff_link_sets(snapshot.links if snapshot else [], unique_links)
+                logger.debug("Computed link diff", url=url, added=len(diff.added), removed=len(diff.removed), unchanged=len(diff.unchanged))
+            
             # Fetch backlinks for each link (limited to max_backlinks_per_link)
-            all_backlinks = []
-            for link in unique_links:
-                backlinks = await self.backlink_service.get_backlinks(
-                    link.url, 
-                    limit=settings.max_backlinks_per_link
+            backlinks_by_url: Dict[str, List[Backlink]] = {}
+            refreshed_urls: List[str] = []
+            if include_backlinks:
+                to_resolve = unique_links
+                if snapshot is not None:
+                    # Unchanged links keep the backlinks stored for them
+                    added = set(diff.added)
+                    to_resolve = [link for link in unique_links if link.url in added]
+                    for link_url in diff.unchanged:
+                        backlinks_by_url[link_url] = snapshot.backlinks.get(link_url, [])[:max_backlinks_per_link]
+                
+                # Spend the backlink budget on the links that matter most
+                ranked = self.link_scorer.rank(to_resolve)
+                limits = allocate_backlink_budget(ranked, backlink_budget, max_backlinks_per_link)
+                logger.debug("Allocated backlink budget", url=url, links=len(ranked), resolving=len(limits), budget=backlink_budget)
+                
+                resolved, budget_exhausted = await self._resolve_backlinks(
+                    [link for link in ranked if link.url in limits],
+                    limits,
+                    backlink_time_budget
                 )
-                all_backlinks.extend(backlinks)
+                backlinks_by_url.update(resolved)
+                refreshed_urls = list(resolved)
+                
+                # Keep what was found before the job ran out of budget
+                if budget_exhausted:
+                    logger.warning("Job budget exhausted, backlinks are partial", url=url)
+                    job.error_message = "Job budget exhausted; backlink results are partial"
+            
+            all_backlinks = [
+                backlink
+                for link in unique_links
+                for backlink in backlinks_by_url.get(link.url, [])
+            ]
             
             job.total_backlinks_found = len(all_backlinks)
             job.status = "completed"
+            job.completed_at = datetime.now(timezone.utc)
             
             logger.info("Page ingestion completed", 
                        url=url, 
                        links_found=len(unique_links),
                        backlinks_found=len(all_backlinks))
             
-            return IngestionResult(
+            result = IngestionResult(
                 job=job,
                 links=unique_links,
                 backlinks=all_backlinks,
                 total_links=len(unique_links),
-                total_backlinks=len(all_backlinks)
+                total_backlinks=len(all_backlinks),
+                diff=diff
             )
+            await self._persist(result, refreshed_urls)
+            return result
             
         except Exception as e:
             logger.error("Error during page ingestion", url=url, error=str(e))
@@ -95,6 +188,72 @@ class IngestService:
                 total_backlinks=0
             )
     
+    async def _resolve_backlinks(
+        self,
+        links: List[Link],
+        limits: Dict[str, int],
+        time_budget: Optional[float] = None
+    ) -> Tuple[Dict[str, List[Backlink]], bool]:
+        """Look up backlinks for links; returns them by link URL plus whether the budget ran out.
+        
+        Lookups start in the order given (best first). Lookups still running
+        when time_budget seconds have passed are cancelled; their links keep
+        whatever backlinks were stored for them before.
+        """
+        # Lookups run concurrently; the provider limiter decides how many
+        # are actually in flight at once.
+        tasks = [
+            asyncio.ensure_future(self.backlink_service.get_backlinks(link.url, limit=limits[link.url]))
+            for link in links
+        ]
+        if not tasks:
+            return {}, False
+        
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=time_budget or None)
+        finally:
+            # Also reached when the ingestion itself is cancelled
+            for task in tasks:
+                task.cancel()
+        budget_exhausted = bool(pending)
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        resolved: Dict[str, List[Backlink]] = {}
+        for link, task in zip(links, tasks):
+            if task.cancelled():
+                continue
+            error = task.exception()
+            if isinstance(error, BudgetExceeded):
+                budget_exhausted = True
+                continue
+            if error is not None:
+                raise error
+            backlinks = task.result()
+            for backlink in backlinks:
+                backlink.target_url = link.url
+            resolved[link.url] = backlinks
+        return resolved, budget_exhausted
+    
+    async def _load_snapshot(self, url: str) -> Optional[LinkSnapshot]:
+        if self.repository is None:
+            logger.warning("Incremental ingestion requested without a result store", url=url)
+            return None
+        try:
+            return await self.repository.load_snapshot(url)
+        except Exception as e:
+            # Fall back to a full ingestion rather than failing the job
+            logger.error("Error loading link snapshot", url=url, error=str(e))
+            return None
+    
+    async def _persist(self, result: IngestionResult, refreshed_urls: List[str]):
+        if self.repository is None:
+            return
+        try:
+            result.job.id = await self.repository.save_result(result, refreshed_urls)
+        except Exception as e:
+            logger.error("Error persisting ingestion result", url=result.job.source_url, error=str(e))
+    
     def _deduplicate_links(self, links: List[Link]) -> List[Link]:
         """Remove duplicate links based on URL."""
         seen_urls = set()
@@ -107,29 +266,35 @@ class IngestService:
         
         return unique_links
     
-    async def get_ingestion_summary(self, url: str) -> dict:
-        """Get a summary of ingestion results without full processing."""
+    async def get_ingestion_summary(self, url: str, max_bytes: Optional[int] = None) -> dict:
+        """Get a summary of ingestion results without full processing.
+        
+        The body is streamed through a tokenizer rather than parsed into a DOM.
+        With max_bytes set, reading stops once that many bytes have been seen
+        and the link counts are lower bounds, flagged as approximate.
+        """
+        if max_bytes is None:
+            max_bytes = settings.summary_max_bytes
+        
         try:
-            page_data = await self.http_fetcher.fetch_page(url)
-            if not page_data:
-                return {"error": "Failed to fetch page"}
-            
-            raw_links = self.html_parser.parse_links(page_data["content"], url)
-            metadata = self.html_parser.extract_page_metadata(page_data["content"])
-            
-            return {
-                "url": url,
-                "title": metadata.get("title", ""),
-                "description": metadata.get("description", ""),
-                "total_links_found": len(raw_links),
-                "external_links": len([l for l in raw_links if l["is_external"]]),
-                "internal_links": len([l for l in raw_links if not l["is_external"]]),
-                "content_type": page_data["content_type"],
-                "status_code": page_data["status_code"]
-            }
+            async with self.http_fetcher.stream_page(url) as response:
+                parser = SummaryParser(url, encoding=response.charset_encoding)
+                approximate = False
+                async for chunk in response.aiter_bytes():
+                    parser.feed(chunk)
+                    if max_bytes and parser.bytes_read >= max_bytes:
+                        approximate = True
+                        break
+                parser.close()
+                
+                summary = parser.result()
+                summary.update({
+                    "url": url,
+                    "content_type": response.headers.get("content-type", ""),
+                    "status_code": response.status_code,
+                    "approximate": approximate
+                })
+                return summary
         except Exception as e:
             logger.error("Error getting ingestion summary", url=url, error=str(e))
             return {"error": str(e)}
-
-
-
@@ -0,0 +1,15 @@
+from typing import Iterable, List
+from app.domain.entities import Link, LinkSetDiff
+
+
+def diff_link_sets(previous_urls: Iterable[str], current_links: List[Link]) -> LinkSetDiff:
+    """Compare a page's current links with the URLs stored from its last ingestion."""
+    previous = set(previous_urls)
+    current = [link.url for link in current_links]
+    current_set = set(current)
+    
+    return LinkSetDiff(
+        added=[url for url in current if url not in previous],
+        removed=sorted(previous - current_set),
+        unchanged=[url for url in current if url in previous]
+    )
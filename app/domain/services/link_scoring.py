@@ -0,0 +1,76 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List
+from app.domain.entities import Link, LinkType
+
+# Anchor texts that say nothing about the target
+GENERIC_ANCHORS = frozenset({
+    "here", "click here", "click", "more", "read more", "learn more", "see more",
+    "link", "this", "this link", "continue", "continue reading", "details", "next",
+    "previous", "prev", "back", "top", "back to top", "home",
+})
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass
+class LinkScorer:
+    """Scores links by how much a backlink lookup for them is worth.
+
+    A link starts at 1.0 and is scaled down when it sits in page chrome
+    (navigation, header, footer, sidebar) or has empty or generic anchor
+    text, and up when its anchor text is descriptive or it points off-site.
+    """
+
+    boilerplate_factor: float = 0.2
+    external_factor: float = 1.5
+    empty_anchor_factor: float = 0.4
+    generic_anchor_factor: float = 0.5
+    descriptive_anchor_factor: float = 1.3
+    descriptive_anchor_words: int = 3
+
+    def score(self, link: Link) -> float:
+        score = 1.0
+        if link.in_boilerplate:
+            score *= self.boilerplate_factor
+        if link.link_type == LinkType.EXTERNAL:
+            score *= self.external_factor
+
+        text = (link.link_text or link.title or "").strip().lower()
+        if not text:
+            score *= self.empty_anchor_factor
+        elif text in GENERIC_ANCHORS:
+            score *= self.generic_anchor_factor
+        elif len(_WORD_RE.findall(text)) >= self.descriptive_anchor_words:
+            score *= self.descriptive_anchor_factor
+        return score
+
+    def rank(self, links: List[Link]) -> List[Link]:
+        """Set each link's score and return the links best first (stable for ties)."""
+        for link in links:
+            link.score = self.score(link)
+        return sorted(links, key=lambda link: -(link.score or 0.0))
+
+
+def allocate_backlink_budget(links: List[Link], budget: int, per_link_max: int) -> Dict[str, int]:
+    """Split a job's backlink budget across scored links, proportionally to score.
+
+    Links are served best first, each taking its score's share of what is
+    left, rounded and capped at per_link_max; whatever a capped link leaves
+    flows to the rest. Low scorers can get 0, meaning no lookup at all.
+    Returns the backlink limit per link URL for links with a non-zero share.
+    """
+    ranked = sorted(links, key=lambda link: -(link.score or 0.0))
+    remaining_budget = budget
+    remaining_score = sum(link.score or 0.0 for link in ranked)
+
+    allocation: Dict[str, int] = {}
+    for link in ranked:
+        if remaining_budget <= 0 or remaining_score <= 0:
+            break
+        score = link.score or 0.0
+        share = min(per_link_max, round(remaining_budget * score / remaining_score))
+        remaining_score -= score
+        if share > 0:
+            allocation[link.url] = share
+            remaining_budget -= share
+    return allocation
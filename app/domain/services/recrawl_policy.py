@@ -0,0 +1,68 @@
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from app.core.config import settings
+
+
+@dataclass
+class RecrawlPolicy:
+    """Adapts how often a scheduled source URL is revisited.
+
+    Each visit is scored as a change observation: 1.0 when the page's link
+    set changed, 0.5 when only its content hash did, 0.0 otherwise. The
+    observations are smoothed into a change rate (an EWMA), and the interval
+    grows while the rate stays below ``target_change_rate`` and shrinks while
+    it is above, so visits settle where about that share of them finds a change.
+    """
+
+    min_interval: int
+    max_interval: int
+    default_interval: int
+    target_change_rate: float = 0.5
+    smoothing: float = 0.3  # Weight of the newest observation in the change rate
+    growth: float = 1.5  # Largest interval change per visit
+    jitter: float = 0.1  # Next runs are spread +/- this share of the interval
+    random: Callable[[], float] = random.random
+
+    def clamp(self, interval: float) -> int:
+        return int(min(self.max_interval, max(self.min_interval, interval)))
+
+    def observe(
+        self,
+        change_rate: Optional[float],
+        links_changed: bool,
+        content_changed: bool
+    ) -> float:
+        """Fold one visit into the change rate."""
+        observed = 1.0 if links_changed else 0.5 if content_changed else 0.0
+        if change_rate is None:
+            return observed
+        return change_rate + self.smoothing * (observed - change_rate)
+
+    def next_interval(self, interval: Optional[int], change_rate: float) -> int:
+        interval = interval or self.default_interval
+        return self.clamp(interval * self.growth ** (2 * (self.target_change_rate - change_rate)))
+
+    def next_run_at(self, now: datetime, interval: int) -> datetime:
+        spread = 1 + self.jitter * (2 * self.random() - 1)
+        return now + timedelta(seconds=interval * spread)
+
+    def first_run_at(self, now: datetime, interval: int) -> datetime:
+        """Newly scheduled URLs start anywhere within their first interval.
+
+        Scheduling many URLs at once then spreads their visits out instead of
+        making them all due together.
+        """
+        return now + timedelta(seconds=interval * self.random())
+
+
+def build_recrawl_policy() -> RecrawlPolicy:
+    """Recrawl policy configured from settings."""
+    return RecrawlPolicy(
+        min_interval=settings.recrawl_min_interval,
+        max_interval=settings.recrawl_max_interval,
+        default_interval=settings.recrawl_default_interval,
+        target_change_rate=settings.recrawl_target_change_rate,
+        jitter=settings.recrawl_jitter,
+    )
@@ -0,0 +1,196 @@
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Callable, Optional
+
+import structlog
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.infrastructure.concurrency.scheduler import SharedJobs
+
+logger = structlog.get_logger(__name__)
+
+# Only delete the lock if we still own it
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Only extend the lock if we still own it
+EXTEND_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class IngestionCoalescer:
+    """Share one ingestion between identical requests, in-process and across replicas.
+
+    Concurrent callers in the same process are collapsed into one shared job
+    that runs at the most urgent priority among them (see ``SharedJobs``).
+    The single local leader then takes a Redis lock for the job key; replicas
+    that lose the race poll for the result the lock holder publishes. When
+    Redis is unreachable the coalescer degrades to in-process dedup only.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        result_ttl: int = 300,
+        lock_ttl: int = 60,
+        wait_timeout: int = 600,
+        poll_interval: float = 0.25,
+        key_prefix: str = "ingest",
+    ):
+        self.redis_url = redis_url
+        self.result_ttl = result_ttl
+        self.lock_ttl_ms = lock_ttl * 1000
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.key_prefix = key_prefix
+        self._shared = SharedJobs()
+        self._redis: Optional[aioredis.Redis] = None
+        self._redis_retry_at = 0.0
+
+    async def run(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[str]],
+        cacheable: Callable[[str], bool] = lambda payload: True,
+    ) -> str:
+        """Return the serialized result for key, computing it at most once."""
+        return await self._shared.do(
+            key, lambda: self._run_distributed(key, compute, cacheable)
+        )
+
+    async def warm_up(self) -> None:
+        """Open the first Redis connection before a request needs it."""
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.ping()
+        except (RedisError, OSError) as e:
+            self._mark_redis_unavailable(e)
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def _result_key(self, key: str) -> str:
+        return f"{self.key_prefix}:result:{key}"
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self.key_prefix}:lock:{key}"
+
+    def _get_redis(self) -> Optional[aioredis.Redis]:
+        # Back off for a while after a connection failure instead of paying a
+        # connect timeout on every request.
+        if time.monotonic() < self._redis_retry_at:
+            return None
+        if self._redis is None:
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+        return self._redis
+
+    def _mark_redis_unavailable(self, error: Exception) -> None:
+        logger.warning("Redis unavailable, coalescing in-process only", error=str(error))
+        self._redis_retry_at = time.monotonic() + 30
+
+    async def _run_distributed(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[str]],
+        cacheable: Callable[[str], bool],
+    ) -> str:
+        redis = self._get_redis()
+        if redis is None:
+            return await compute()
+
+        deadline = time.monotonic() + self.wait_timeout
+        token = uuid.uuid4().hex
+
+        while True:
+            try:
+                cached = await redis.get(self._result_key(key))
+                if cached is not None:
+                    logger.info("Reusing cached ingestion result", job_key=key)
+                    return cached
+
+                acquired = await redis.set(
+                    self._lock_key(key), token, nx=True, px=self.lock_ttl_ms
+                )
+            except (RedisError, OSError) as e:
+                self._mark_redis_unavailable(e)
+                return await compute()
+
+            if acquired:
+                return await self._compute_as_owner(redis, key, token, compute, cacheable)
+
+            # Another replica owns the job; wait for its result or for the
+            # lock to disappear (owner finished without caching, or died).
+            try:
+                result = await self._wait_for_result(redis, key, deadline)
+            except (RedisError, OSError) as e:
+                self._mark_redis_unavailable(e)
+                return await compute()
+
+            if result is not None:
+                return result
+            if time.monotonic() >= deadline:
+                logger.warning("Timed out waiting for coalesced ingestion", job_key=key)
+                return await compute()
+
+    async def _compute_as_owner(
+        self,
+        redis: aioredis.Redis,
+        key: str,
+        token: str,
+        compute: Callable[[], Awaitable[str]],
+        cacheable: Callable[[str], bool],
+    ) -> str:
+        heartbeat = asyncio.ensure_future(self._extend_lock(redis, key, token))
+        try:
+            payload = await compute()
+            if cacheable(payload):
+                try:
+                    await redis.set(self._result_key(key), payload, ex=self.result_ttl)
+                except (RedisError, OSError) as e:
+                    logger.warning("Failed to cache ingestion result", job_key=key, error=str(e))
+            return payload
+        finally:
+            heartbeat.cancel()
+            try:
+                await redis.eval(RELEASE_LOCK_SCRIPT, 1, self._lock_key(key), token)
+            except (RedisError, OSError) as e:
+                logger.warning("Failed to release ingestion lock", job_key=key, error=str(e))
+
+    async def _extend_lock(self, redis: aioredis.Redis, key: str, token: str) -> None:
+        """Keep the lock alive while a long ingestion is still running."""
+        interval = self.lock_ttl_ms / 3000
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await redis.eval(
+                    EXTEND_LOCK_SCRIPT, 1, self._lock_key(key), token, self.lock_ttl_ms
+                )
+            except (RedisError, OSError) as e:
+                logger.warning("Failed to extend ingestion lock", job_key=key, error=str(e))
+
+    async def _wait_for_result(
+        self, redis: aioredis.Redis, key: str, deadline: float
+    ) -> Optional[str]:
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            cached = await redis.get(self._result_key(key))
+            if cached is not None:
+                return cached
+            if not await redis.exists(self._lock_key(key)):
+                return None
+        return None
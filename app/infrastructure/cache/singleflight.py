@@ -0,0 +1,30 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one in-flight task."""
+
+    def __init__(self):
+        self._inflight: Dict[str, "asyncio.Task"] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn for key, or join the call already running for it."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+
+        # Shield the shared task so one disconnecting caller does not cancel it
+        # for everybody else waiting on the same key.
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: "asyncio.Task") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1 @@
+# Concurrency module initialization
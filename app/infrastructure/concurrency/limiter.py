@@ -0,0 +1,326 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Callable, Deque, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import (
+    CONCURRENCY_DROPS,
+    CONCURRENCY_IN_FLIGHT,
+    CONCURRENCY_LATENCY,
+    CONCURRENCY_LIMIT,
+)
+
+GLOBAL_KEY = "__global__"
+
+
+def is_overload_status(status_code: int) -> bool:
+    """Whether a response status means the target wants us to slow down."""
+    return status_code == 429 or status_code >= 500
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Whether an exception is an overload signal (timeout, 429/5xx) rather than a plain failure.
+
+    Connection errors, DNS failures and the like say nothing about load;
+    counting them would shrink the limit whenever some host is down.
+    """
+    if isinstance(error, httpx.TimeoutException):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return is_overload_status(error.response.status_code)
+    return False
+
+
+class AIMDLimit:
+    """Latency-aware AIMD concurrency limit for a single key.
+
+    Like TCP congestion control, the limit starts in slow start (+1 per
+    successful sample) and after the first back-off grows by roughly one per
+    full window of samples. It shrinks multiplicatively when a call is
+    dropped as overloaded or its latency exceeds ``latency_tolerance``
+    times the baseline latency.
+    Increases only happen while the limit is actually being used, and
+    decreases are spaced at least one baseline latency apart so a single
+    burst of failures only counts once.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        backoff_ratio: float = 0.9,
+        latency_tolerance: float = 2.0,
+        baseline_rise: float = 0.01,
+        baseline_fall: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.baseline_rise = baseline_rise
+        self.baseline_fall = baseline_fall
+        self.clock = clock
+        self.in_flight = 0
+        self.baseline_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._slow_start = True
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def current_limit(self) -> int:
+        return int(self.limit)
+
+    async def acquire(self) -> None:
+        """Wait until a slot is free under the current limit."""
+        if self.in_flight < self.current_limit and not self._waiters:
+            self.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed to us just before cancellation; pass it on
+                self.in_flight -= 1
+                self._wake_waiters()
+            else:
+                # Already popped if a release ran since the cancellation
+                with suppress(ValueError):
+                    self._waiters.remove(waiter)
+            raise
+
+    def cancel(self) -> None:
+        """Free a slot without learning anything from it."""
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    def release(self, latency: float, dropped: bool) -> str:
+        """Free a slot and adapt the limit from the call's outcome.
+
+        Returns the reason the limit backed off, or an empty string.
+        """
+        utilized = self.in_flight * 2 >= self.current_limit
+        self.in_flight -= 1
+        reason = ""
+
+        if dropped:
+            reason = "error"
+        else:
+            if (
+                self.baseline_latency is not None
+                and latency > self.baseline_latency * self.latency_tolerance
+            ):
+                reason = "latency"
+            self._update_baseline(latency)
+
+        if reason:
+            now = self.clock()
+            spacing = self.baseline_latency or 0.0
+            if now - self._last_decrease >= spacing:
+                self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+                self._last_decrease = now
+            self._slow_start = False
+        elif utilized:
+            step = 1.0 if self._slow_start else 1.0 / self.limit
+            self.limit = min(self.max_limit, self.limit + step)
+
+        self._wake_waiters()
+        return reason
+
+    def _update_baseline(self, latency: float) -> None:
+        # Follow faster samples quickly and slower ones slowly: the baseline
+        # approximates no-load latency, yet a lasting shift in the target's
+        # latency still becomes the new normal instead of pinning the limit
+        # at its floor.
+        if self.baseline_latency is None:
+            self.baseline_latency = latency
+            return
+        smoothing = self.baseline_fall if latency < self.baseline_latency else self.baseline_rise
+        self.baseline_latency += smoothing * (latency - self.baseline_latency)
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < self.current_limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class Slot:
+    """Handle for one call made under an adaptive limiter."""
+
+    def __init__(self):
+        self.is_dropped = False
+
+    def dropped(self) -> None:
+        """Mark the call as overloaded (429, 5xx, timeout) so the limiter backs off."""
+        self.is_dropped = True
+
+
+class AdaptiveLimiter:
+    """Adaptive concurrency limits applied both globally and per key (host/provider).
+
+    Calls first take a slot under their key's limit and then one under the
+    global limit, so callers queued behind a slow host do not hold global
+    capacity while they wait.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        global_initial: int,
+        global_max: int,
+        key_initial: int,
+        key_max: int,
+        min_limit: int = 1,
+        backoff_ratio: float = 0.9,
+        latency_tolerance: float = 2.0,
+        max_tracked_keys: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.key_initial = key_initial
+        self.key_max = key_max
+        self.min_limit = min_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.max_tracked_keys = max_tracked_keys
+        self.clock = clock
+        self.global_limit = self._new_limit(global_initial, global_max)
+        self._keys: "OrderedDict[str, AIMDLimit]" = OrderedDict()
+        self._publish(GLOBAL_KEY, self.global_limit)
+
+    def limit_for(self, key: str) -> AIMDLimit:
+        limit = self._keys.get(key)
+        if limit is None:
+            limit = self._new_limit(self.key_initial, self.key_max)
+            self._keys[key] = limit
+            self._evict_idle_keys()
+        else:
+            self._keys.move_to_end(key)
+        return limit
+
+    @asynccontextmanager
+    async def acquire(self, key: str) -> AsyncIterator[Slot]:
+        """Hold a slot for key for the duration of the block.
+
+        An overload error (see is_overload_error) escaping the block counts
+        as a dropped call; any other exception, or cancellation, frees the
+        slot without adapting the limit.
+        """
+        key_limit = self.limit_for(key)
+        await key_limit.acquire()
+        try:
+            await self.global_limit.acquire()
+        except BaseException:
+            key_limit.cancel()
+            raise
+
+        self._publish(key, key_limit)
+        slot = Slot()
+        started = self.clock()
+        learn = True
+        try:
+            yield slot
+        except Exception as e:
+            if is_overload_error(e):
+                slot.dropped()
+            elif not slot.is_dropped:
+                learn = False
+            raise
+        except BaseException:
+            # Cancelled: the latency was cut short and says nothing about load
+            learn = False
+            raise
+        finally:
+            latency = self.clock() - started
+            CONCURRENCY_LATENCY.labels(self.name).observe(latency)
+            for limit in (self.global_limit, key_limit):
+                if not learn:
+                    limit.cancel()
+                    continue
+                reason = limit.release(latency, slot.is_dropped)
+                if reason:
+                    CONCURRENCY_DROPS.labels(self.name, reason).inc()
+            self._publish(GLOBAL_KEY, self.global_limit)
+            self._publish(key, key_limit)
+
+    def snapshot(self) -> dict:
+        """Current limits, for debugging and tests."""
+        return {
+            "global": self.global_limit.current_limit,
+            "keys": {key: limit.current_limit for key, limit in self._keys.items()},
+        }
+
+    def _new_limit(self, initial: int, max_limit: int) -> AIMDLimit:
+        return AIMDLimit(
+            initial=initial,
+            min_limit=self.min_limit,
+            max_limit=max_limit,
+            backoff_ratio=self.backoff_ratio,
+            latency_tolerance=self.latency_tolerance,
+            clock=self.clock,
+        )
+
+    def _evict_idle_keys(self) -> None:
+        # Bound memory and metric cardinality when touching many distinct hosts
+        while len(self._keys) > self.max_tracked_keys:
+            for key, limit in self._keys.items():
+                if limit.in_flight == 0 and not limit._waiters:
+                    del self._keys[key]
+                    self._unpublish(key)
+                    break
+            else:
+                return
+
+    def _publish(self, key: str, limit: AIMDLimit) -> None:
+        CONCURRENCY_LIMIT.labels(self.name, key).set(limit.current_limit)
+        CONCURRENCY_IN_FLIGHT.labels(self.name, key).set(limit.in_flight)
+
+    def _unpublish(self, key: str) -> None:
+        for gauge in (CONCURRENCY_LIMIT, CONCURRENCY_IN_FLIGHT):
+            try:
+                gauge.remove(self.name, key)
+            except KeyError:
+                pass
+
+
+@asynccontextmanager
+async def unlimited(key: str) -> AsyncIterator[Slot]:
+    """Stand-in for AdaptiveLimiter.acquire when no limiter is configured."""
+    yield Slot()
+
+
+def build_fetch_limiter() -> AdaptiveLimiter:
+    """Limiter for outbound page fetches, keyed by host."""
+    return AdaptiveLimiter(
+        "fetch",
+        global_initial=settings.fetch_concurrency_initial,
+        global_max=settings.fetch_concurrency_max,
+        key_initial=settings.fetch_host_concurrency_initial,
+        key_max=settings.fetch_host_concurrency_max,
+        backoff_ratio=settings.concurrency_backoff_ratio,
+        latency_tolerance=settings.concurrency_latency_tolerance,
+    )
+
+
+def build_provider_limiter() -> AdaptiveLimiter:
+    """Limiter for backlink provider calls, keyed by provider name."""
+    return AdaptiveLimiter(
+        "backlink_provider",
+        global_initial=settings.provider_concurrency_initial,
+        global_max=settings.provider_concurrency_max,
+        key_initial=settings.provider_concurrency_initial,
+        key_max=settings.provider_concurrency_max,
+        backoff_ratio=settings.concurrency_backoff_ratio,
+        latency_tolerance=settings.concurrency_latency_tolerance,
+    )
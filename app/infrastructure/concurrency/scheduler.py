@@ -0,0 +1,306 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+from app.infrastructure.cache.singleflight import SingleFlight
+from app.core.metrics import SCHEDULER_QUEUE_DEPTH, SCHEDULER_WAIT, SCHEDULER_BUDGET_EXHAUSTED
+
+
+class Priority(str, Enum):
+    INTERACTIVE = "interactive"
+    BACKGROUND = "background"
+    BULK = "bulk"
+
+
+PRIORITY_RANK = {
+    Priority.INTERACTIVE: 0,
+    Priority.BACKGROUND: 1,
+    Priority.BULK: 2,
+}
+
+# Tenant that work shared between several tenants' jobs is scheduled as
+SHARED_TENANT = "shared"
+
+
+class BudgetExceeded(Exception):
+    """Raised when a job has used up its fetch or wall-time budget."""
+
+
+@dataclass
+class JobBudget:
+    max_fetches: Optional[int] = None
+    max_wall_time: Optional[float] = None
+
+
+@dataclass
+class JobContext:
+    """Scheduling identity and budget for the job the current task works for."""
+
+    priority: Priority
+    tenant: str
+    budget: JobBudget = field(default_factory=JobBudget)
+    started_at: float = field(default_factory=time.monotonic)
+    fetches: int = 0
+    exhausted: bool = False
+
+    def check(self, fetch: bool) -> None:
+        """Charge one unit of work, raising BudgetExceeded once the budget is spent."""
+        budget = self.budget
+        if budget.max_wall_time is not None and time.monotonic() - self.started_at > budget.max_wall_time:
+            self._exhaust("wall_time")
+        if fetch:
+            if budget.max_fetches is not None and self.fetches >= budget.max_fetches:
+                self._exhaust("fetches")
+            self.fetches += 1
+
+    def _exhaust(self, reason: str) -> None:
+        if not self.exhausted:
+            SCHEDULER_BUDGET_EXHAUSTED.labels(self.priority.value, reason).inc()
+        self.exhausted = True
+        raise BudgetExceeded(f"Job exceeded its {reason} budget")
+
+    def promote(self, priority: Priority, tenant: str, budget: JobBudget) -> None:
+        """Widen the job for another caller waiting on it.
+
+        Takes the more urgent of the two priorities and the larger of the two
+        budgets. Once callers of different tenants wait on the job it is no
+        longer charged to any one of them.
+        """
+        if PRIORITY_RANK[priority] < PRIORITY_RANK[self.priority]:
+            self.priority = priority
+        if tenant != self.tenant:
+            self.tenant = SHARED_TENANT
+        self.budget = JobBudget(
+            max_fetches=_larger(self.budget.max_fetches, budget.max_fetches),
+            max_wall_time=_larger(self.budget.max_wall_time, budget.max_wall_time),
+        )
+
+
+def _larger(current, other):
+    # None means unlimited
+    if current is None or other is None:
+        return None
+    return max(current, other)
+
+
+# Tasks spawned while a job is active (gather, create_task) inherit this
+current_job: ContextVar[Optional[JobContext]] = ContextVar("current_job", default=None)
+
+
+@contextmanager
+def job_scope(
+    priority: Priority,
+    tenant: str,
+    budget: Optional[JobBudget] = None
+) -> Iterator[JobContext]:
+    """Run the enclosed work as a job with the given priority, tenant and budget."""
+    job = JobContext(priority=priority, tenant=tenant, budget=budget or default_budget(priority))
+    token = current_job.set(job)
+    try:
+        yield job
+    finally:
+        current_job.reset(token)
+
+
+def default_budget(priority: Priority) -> JobBudget:
+    if priority == Priority.INTERACTIVE:
+        return JobBudget(
+            max_fetches=settings.interactive_job_max_fetches,
+            max_wall_time=settings.interactive_job_max_wall_time,
+        )
+    return JobBudget(
+        max_fetches=settings.job_max_fetches,
+        max_wall_time=settings.job_max_wall_time,
+    )
+
+
+T = TypeVar("T")
+
+
+class SharedJobs:
+    """Singleflight for work done on behalf of several jobs at once.
+
+    The shared task runs as a job of its own instead of inheriting the scope
+    of whichever caller happened to start it. The job starts with the
+    priority, tenant and budget of the first caller and is promoted (see
+    ``JobContext.promote``) by every caller that joins, so an interactive
+    request waiting on work started by a background one raises it to
+    interactive priority from its next fetch on.
+    """
+
+    def __init__(self, budget: Callable[[Priority], JobBudget] = default_budget):
+        self.budget = budget
+        self._singleflight = SingleFlight()
+        self._jobs: Dict[str, JobContext] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn for key as a shared job, or join the one already running for it."""
+        caller = current_job.get()
+        priority = caller.priority if caller else Priority.BACKGROUND
+        tenant = caller.tenant if caller else "anonymous"
+        budget = self.budget(priority)
+
+        job = self._jobs.get(key)
+        if job is not None:
+            job.promote(priority, tenant, budget)
+
+        def start() -> Awaitable[T]:
+            # Only called by the caller that starts the shared task
+            shared = JobContext(priority=priority, tenant=tenant, budget=budget)
+            self._jobs[key] = shared
+            return self._run(key, shared, fn)
+
+        return await self._singleflight.do(key, start)
+
+    async def _run(self, key: str, job: JobContext, fn: Callable[[], Awaitable[T]]) -> T:
+        # The task runs in a copy of the starting caller's context, so this
+        # does not leak into the caller's own scope.
+        current_job.set(job)
+        try:
+            return await fn()
+        finally:
+            if self._jobs.get(key) is job:
+                del self._jobs[key]
+
+    def __len__(self) -> int:
+        return len(self._singleflight)
+
+
+class JobScheduler:
+    """Admission control for fetch and provider work units.
+
+    Work is admitted in strict priority order (interactive, background, bulk).
+    Within a priority class, tenants share capacity by weighted fair queuing:
+    each queued unit gets a virtual finish time of
+    ``max(class virtual time, tenant's last finish) + 1 / weight`` and the
+    smallest finish time goes first, so a tenant with a huge backlog cannot
+    starve one with a single request. ``interactive_reserve`` slots are kept
+    free for interactive work so bulk jobs only ever use spare capacity.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        interactive_reserve: int = 0,
+        tenant_weights: Optional[Dict[str, float]] = None,
+        charge_fetches: bool = False,
+    ):
+        self.name = name
+        self.capacity = capacity
+        self.interactive_reserve = min(interactive_reserve, capacity - 1)
+        self.tenant_weights = tenant_weights or {}
+        self.charge_fetches = charge_fetches
+        self.in_use = 0
+        self._queue: List[Tuple[int, float, int, asyncio.Future, Priority, float]] = []
+        self._seq = itertools.count()
+        self._virtual_time: Dict[Priority, float] = {p: 0.0 for p in Priority}
+        self._last_finish: Dict[Tuple[Priority, str], float] = {}
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one unit of capacity for the enclosed work."""
+        job = current_job.get()
+        priority = job.priority if job else Priority.BACKGROUND
+        tenant = job.tenant if job else "anonymous"
+        if job is not None:
+            job.check(fetch=self.charge_fetches)
+
+        queued_at = time.monotonic()
+        await self._acquire(priority, tenant)
+        SCHEDULER_WAIT.labels(self.name, priority.value).observe(time.monotonic() - queued_at)
+        try:
+            yield
+        finally:
+            self.in_use -= 1
+            self._dispatch()
+
+    def _has_capacity(self, priority: Priority) -> bool:
+        if priority == Priority.INTERACTIVE:
+            return self.in_use < self.capacity
+        return self.in_use < self.capacity - self.interactive_reserve
+
+    async def _acquire(self, priority: Priority, tenant: str) -> None:
+        weight = self.tenant_weights.get(tenant, 1.0)
+        key = (priority, tenant)
+        start = max(self._virtual_time[priority], self._last_finish.get(key, 0.0))
+        finish = start + 1.0 / weight
+        self._last_finish[key] = finish
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._queue,
+            (PRIORITY_RANK[priority], finish, next(self._seq), waiter, priority, start),
+        )
+        SCHEDULER_QUEUE_DEPTH.labels(self.name, priority.value).inc()
+        # Everything goes through the queue so ordering is decided in one place;
+        # with free capacity the waiter is granted immediately.
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Capacity was handed to us just before cancellation; pass it on
+                self.in_use -= 1
+                self._dispatch()
+            raise
+
+    def _dispatch(self) -> None:
+        while self._queue:
+            _, _, _, waiter, priority, start = self._queue[0]
+            if waiter.done():
+                # Cancelled while queued
+                heapq.heappop(self._queue)
+                SCHEDULER_QUEUE_DEPTH.labels(self.name, priority.value).dec()
+                continue
+            if not self._has_capacity(priority):
+                return
+            heapq.heappop(self._queue)
+            SCHEDULER_QUEUE_DEPTH.labels(self.name, priority.value).dec()
+            self._virtual_time[priority] = max(self._virtual_time[priority], start)
+            self.in_use += 1
+            waiter.set_result(None)
+        self._prune_idle_tenants()
+
+    def _prune_idle_tenants(self) -> None:
+        # Once a class drains, finish times behind its virtual clock carry no
+        # information; drop them so the map does not grow with every tenant seen.
+        if len(self._last_finish) > 10000:
+            self._last_finish = {
+                key: finish
+                for key, finish in self._last_finish.items()
+                if finish > self._virtual_time[key[0]]
+            }
+
+
+def build_fetch_scheduler() -> JobScheduler:
+    """Scheduler for page fetches; charges each admitted fetch to the job's budget."""
+    return JobScheduler(
+        "fetch",
+        capacity=settings.scheduler_fetch_capacity,
+        interactive_reserve=settings.scheduler_interactive_reserve,
+        tenant_weights=settings.scheduler_tenant_weights,
+        charge_fetches=True,
+    )
+
+
+def build_provider_scheduler() -> JobScheduler:
+    """Scheduler for backlink provider calls.
+
+    Kept separate from the fetch scheduler because provider calls (such as the
+    in-domain crawler) make fetches while holding their slot; sharing one pool
+    could deadlock.
+    """
+    return JobScheduler(
+        "backlink_provider",
+        capacity=settings.scheduler_provider_capacity,
+        interactive_reserve=settings.scheduler_interactive_reserve,
+        tenant_weights=settings.scheduler_tenant_weights,
+    )
@@ -0,0 +1 @@
+# DNS module initialization
@@ -0,0 +1,248 @@
+import asyncio
+import socket
+import typing
+from contextlib import contextmanager
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Type
+import httpcore
+import httpx
+from app.core.metrics import DNS_CONNECT_ATTEMPTS
+from app.infrastructure.dns.resolver import Address, DNSResolutionError, Resolver, ip_literal
+
+FAMILY_NAMES = {socket.AF_INET: "ipv4", socket.AF_INET6: "ipv6"}
+
+# httpcore errors and the httpx errors callers expect in their place
+HTTPCORE_ERRORS: Dict[Type[Exception], Type[httpx.HTTPError]] = {
+    httpcore.TimeoutException: httpx.TimeoutException,
+    httpcore.ConnectTimeout: httpx.ConnectTimeout,
+    httpcore.ReadTimeout: httpx.ReadTimeout,
+    httpcore.WriteTimeout: httpx.WriteTimeout,
+    httpcore.PoolTimeout: httpx.PoolTimeout,
+    httpcore.NetworkError: httpx.NetworkError,
+    httpcore.ConnectError: httpx.ConnectError,
+    httpcore.ReadError: httpx.ReadError,
+    httpcore.WriteError: httpx.WriteError,
+    httpcore.ProxyError: httpx.ProxyError,
+    httpcore.UnsupportedProtocol: httpx.UnsupportedProtocol,
+    httpcore.ProtocolError: httpx.ProtocolError,
+    httpcore.LocalProtocolError: httpx.LocalProtocolError,
+    httpcore.RemoteProtocolError: httpx.RemoteProtocolError,
+}
+
+
+def interleave(addresses: List[Address]) -> List[Address]:
+    """Order addresses for connection racing, alternating families (RFC 8305).
+
+    The family of the first resolved address goes first, so the resolver's
+    preference is kept while a broken family only costs one attempt delay.
+    """
+    if not addresses:
+        return []
+    first = addresses[0].family
+    preferred = [a for a in addresses if a.family == first]
+    others = [a for a in addresses if a.family != first]
+    ordered = []
+    for i in range(max(len(preferred), len(others))):
+        ordered.extend(group[i] for group in (preferred, others) if i < len(group))
+    return ordered
+
+
+class ResolvingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """httpcore network backend that resolves through our resolver and races connections.
+
+    Hostnames are resolved with the shared (cached) resolver instead of
+    anyio's per-connection getaddrinfo. Connection attempts to the resolved
+    addresses start ``delay`` seconds apart, or as soon as the previous one
+    fails; the first to connect wins and the rest are cancelled. TLS still
+    uses the original hostname, since httpcore passes it to start_tls.
+    """
+
+    def __init__(
+        self,
+        resolver: Resolver,
+        delay: float = 0.25,
+        backend: Optional[httpcore.AsyncNetworkBackend] = None
+    ):
+        self.resolver = resolver
+        self.delay = delay
+        self.backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: typing.Optional[typing.Iterable[httpcore.SOCKET_OPTION]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        literal = ip_literal(host)
+        if literal is not None:
+            addresses = [literal]
+        else:
+            try:
+                resolution = await asyncio.wait_for(self.resolver.resolve(host), timeout)
+            except DNSResolutionError as e:
+                raise httpcore.ConnectError(str(e)) from e
+            except asyncio.TimeoutError as e:
+                raise httpcore.ConnectTimeout(f"Timed out resolving {host}") from e
+            addresses = interleave(resolution.addresses)
+
+        socket_options = list(socket_options or [])
+        return await self._race(addresses, port, timeout, local_address, socket_options)
+
+    async def _race(
+        self,
+        addresses: List[Address],
+        port: int,
+        timeout: Optional[float],
+        local_address: Optional[str],
+        socket_options: list
+    ) -> httpcore.AsyncNetworkStream:
+        if len(addresses) == 1:
+            return await self._attempt(addresses[0], port, timeout, local_address, socket_options)
+
+        pending: List[asyncio.Task] = []
+        errors: List[Exception] = []
+        winner: Optional[httpcore.AsyncNetworkStream] = None
+        remaining = list(addresses)
+        try:
+            while winner is None and (remaining or pending):
+                if remaining:
+                    address = remaining.pop(0)
+                    pending.append(asyncio.create_task(
+                        self._attempt(address, port, timeout, local_address, socket_options)
+                    ))
+                # Wait for a result, or move on to the next address after the delay
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.delay if remaining else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    pending.remove(task)
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                    elif winner is None:
+                        winner = task.result()
+                    else:
+                        await task.result().aclose()
+        finally:
+            for task in pending:
+                task.cancel()
+            for task in pending:
+                try:
+                    stream = await task
+                except BaseException:
+                    continue
+                # Connected just as we were cancelling; do not leak the socket
+                await stream.aclose()
+
+        if winner is None:
+            raise errors[-1]
+        return winner
+
+    async def _attempt(
+        self,
+        address: Address,
+        port: int,
+        timeout: Optional[float],
+        local_address: Optional[str],
+        socket_options: list
+    ) -> httpcore.AsyncNetworkStream:
+        family = FAMILY_NAMES.get(address.family, "unknown")
+        try:
+            stream = await self.backend.connect_tcp(
+                address.host,
+                port,
+                timeout=timeout,
+                local_address=local_address,
+                socket_options=socket_options,
+            )
+        except asyncio.CancelledError:
+            DNS_CONNECT_ATTEMPTS.labels(family, "cancelled").inc()
+            raise
+        except Exception:
+            DNS_CONNECT_ATTEMPTS.labels(family, "error").inc()
+            raise
+        DNS_CONNECT_ATTEMPTS.labels(family, "connected").inc()
+        return stream
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self.backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
+
+
+@contextmanager
+def _httpx_errors() -> Iterator[None]:
+    try:
+        yield
+    except Exception as e:
+        # The most specific class wins, e.g. ConnectTimeout over TimeoutException
+        for cls in type(e).__mro__:
+            if cls in HTTPCORE_ERRORS:
+                raise HTTPCORE_ERRORS[cls](str(e)) from e
+        raise
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream: typing.AsyncIterable[bytes]):
+        self._stream = stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        with _httpx_errors():
+            async for chunk in self._stream:
+                yield chunk
+
+    async def aclose(self) -> None:
+        if hasattr(self._stream, "aclose"):
+            with _httpx_errors():
+                await self._stream.aclose()
+
+
+class ResolvingTransport(httpx.AsyncBaseTransport):
+    """httpx transport over an httpcore connection pool using ResolvingNetworkBackend.
+
+    httpx.AsyncHTTPTransport has no way to pass a network backend, so the
+    pool is built here and requests and responses are translated the same
+    way httpx does it, including raising httpx exceptions.
+    """
+
+    def __init__(self, resolver: Resolver, limits: httpx.Limits, delay: float = 0.25):
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=ResolvingNetworkBackend(resolver, delay=delay),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        with _httpx_errors():
+            response = await self._pool.handle_async_request(core_request)
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+
+def build_transport(resolver: Resolver, limits: httpx.Limits, delay: float = 0.25) -> ResolvingTransport:
+    """httpx transport whose connection pool resolves through resolver."""
+    return ResolvingTransport(resolver, limits, delay=delay)
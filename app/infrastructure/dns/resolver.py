@@ -0,0 +1,239 @@
+import asyncio
+import ipaddress
+import socket
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import DNS_CACHE_ENTRIES, DNS_LATENCY, DNS_LOOKUPS
+from app.infrastructure.cache.singleflight import SingleFlight
+
+try:
+    import aiodns
+except ImportError:  # pragma: no cover - optional dependency
+    aiodns = None
+
+
+class DNSResolutionError(OSError):
+    """Raised when a hostname has no usable addresses."""
+
+
+@dataclass(frozen=True)
+class Address:
+    family: int  # socket.AF_INET or socket.AF_INET6
+    host: str
+
+
+@dataclass
+class Resolution:
+    addresses: List[Address]
+    ttl: Optional[float] = None  # None when the resolver does not report one
+
+
+class Resolver:
+    """Base class for hostname resolvers."""
+
+    async def resolve(self, host: str) -> Resolution:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class SystemResolver(Resolver):
+    """Resolver backed by the OS (getaddrinfo in the loop's thread pool).
+
+    getaddrinfo reports no TTLs, so cached entries use DNS_DEFAULT_TTL.
+    """
+
+    async def resolve(self, host: str) -> Resolution:
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                host, None, type=socket.SOCK_STREAM
+            )
+        except socket.gaierror as e:
+            raise DNSResolutionError(f"Cannot resolve {host}: {e}") from e
+        addresses = []
+        for family, _, _, _, sockaddr in infos:
+            address = Address(family, sockaddr[0])
+            if family in (socket.AF_INET, socket.AF_INET6) and address not in addresses:
+                addresses.append(address)
+        if not addresses:
+            raise DNSResolutionError(f"Cannot resolve {host}: no IPv4 or IPv6 addresses")
+        return Resolution(addresses)
+
+
+class AioDNSResolver(Resolver):
+    """Non-blocking resolver using c-ares, with record TTLs (optional aiodns extra)."""
+
+    def __init__(self, nameservers: Optional[List[str]] = None):
+        if aiodns is None:
+            raise RuntimeError("The aiodns resolver requires aiodns: pip install 'link-ingestor[dns]'")
+        self._resolver = aiodns.DNSResolver(nameservers=nameservers)
+
+    async def resolve(self, host: str) -> Resolution:
+        results = await asyncio.gather(
+            self._resolver.query(host, "AAAA"),
+            self._resolver.query(host, "A"),
+            return_exceptions=True
+        )
+        addresses: List[Address] = []
+        ttls: List[int] = []
+        for family, records in zip((socket.AF_INET6, socket.AF_INET), results):
+            if isinstance(records, aiodns.error.DNSError):
+                continue
+            if isinstance(records, BaseException):
+                raise records
+            for record in records:
+                addresses.append(Address(family, record.host))
+                ttls.append(record.ttl)
+        if not addresses:
+            raise DNSResolutionError(f"Cannot resolve {host}: no A or AAAA records")
+        return Resolution(addresses, ttl=min(ttls))
+
+    async def close(self) -> None:
+        self._resolver.cancel()
+
+
+class StaticResolver(Resolver):
+    """Resolver answering from a fixed host -> addresses map, for tests and local runs.
+
+    A ``*.example.test`` record answers for every subdomain of example.test
+    that has no record of its own.
+    """
+
+    def __init__(self, records: Dict[str, Iterable[str]], ttl: Optional[float] = None):
+        self.records = {host.lower(): list(addresses) for host, addresses in records.items()}
+        self.ttl = ttl
+        self.queries = 0
+
+    def _lookup(self, host: str) -> Optional[List[str]]:
+        host = host.lower()
+        if host in self.records:
+            return self.records[host]
+        labels = host.split(".")
+        for i in range(1, len(labels)):
+            wildcard = self.records.get("*." + ".".join(labels[i:]))
+            if wildcard is not None:
+                return wildcard
+        return None
+
+    async def resolve(self, host: str) -> Resolution:
+        self.queries += 1
+        hosts = self._lookup(host)
+        if not hosts:
+            raise DNSResolutionError(f"Cannot resolve {host}: not in static records")
+        return Resolution(
+            [Address(_family(address), address) for address in hosts],
+            ttl=self.ttl
+        )
+
+
+def _family(address: str) -> int:
+    return socket.AF_INET6 if ipaddress.ip_address(address).version == 6 else socket.AF_INET
+
+
+def ip_literal(host: str) -> Optional[Address]:
+    """Return host as an Address if it already is an IP address."""
+    try:
+        return Address(_family(host.strip("[]")), host.strip("[]"))
+    except ValueError:
+        return None
+
+
+class CachingResolver(Resolver):
+    """TTL-respecting positive and negative cache in front of another resolver.
+
+    Concurrent lookups of the same host share one query, and at most
+    ``concurrency`` queries run against the upstream resolver at a time so a
+    crawl over thousands of new hosts cannot exhaust the thread pool.
+    """
+
+    def __init__(
+        self,
+        resolver: Resolver,
+        max_entries: int = 10000,
+        default_ttl: float = 60,
+        min_ttl: float = 5,
+        max_ttl: float = 3600,
+        negative_ttl: float = 30,
+        concurrency: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.resolver = resolver
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        # host -> (expires_at, resolution or error)
+        self._cache: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()
+        self._inflight = SingleFlight()
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def resolve(self, host: str) -> Resolution:
+        host = host.lower()
+        entry = self._cache.get(host)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > self.clock():
+                self._cache.move_to_end(host)
+                if isinstance(value, DNSResolutionError):
+                    DNS_LOOKUPS.labels("negative_hit").inc()
+                    raise DNSResolutionError(*value.args)
+                DNS_LOOKUPS.labels("hit").inc()
+                return value
+            del self._cache[host]
+
+        DNS_LOOKUPS.labels("miss").inc()
+        return await self._inflight.do(host, lambda: self._lookup(host))
+
+    async def _lookup(self, host: str) -> Resolution:
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                resolution = await self.resolver.resolve(host)
+            except DNSResolutionError as e:
+                DNS_LOOKUPS.labels("error").inc()
+                self._store(host, self.negative_ttl, e)
+                raise
+            finally:
+                DNS_LATENCY.observe(time.perf_counter() - started)
+
+        ttl = self.default_ttl if resolution.ttl is None else resolution.ttl
+        self._store(host, min(self.max_ttl, max(self.min_ttl, ttl)), resolution)
+        return resolution
+
+    def _store(self, host: str, ttl: float, value: object) -> None:
+        self._cache[host] = (self.clock() + ttl, value)
+        self._cache.move_to_end(host)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        DNS_CACHE_ENTRIES.set(len(self._cache))
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    async def close(self) -> None:
+        await self.resolver.close()
+
+
+def build_resolver() -> CachingResolver:
+    """Process-wide caching resolver configured from settings."""
+    if settings.dns_resolver == "aiodns":
+        upstream: Resolver = AioDNSResolver()
+    elif settings.dns_resolver == "static":
+        upstream = StaticResolver(settings.dns_static_hosts)
+    else:
+        upstream = SystemResolver()
+    return CachingResolver(
+        upstream,
+        max_entries=settings.dns_cache_size,
+        default_ttl=settings.dns_default_ttl,
+        min_ttl=settings.dns_min_ttl,
+        max_ttl=settings.dns_max_ttl,
+        negative_ttl=settings.dns_negative_ttl,
+        concurrency=settings.dns_concurrency,
+    )
@@ -0,0 +1 @@
+# Export module initialization
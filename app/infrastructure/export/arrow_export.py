@@ -0,0 +1,244 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.db.models.backlink import Backlink as BacklinkModel
+from app.db.models.link import Link as LinkModel
+
+# pyarrow is imported by require_pyarrow() on first export, not at startup
+pa: Any = None
+pq: Any = None
+
+EXPORT_KINDS = ("links", "backlinks")
+EXPORT_FORMATS = ("arrow", "parquet")
+
+MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class ExportUnavailable(RuntimeError):
+    """Raised when pyarrow is not installed."""
+
+
+@dataclass
+class ExportFilters:
+    job_id: Optional[int] = None
+    domain: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+
+def require_pyarrow():
+    """Import pyarrow on first use; raise ExportUnavailable if it is not installed."""
+    global pa, pq
+    if pa is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:  # pragma: no cover - optional dependency
+            raise ExportUnavailable("Columnar export requires pyarrow: pip install 'link-ingestor[export]'") from None
+        pa, pq = pyarrow, pyarrow.parquet
+
+
+def _schema(kind: str) -> "pa.Schema":
+    # Domains repeat heavily, so they are dictionary encoded
+    domain_type = pa.dictionary(pa.int32(), pa.string())
+    timestamp = pa.timestamp("us", tz="UTC")
+    if kind == "links":
+        return pa.schema([
+            ("id", pa.int64()),
+            ("job_id", pa.int64()),
+            ("source_url", pa.string()),
+            ("url", pa.string()),
+            ("domain", domain_type),
+            ("is_external", pa.bool_()),
+            ("title", pa.string()),
+            ("link_text", pa.string()),
+            ("created_at", timestamp),
+            ("last_seen_at", timestamp),
+            ("removed_at", timestamp),
+        ])
+    return pa.schema([
+        ("id", pa.int64()),
+        ("link_id", pa.int64()),
+        ("job_id", pa.int64()),
+        ("target_url", pa.string()),
+        ("target_domain", domain_type),
+        ("backlink_url", pa.string()),
+        ("backlink_domain", domain_type),
+        ("backlink_title", pa.string()),
+        ("anchor_text", pa.string()),
+        ("created_at", timestamp),
+    ])
+
+
+def _query(kind: str, filters: ExportFilters):
+    if kind == "links":
+        query = select(
+            LinkModel.id,
+            LinkModel.job_id,
+            LinkModel.source_url,
+            LinkModel.url,
+            LinkModel.domain,
+            LinkModel.is_external,
+            LinkModel.title,
+            LinkModel.link_text,
+            LinkModel.created_at,
+            LinkModel.last_seen_at,
+            LinkModel.removed_at,
+        )
+        created_at = LinkModel.created_at
+        if filters.domain:
+            query = query.where(LinkModel.domain == filters.domain)
+        order = LinkModel.id
+    else:
+        query = select(
+            BacklinkModel.id,
+            BacklinkModel.link_id,
+            LinkModel.job_id,
+            LinkModel.url.label("target_url"),
+            LinkModel.domain.label("target_domain"),
+            BacklinkModel.backlink_url,
+            BacklinkModel.backlink_domain,
+            BacklinkModel.backlink_title,
+            BacklinkModel.anchor_text,
+            BacklinkModel.created_at,
+        ).join(LinkModel, BacklinkModel.link_id == LinkModel.id)
+        created_at = BacklinkModel.created_at
+        if filters.domain:
+            query = query.where(BacklinkModel.backlink_domain == filters.domain)
+        order = BacklinkModel.id
+
+    # job_id is the last job that saw the link
+    if filters.job_id is not None:
+        query = query.where(LinkModel.job_id == filters.job_id)
+    if filters.since is not None:
+        query = query.where(created_at >= filters.since)
+    if filters.until is not None:
+        query = query.where(created_at < filters.until)
+    return query.order_by(order)
+
+
+def _to_batch(schema: "pa.Schema", rows: List[Any]) -> "pa.RecordBatch":
+    columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+    for row in rows:
+        for name, value in zip(schema.names, row):
+            columns[name].append(value)
+    arrays = []
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(columns[field.name], type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(columns[field.name], type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+async def iter_record_batches(
+    session_factory: async_sessionmaker,
+    kind: str,
+    filters: ExportFilters,
+    batch_size: int = 50000
+) -> AsyncIterator["pa.RecordBatch"]:
+    """Stream stored links or backlinks as Arrow record batches.
+
+    Rows are read with a server-side cursor and converted one batch at a
+    time, so memory stays bounded by batch_size regardless of result size.
+    Conversion is CPU-bound and runs in a worker thread, off the event loop.
+    """
+    require_pyarrow()
+    schema = _schema(kind)
+    async with session_factory() as session:
+        result = await session.stream(
+            _query(kind, filters).execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions(batch_size):
+            yield await asyncio.to_thread(_to_batch, schema, rows)
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to the caller."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+async def stream_export(
+    session_factory: async_sessionmaker,
+    kind: str,
+    export_format: str,
+    filters: ExportFilters,
+    batch_size: int = 50000
+) -> AsyncIterator[bytes]:
+    """Encode an export as an Arrow IPC stream or Parquet file, chunk by chunk.
+
+    Encoding (and compression, for Parquet) runs in a worker thread so a
+    large export does not stall other requests on the event loop.
+    """
+    require_pyarrow()
+    schema = _schema(kind)
+    sink = _ChunkSink()
+    if export_format == "parquet":
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema)
+    else:
+        writer = pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), schema)
+
+    async for batch in iter_record_batches(session_factory, kind, filters, batch_size):
+        await asyncio.to_thread(writer.write_batch, batch)
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+    await asyncio.to_thread(writer.close)
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+
+
+async def write_export(
+    session_factory: async_sessionmaker,
+    path: str,
+    kind: str,
+    export_format: str,
+    filters: ExportFilters,
+    batch_size: int = 50000
+) -> int:
+    """Write an export to a local file; returns the number of rows written."""
+    require_pyarrow()
+    schema = _schema(kind)
+    rows = 0
+    if export_format == "parquet":
+        writer = pq.ParquetWriter(path, schema)
+    else:
+        writer = pa.ipc.new_stream(path, schema)
+    try:
+        async for batch in iter_record_batches(session_factory, kind, filters, batch_size):
+            await asyncio.to_thread(writer.write_batch, batch)
+            rows += batch.num_rows
+    finally:
+        await asyncio.to_thread(writer.close)
+    return rows
@@ -1,37 +1,95 @@
 import httpx
-from typing import Optional, Dict, Any
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, AsyncIterator
+from urllib.parse import urlparse
 from app.core.config import settings
+from app.infrastructure.concurrency.limiter import AdaptiveLimiter, build_fetch_limiter, is_overload_status
+from app.infrastructure.concurrency.scheduler import BudgetExceeded, JobScheduler, build_fetch_scheduler
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 
+def accept_encoding() -> str:
+    """Accept-Encoding listing only the codings httpx can decode here.
+
+    httpx decodes brotli and zstd responses when brotli (or brotlicffi) and
+    zstandard are installed; advertising them otherwise would get us bodies
+    we cannot read.
+    """
+    encodings = []
+    try:
+        import zstandard  # noqa: F401
+        encodings.append("zstd")
+    except ImportError:
+        pass
+    try:
+        import brotli  # noqa: F401
+        encodings.append("br")
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.append("br")
+        except ImportError:
+            pass
+    encodings.extend(["gzip", "deflate"])
+    return ", ".join(encodings)
+
+
 class HTTPFetcher:
-    def __init__(self):
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[JobScheduler] = None
+    ):
         self.timeout = httpx.Timeout(settings.http_timeout)
+        self.limiter = limiter or build_fetch_limiter()
+        self.scheduler = scheduler or build_fetch_scheduler()
+        # A client passed in is shared and owned by the caller; otherwise one is
+        # created on first use and released by close().
+        self._client = client
+        self._owns_client = client is None
         self.headers = {
             "User-Agent": settings.user_agent,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate",
+            "Accept-Encoding": accept_encoding(),
             "Connection": "keep-alive",
         }
     
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+    
+    async def close(self):
+        """Close the HTTP client if this fetcher created it."""
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     async def fetch_page(self, url: str) -> Optional[Dict[str, Any]]:
         """Fetch a web page and return its content and metadata."""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=self.headers, follow_redirects=True)
-                response.raise_for_status()
-                
-                return {
-                    "url": url,
-                    "status_code": response.status_code,
-                    "content": response.text,
-                    "content_type": response.headers.get("content-type", ""),
-                    "final_url": str(response.url),
-                    "headers": dict(response.headers),
-                }
+            # Wait for the host first so a slow host does not tie up shared scheduler capacity
+            async with self.limiter.acquire(urlparse(url).netloc) as slot, self.scheduler.slot():
+                response = await self.client.get(url, headers=self.headers, follow_redirects=True)
+                if self._is_overloaded(response):
+                    slot.dropped()
+            response.raise_for_status()
+            
+            return {
+                "url": url,
+                "status_code": response.status_code,
+                "content": response.text,
+                "content_type": response.headers.get("content-type", ""),
+                "final_url": str(response.url),
+                "headers": dict(response.headers),
+            }
+        except BudgetExceeded:
+            raise
         except httpx.HTTPStatusError as e:
             logger.error("HTTP error fetching page", url=url, status_code=e.response.status_code)
             return None
@@ -42,16 +100,41 @@ class HTTPFetcher:
             logger.error("Unexpected error fetching page", url=url, error=str(e))
             return None
     
-    async def check_robots_txt(self, domain: str) -> Optional[str]:
+    @asynccontextmanager
+    async def stream_page(self, url: str) -> AsyncIterator[httpx.Response]:
+        """Open a streaming GET for a page; the body is read by the caller.
+        
+        Unlike fetch_page, errors are raised rather than logged, and the
+        fetch slot is held until the block exits.
+        """
+        async with self.limiter.acquire(urlparse(url).netloc) as slot, self.scheduler.slot():
+            async with self.client.stream(
+                "GET", url, headers=self.headers, follow_redirects=True
+            ) as response:
+                if self._is_overloaded(response):
+                    slot.dropped()
+                response.raise_for_status()
+                yield response
+    
+    async def check_robots_txt(self, domain: str, scheme: str = "https") -> Optional[str]:
         """Check robots.txt for a domain."""
         try:
-            robots_url = f"https://{domain}/robots.txt"
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(robots_url, headers=self.headers)
-                if response.status_code == 200:
-                    return response.text
-                return None
+            robots_url = f"{scheme}://{domain}/robots.txt"
+            async with self.limiter.acquire(domain) as slot, self.scheduler.slot():
+                # Redirects are followed, e.g. to the www. host or to https
+                response = await self.client.get(robots_url, headers=self.headers, follow_redirects=True)
+                if self._is_overloaded(response):
+                    slot.dropped()
+            if response.status_code == 200:
+                return response.text
+            return None
+        except BudgetExceeded:
+            raise
         except Exception as e:
             logger.error("Error checking robots.txt", domain=domain, error=str(e))
             return None
-
+    
+    @staticmethod
+    def _is_overloaded(response: httpx.Response) -> bool:
+        """Whether the target is signalling that we should slow down."""
+        return is_overload_status(response.status_code)
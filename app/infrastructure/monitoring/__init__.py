@@ -0,0 +1 @@
+# Runtime monitoring module initialization
@@ -0,0 +1,184 @@
+import asyncio
+import os
+import sys
+import sysconfig
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+import structlog
+
+from app.core.config import settings
+from app.core.metrics import LOOP_LAG, LOOP_STALL_SECONDS, LOOP_STALLS
+
+logger = structlog.get_logger(__name__)
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MONITOR_DIR = os.path.dirname(os.path.abspath(__file__))
+# Frames under these paths belong to the standard library or installed packages
+LIBRARY_PATHS = tuple({
+    path for path in (sysconfig.get_path(name) for name in ("stdlib", "platstdlib", "purelib", "platlib")) if path
+})
+OTHER_SITE = "other"
+
+
+@dataclass
+class StallSite:
+    """Aggregated stalls attributed to one call site."""
+
+    site: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seen: float = 0.0  # Unix time
+    stack: List[str] = field(default_factory=list)
+
+
+def _site_name(entry) -> str:
+    filename = entry.filename
+    if filename.startswith(APP_ROOT):
+        filename = os.path.relpath(filename, os.path.dirname(APP_ROOT))
+    return f"{filename}:{entry.lineno} in {entry.name}"
+
+
+def blocking_site(frame) -> tuple:
+    """Call site to blame for a stall, plus the formatted stack.
+
+    The innermost frame outside the standard library and installed packages
+    is blamed (that is the code that called into the blocking library); if
+    the loop is blocked outside such code entirely, the innermost frame is.
+    """
+    summary = traceback.extract_stack(frame)
+    site = None
+    for entry in reversed(summary):
+        if not entry.filename.startswith(LIBRARY_PATHS) and not entry.filename.startswith(MONITOR_DIR):
+            site = _site_name(entry)
+            break
+    if site is None and summary:
+        site = _site_name(summary[-1])
+    return site or "unknown", [line.rstrip() for line in traceback.format_list(summary)]
+
+
+class LoopMonitor:
+    """Measures event-loop lag and catches the code behind stalls.
+
+    A heartbeat task on the loop sleeps for ``interval`` and records how late
+    it wakes up. A watchdog thread checks the heartbeat; when it is more than
+    ``threshold`` seconds overdue the loop is stuck in synchronous code, and
+    the watchdog grabs the loop thread's current stack with
+    ``sys._current_frames()``. The stall is attributed to that call site
+    once the loop recovers. In normal operation the cost is one short
+    timer per interval and a sleeping thread.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        threshold: float = 0.25,
+        max_sites: int = 50,
+        window: int = 3000,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.max_sites = max_sites
+        self.sites: Dict[str, StallSite] = {}
+        self.recent_lags: Deque[float] = deque(maxlen=window)
+        self._beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._pending: Optional[tuple] = None  # (site, stack) captured during the current stall
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watchdog, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        """Stop the heartbeat task and the watchdog thread."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._beat = now
+            lag = max(0.0, now - expected)
+            LOOP_LAG.observe(lag)
+            self.recent_lags.append(lag)
+            if lag >= self.threshold:
+                self._record_stall(lag)
+            else:
+                # A capture racing a beat that turned out on time is not a stall
+                self._pending = None
+
+    def _watchdog(self) -> None:
+        poll = self.threshold / 2
+        while not self._stop.wait(poll):
+            # The heartbeat is due every interval; past that plus the threshold, the loop is stuck
+            if self._pending is not None or time.monotonic() - self._beat < self.interval + self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                self._pending = blocking_site(frame)
+
+    def _record_stall(self, lag: float) -> None:
+        site, stack = self._pending or ("unknown", [])
+        self._pending = None
+        with self._lock:
+            entry = self.sites.get(site)
+            if entry is None:
+                if len(self.sites) >= self.max_sites:
+                    site = OTHER_SITE
+                entry = self.sites.setdefault(site, StallSite(site))
+            entry.count += 1
+            entry.total_seconds += lag
+            entry.max_seconds = max(entry.max_seconds, lag)
+            entry.last_seen = time.time()
+            if stack:
+                entry.stack = stack
+        LOOP_STALLS.labels(site).inc()
+        LOOP_STALL_SECONDS.labels(site).inc(lag)
+        logger.warning("Event loop stalled", seconds=round(lag, 3), site=site)
+
+    def top_sites(self, limit: int = 10) -> List[StallSite]:
+        with self._lock:
+            return sorted(self.sites.values(), key=lambda entry: -entry.total_seconds)[:limit]
+
+    def lag_percentiles(self) -> Dict[str, Optional[float]]:
+        lags = sorted(self.recent_lags)
+        if not lags:
+            return {"p50": None, "p99": None, "max": None}
+        return {
+            "p50": lags[len(lags) // 2],
+            "p99": lags[min(len(lags) - 1, int(len(lags) * 0.99))],
+            "max": lags[-1],
+        }
+
+
+def build_loop_monitor() -> LoopMonitor:
+    """Loop monitor configured from settings."""
+    return LoopMonitor(
+        interval=settings.loop_monitor_interval,
+        threshold=settings.loop_monitor_threshold,
+    )
@@ -1,13 +1,55 @@
-from bs4 import BeautifulSoup
 import httpx
-from typing import List, Dict, Any, Optional
+import re
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 from urllib.parse import urljoin, urlparse
+import structlog
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+logger = structlog.get_logger(__name__)
+
+# Only these schemes can be fetched or looked up by backlink providers
+FETCHABLE_SCHEMES = frozenset({"http", "https"})
+
+# Page chrome rather than content: links inside these repeat on every page
+BOILERPLATE_TAGS = frozenset({"nav", "header", "footer", "aside"})
+BOILERPLATE_ROLES = frozenset({"navigation", "banner", "contentinfo", "complementary", "menu", "menubar"})
+BOILERPLATE_MARKERS = re.compile(r"(?:^|[-_ ])(?:nav|navbar|menu|header|footer|sidebar|breadcrumbs?)(?:$|[-_ ])", re.I)
+
+
+def in_boilerplate(tag) -> bool:
+    """Whether a tag sits inside navigation, header, footer or sidebar markup."""
+    for parent in tag.parents:
+        if parent.name in BOILERPLATE_TAGS:
+            return True
+        attrs = parent.attrs
+        if not attrs:
+            continue
+        if attrs.get("role") in BOILERPLATE_ROLES:
+            return True
+        marker = attrs.get("id") or ""
+        classes = attrs.get("class")
+        if classes:
+            marker = f"{marker} {' '.join(classes)}"
+        if marker and BOILERPLATE_MARKERS.search(marker):
+            return True
+    return False
+
 
 class HTMLParser:
     """Parser for HTML content to extract links and other information"""
     
-    def __init__(self):
-        self.client = httpx.AsyncClient()
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        # Created lazily so parse-only users never open a connection pool
+        self._client = client
+        self._owns_client = client is None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient()
+        return self._client
     
     async def fetch_url(self, url: str) -> Optional[str]:
         """Fetch HTML content from a URL"""
@@ -16,15 +58,17 @@ class HTMLParser:
             response.raise_for_status()
             return response.text
         except httpx.HTTPError as e:
-            # Log the error
-            print(f"Error fetching URL {url}: {e}")
+            logger.warning("Error fetching URL", url=url, error=str(e))
             return None
     
-    def parse_html(self, html_content: str) -> BeautifulSoup:
+    def parse_html(self, html_content: str) -> "BeautifulSoup":
         """Parse HTML content into BeautifulSoup object"""
+        # Imported on first parse (or by warm-up) to keep it off the import path
+        from bs4 import BeautifulSoup
+
         return BeautifulSoup(html_content, 'lxml')
     
-    def extract_links(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def extract_links(self, soup: "BeautifulSoup") -> List[Dict[str, Any]]:
         """Extract all links from the parsed HTML"""
         links = []
         for a_tag in soup.find_all('a', href=True):
@@ -32,11 +76,12 @@ class HTMLParser:
                 'url': a_tag['href'],
                 'text': a_tag.get_text(strip=True),
                 'title': a_tag.get('title', ''),
+                'in_boilerplate': in_boilerplate(a_tag),
             }
             links.append(link)
         return links
     
-    def extract_metadata(self, soup: BeautifulSoup) -> Dict[str, str]:
+    def extract_metadata(self, soup: "BeautifulSoup") -> Dict[str, str]:
         """Extract metadata from the HTML"""
         metadata = {}
         
@@ -54,11 +99,17 @@ class HTMLParser:
         return metadata
     
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
+        """Close the HTTP client if this parser created it"""
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
         
     def parse_links(self, html_content: str, base_url: str) -> List[Dict[str, Any]]:
-        """Parse HTML content and extract links with base URL resolution"""
+        """Parse HTML content and extract links with base URL resolution
+        
+        Same-page fragment links (``#top``) and hrefs that cannot be fetched
+        (``javascript:``, ``mailto:``, ``tel:``, ``data:``...) are dropped.
+        """
         soup = self.parse_html(html_content)
         links = self.extract_links(soup)
         
@@ -67,16 +118,24 @@ class HTMLParser:
         base_domain = urlparse(base_url).netloc
         
         for link in links:
+            href = link['url'].strip()
+            if not href or href.startswith('#'):
+                continue
+            
             # Resolve relative URLs
-            absolute_url = urljoin(base_url, link['url'])
-            link_domain = urlparse(absolute_url).netloc
+            absolute_url = urljoin(base_url, href)
+            parsed = urlparse(absolute_url)
+            if parsed.scheme.lower() not in FETCHABLE_SCHEMES or not parsed.netloc:
+                continue
+            link_domain = parsed.netloc
             
             processed_link = {
                 'url': absolute_url,
                 'title': link.get('title', ''),
                 'link_text': link.get('text', ''),
                 'domain': link_domain,
-                'is_external': link_domain != base_domain
+                'is_external': link_domain != base_domain,
+                'in_boilerplate': link.get('in_boilerplate', False)
             }
             processed_links.append(processed_link)
             
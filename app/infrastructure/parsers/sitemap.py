@@ -0,0 +1,246 @@
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional
+from urllib.parse import urljoin, urlsplit
+from lxml import etree
+from app.infrastructure.parsers.html import FETCHABLE_SCHEMES
+
+GZIP_MAGIC = b"\x1f\x8b"
+# Limits from the sitemaps protocol: 50,000 entries and 50 MB uncompressed per file
+MAX_SITEMAP_ENTRIES = 50000
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+# Feed links sit in the <head>; give up on pages whose head runs past this
+MAX_HEAD_BYTES = 512 * 1024
+FEED_TYPES = frozenset({"application/rss+xml", "application/atom+xml"})
+
+
+@dataclass
+class SitemapEntry:
+    """A <url>, <sitemap> or feed entry: its location and when it last changed."""
+
+    loc: str
+    lastmod: Optional[datetime] = None
+
+
+def parse_lastmod(value: str) -> Optional[datetime]:
+    """Parse a W3C datetime (``2024``, ``2024-05``, ``2024-05-01``, or a full timestamp) as UTC."""
+    value = value.strip()
+    if value[-1:] in ("Z", "z"):
+        value = value[:-1] + "+00:00"
+    try:
+        if len(value) == 4:
+            parsed = datetime(int(value), 1, 1)
+        elif len(value) == 7:
+            parsed = datetime(int(value[:4]), int(value[5:7]), 1)
+        else:
+            parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def parse_feed_date(value: str) -> Optional[datetime]:
+    """Parse an Atom (W3C datetime) or RSS (RFC 822) date as UTC."""
+    parsed = parse_lastmod(value)
+    if parsed is not None:
+        return parsed
+    try:
+        parsed = parsedate_to_datetime(value.strip())
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def robots_sitemaps(robots_txt: str, base_url: str) -> List[str]:
+    """Sitemap URLs declared in a robots.txt, in order and without duplicates."""
+    sitemaps: List[str] = []
+    for line in robots_txt.splitlines():
+        field, sep, value = line.split("#", 1)[0].partition(":")
+        if not sep or field.strip().lower() != "sitemap" or not value.strip():
+            continue
+        url = urljoin(base_url, value.strip())
+        if urlsplit(url).scheme in FETCHABLE_SCHEMES and url not in sitemaps:
+            sitemaps.append(url)
+    return sitemaps
+
+
+def _local_name(tag) -> Optional[str]:
+    # Comments and processing instructions have no string tag
+    if not isinstance(tag, str):
+        return None
+    return tag.rpartition("}")[2]
+
+
+class FeedLinkParser:
+    """Incremental parser collecting the RSS and Atom feeds an HTML page links to.
+
+    Only ``<link rel="alternate">`` elements with a feed type are read, so
+    parsing stops (``done``) at ``<body>`` or after ``max_bytes``.
+    """
+
+    def __init__(self, base_url: str, max_bytes: int = MAX_HEAD_BYTES):
+        self.base_url = base_url
+        self.max_bytes = max_bytes
+        self.feeds: List[str] = []
+        self.bytes_read = 0
+        self.done = False
+        self._parser = etree.HTMLPullParser(events=("start",), no_network=True)
+
+    def feed(self, chunk: bytes) -> None:
+        if self.done:
+            return
+        self.bytes_read += len(chunk)
+        if self.bytes_read > self.max_bytes:
+            self.done = True
+            return
+        try:
+            self._parser.feed(chunk)
+        except etree.LxmlError:
+            self.done = True
+            return
+        self._read_events()
+
+    def close(self) -> None:
+        if not self.done:
+            try:
+                self._parser.close()
+                self._read_events()
+            except etree.LxmlError:
+                pass
+        self.done = True
+
+    def _read_events(self) -> None:
+        for _, element in self._parser.read_events():
+            if element.tag == "body":
+                self.done = True
+                return
+            if element.tag != "link":
+                continue
+            rels = (element.get("rel") or "").lower().split()
+            kind = (element.get("type") or "").split(";")[0].strip().lower()
+            href = (element.get("href") or "").strip()
+            if "alternate" not in rels or kind not in FEED_TYPES or not href:
+                continue
+            url = urljoin(self.base_url, href)
+            if urlsplit(url).scheme in FETCHABLE_SCHEMES and url not in self.feeds:
+                self.feeds.append(url)
+
+
+class SitemapParser:
+    """Incremental parser for sitemaps, sitemap indexes and feeds, fed with raw body chunks.
+
+    RSS 2.0 and Atom feeds, which the sitemaps protocol accepts in place
+    of a sitemap, are read the same way: each <item> or <entry> becomes a
+    page entry, dated by its <pubDate> or <updated>. Gzipped files (``sitemap.xml.gz``) are recognized by their magic bytes
+    and inflated as they stream in. Each <url> or <sitemap> element is
+    turned into an entry and dropped from the tree as soon as it closes,
+    so memory stays flat however long the file is. Parsing stops
+    (``done``) after ``max_entries`` entries or ``max_bytes`` of XML, or
+    at the first syntax error; entries read until then are kept.
+    """
+
+    def __init__(self, max_entries: int = MAX_SITEMAP_ENTRIES, max_bytes: int = MAX_SITEMAP_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.urls: List[SitemapEntry] = []
+        self.sitemaps: List[SitemapEntry] = []
+        self.bytes_read = 0
+        self.done = False
+        self._head: Optional[bytes] = b""  # None once the first bytes have been sniffed
+        self._gunzip = None
+        self._parser = etree.XMLPullParser(
+            events=("end",), resolve_entities=False, no_network=True, load_dtd=False
+        )
+
+    def feed(self, chunk: bytes) -> None:
+        if self.done:
+            return
+        if self._head is not None:
+            # Decide on gzip once the first two bytes are in
+            self._head += chunk
+            if len(self._head) < len(GZIP_MAGIC):
+                return
+            chunk, self._head = self._head, None
+            if chunk.startswith(GZIP_MAGIC):
+                self._gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            if self._gunzip is not None:
+                # Never inflate past the size limit, whatever the compression ratio
+                chunk = self._gunzip.decompress(chunk, self.max_bytes - self.bytes_read + 1)
+            self.bytes_read += len(chunk)
+            if self.bytes_read > self.max_bytes:
+                self.done = True
+                return
+            self._parser.feed(chunk)
+            self._read_events()
+        except (etree.XMLSyntaxError, zlib.error):
+            self.done = True
+
+    def close(self) -> None:
+        if not self.done and self._head is None:
+            try:
+                self._parser.close()
+                self._read_events()
+            except etree.XMLSyntaxError:
+                pass
+        self.done = True
+
+    def _read_events(self) -> None:
+        for _, element in self._parser.read_events():
+            kind = _local_name(element.tag)
+            if kind in ("url", "sitemap"):
+                entry = self._sitemap_entry(element)
+            elif kind in ("item", "entry"):
+                entry = self._feed_entry(element)
+            else:
+                continue
+            if entry is not None:
+                entries = self.sitemaps if kind == "sitemap" else self.urls
+                entries.append(entry)
+            # Drop the finished entry and the ones before it
+            element.clear()
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+            if len(self.urls) + len(self.sitemaps) >= self.max_entries:
+                self.done = True
+                return
+
+    @staticmethod
+    def _sitemap_entry(element) -> Optional[SitemapEntry]:
+        loc: Optional[str] = None
+        lastmod: Optional[datetime] = None
+        for child in element:
+            name = _local_name(child.tag)
+            if name == "loc" and child.text:
+                loc = child.text.strip()
+            elif name == "lastmod" and child.text:
+                lastmod = parse_lastmod(child.text)
+        return SitemapEntry(loc, lastmod) if loc else None
+
+    @staticmethod
+    def _feed_entry(element) -> Optional[SitemapEntry]:
+        # RSS: <link>url</link> and <pubDate>; Atom: <link href="url"/> and
+        # <updated>, falling back to <published> (or Dublin Core <date>).
+        loc: Optional[str] = None
+        updated: Optional[datetime] = None
+        published: Optional[datetime] = None
+        for child in element:
+            name = _local_name(child.tag)
+            if name == "link" and loc is None:
+                if child.text and child.text.strip():
+                    loc = child.text.strip()
+                elif child.get("href") and child.get("rel", "alternate") == "alternate":
+                    loc = child.get("href").strip()
+            elif name in ("updated", "pubDate") and child.text:
+                updated = parse_feed_date(child.text)
+            elif name in ("published", "date") and child.text:
+                published = parse_feed_date(child.text)
+        return SitemapEntry(loc, updated or published) if loc else None
@@ -0,0 +1,126 @@
+import re
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+from lxml import etree
+from app.infrastructure.parsers.html import FETCHABLE_SCHEMES
+
+# Matches a URL scheme such as "https:" or "mailto:"
+SCHEME_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
+
+
+class _SummaryTarget:
+    """lxml parser target that counts links and reads <head> metadata.
+
+    Receives tokenizer events directly, so no element tree is ever built.
+    """
+
+    def __init__(self, base_domain: str):
+        self.base_domain = base_domain
+        self.title = ""
+        self.description = ""
+        self.og_description = ""
+        self.canonical_url = ""
+        self.total_links = 0
+        self.external_links = 0
+        self.head_done = False
+        self._in_title = False
+        self._title_parts = []
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        if tag == "a":
+            href = attrib.get("href")
+            if href is not None:
+                self._count_link(href.strip())
+            return
+
+        if self.head_done:
+            return
+
+        if tag == "title" and not self.title:
+            self._in_title = True
+        elif tag == "meta":
+            content = attrib.get("content")
+            if content:
+                name = (attrib.get("name") or "").lower()
+                prop = (attrib.get("property") or "").lower()
+                if name == "description" and not self.description:
+                    self.description = content
+                elif prop == "og:description" and not self.og_description:
+                    self.og_description = content
+        elif tag == "link":
+            rel = (attrib.get("rel") or "").lower().split()
+            if "canonical" in rel and attrib.get("href") and not self.canonical_url:
+                self.canonical_url = attrib["href"]
+        elif tag == "body":
+            self.head_done = True
+
+    def end(self, tag: str) -> None:
+        if tag == "title" and self._in_title:
+            self._in_title = False
+            self.title = "".join(self._title_parts).strip()
+        elif tag == "head":
+            self.head_done = True
+
+    def data(self, data: str) -> None:
+        if self._in_title:
+            self._title_parts.append(data)
+
+    def comment(self, text: str) -> None:
+        pass
+
+    def close(self) -> None:
+        if self._in_title:
+            self.title = "".join(self._title_parts).strip()
+        return None
+
+    def _count_link(self, href: str) -> None:
+        # Same classification as HTMLParser.parse_links (urljoin + netloc
+        # comparison) without resolving every URL: relative references are
+        # internal, anything with a scheme or authority uses its own netloc.
+        # Fragment-only and non-HTTP links are skipped there, so here too.
+        if not href or href.startswith("#"):
+            return
+        scheme = SCHEME_RE.match(href)
+        if scheme and scheme.group(0)[:-1].lower() not in FETCHABLE_SCHEMES:
+            return
+        self.total_links += 1
+        if href.startswith("//") or scheme:
+            if urlsplit(href).netloc != self.base_domain:
+                self.external_links += 1
+
+
+class SummaryParser:
+    """Incremental page summarizer fed with raw body chunks.
+
+    Extracts title, description and canonical URL from <head> and counts
+    anchors (split into internal and external) with lxml's event-driven
+    tokenizer instead of building a DOM. Feeding can stop at any point;
+    counts then cover only the bytes seen so far.
+    """
+
+    def __init__(self, base_url: str, encoding: Optional[str] = None):
+        self.target = _SummaryTarget(urlsplit(base_url).netloc)
+        self.bytes_read = 0
+        self._parser = etree.HTMLParser(target=self.target, encoding=encoding)
+
+    def feed(self, chunk: bytes) -> None:
+        self.bytes_read += len(chunk)
+        self._parser.feed(chunk)
+
+    def close(self) -> None:
+        try:
+            self._parser.close()
+        except etree.LxmlError:
+            # Truncated documents are expected when stopping early
+            pass
+
+    def result(self) -> Dict[str, Any]:
+        target = self.target
+        return {
+            "title": target.title,
+            "description": target.description or target.og_description,
+            "canonical_url": target.canonical_url or None,
+            "total_links_found": target.total_links,
+            "external_links": target.external_links,
+            "internal_links": target.total_links - target.external_links,
+        }
@@ -0,0 +1,340 @@
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import structlog
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.metrics import RATE_LIMIT_DECISIONS
+
+logger = structlog.get_logger(__name__)
+
+# GCRA in one round trip. Times are in milliseconds from the Redis server
+# clock so every replica agrees on "now". Besides the request's own cost, up
+# to ``reserve`` units are charged when they fit under the quota; the caller
+# spends the extra locally. Units it did not spend come back as ``refund``
+# on its next call for the key.
+#   KEYS[1]  theoretical arrival time (TAT) key
+#   ARGV[1]  emission interval (ms per cost unit)
+#   ARGV[2]  burst tolerance (ms)
+#   ARGV[3]  cost
+#   ARGV[4]  reserve: most units to charge (at least cost)
+#   ARGV[5]  refund: unspent units from the caller's previous reservation
+# Returns {granted, remaining, retry_after_ms, reset_after_ms}; granted is 0 when denied
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local reserve = tonumber(ARGV[4])
+local refund = tonumber(ARGV[5])
+local t = redis.call("TIME")
+local now = t[1] * 1000 + t[2] / 1000
+
+local tat = tonumber(redis.call("GET", KEYS[1]))
+if tat ~= nil then
+    tat = tat - refund * interval
+end
+if tat == nil or tat < now then
+    tat = now
+end
+-- Units that fit under the quota right now
+local fit = math.floor((tolerance - (tat - now)) / interval + 1e-9)
+local granted = math.min(reserve, fit)
+
+if granted < cost then
+    if refund > 0 and tat > now then
+        redis.call("SET", KEYS[1], tat, "PX", math.ceil(tat - now))
+    end
+    local allow_at = tat + cost * interval - tolerance
+    return {0, math.max(fit, 0), math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+
+local new_tat = tat + granted * interval
+local reset_after = new_tat - now
+redis.call("SET", KEYS[1], new_tat, "PX", math.ceil(reset_after))
+return {granted, math.floor((tolerance - reset_after) / interval + 1e-9), 0, math.ceil(reset_after)}
+"""
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # Seconds until the request would be allowed (0 when allowed)
+    reset_after: float  # Seconds until the full burst is available again
+    granted: int = 0  # Units charged to the backend; above the cost when a lease was reserved
+
+
+@dataclass
+class RateLimitPolicy:
+    """``limit`` cost units per ``window`` seconds, allowing bursts of ``burst`` units."""
+
+    limit: int
+    window: float
+    burst: Optional[int] = None
+
+    @property
+    def emission_interval(self) -> float:
+        return self.window / self.limit
+
+    @property
+    def tolerance(self) -> float:
+        return self.emission_interval * (self.burst or self.limit)
+
+
+class MemoryRateLimitBackend:
+    """In-process GCRA state, for tests, single-replica runs and Redis outages.
+
+    Follows GCRA_SCRIPT exactly, reservations and refunds included.
+    """
+
+    def __init__(self, max_keys: int = 100000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._tat: "OrderedDict[str, float]" = OrderedDict()
+
+    async def check(
+        self,
+        key: str,
+        policy: RateLimitPolicy,
+        cost: int,
+        reserve: Optional[int] = None,
+        refund: int = 0,
+    ) -> RateLimitResult:
+        now = self.clock()
+        interval = policy.emission_interval
+        tolerance = policy.tolerance
+        tat = self._tat.get(key)
+        if tat is not None:
+            tat -= refund * interval
+        tat = now if tat is None or tat < now else tat
+        fit = math.floor((tolerance - (tat - now)) / interval + 1e-9)
+        granted = min(reserve or cost, fit)
+
+        if granted < cost:
+            if refund > 0 and tat > now:
+                self._store(key, tat)
+            return RateLimitResult(
+                allowed=False,
+                limit=policy.burst or policy.limit,
+                remaining=max(0, fit),
+                retry_after=tat + cost * interval - tolerance - now,
+                reset_after=tat - now,
+            )
+
+        new_tat = tat + granted * interval
+        self._store(key, new_tat)
+        return RateLimitResult(
+            allowed=True,
+            limit=policy.burst or policy.limit,
+            remaining=math.floor((tolerance - (new_tat - now)) / interval + 1e-9),
+            retry_after=0.0,
+            reset_after=new_tat - now,
+            granted=granted,
+        )
+
+    def _store(self, key: str, tat: float) -> None:
+        self._tat[key] = tat
+        self._tat.move_to_end(key)
+        while len(self._tat) > self.max_keys:
+            # Least recently seen first; their TATs have usually passed already
+            self._tat.popitem(last=False)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisRateLimitBackend:
+    """GCRA state shared across replicas, one atomic script call per check."""
+
+    def __init__(self, redis_url: str, key_prefix: str = "ratelimit"):
+        self.redis_url = redis_url
+        self.key_prefix = key_prefix
+        self._redis: Optional[aioredis.Redis] = None
+        self._script = None
+
+    def _get_script(self):
+        if self._script is None:
+            self._redis = aioredis.from_url(self.redis_url)
+            # register_script uses EVALSHA and reloads the script on NOSCRIPT
+            self._script = self._redis.register_script(GCRA_SCRIPT)
+        return self._script
+
+    async def check(
+        self,
+        key: str,
+        policy: RateLimitPolicy,
+        cost: int,
+        reserve: Optional[int] = None,
+        refund: int = 0,
+    ) -> RateLimitResult:
+        granted, remaining, retry_after_ms, reset_after_ms = await self._get_script()(
+            keys=[f"{self.key_prefix}:{key}"],
+            args=[policy.emission_interval * 1000, policy.tolerance * 1000, cost, reserve or cost, refund],
+        )
+        return RateLimitResult(
+            allowed=granted > 0,
+            limit=policy.burst or policy.limit,
+            remaining=int(remaining),
+            retry_after=retry_after_ms / 1000,
+            reset_after=reset_after_ms / 1000,
+            granted=int(granted),
+        )
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+            self._script = None
+
+
+@dataclass
+class _Lease:
+    """Units reserved from the backend for one client and spendable locally."""
+
+    units: int
+    expires_at: float
+    reserved_at: float
+    limit: int
+    remaining: int  # Backend quota left after the reservation, not counting units
+    reset_after: float
+
+
+class RateLimiter:
+    """Cost-weighted GCRA rate limiting per client.
+
+    For a client seen again within ``lease_ttl`` seconds, each backend call
+    reserves up to ``lease_size`` times the request's cost when that fits
+    its quota. The units beyond the request's own are spent on the client's
+    next requests to this replica, until ``lease_ttl`` after the
+    reservation, without a Redis round trip. Whatever is left unspent after that
+    is refunded on the next backend call, so leasing never costs a client
+    quota. Denials are cached locally until their retry time, so a client
+    hammering the API past its quota is rejected without a Redis round trip.
+    When Redis is unreachable, limits fall back to per-replica in-memory
+    state for a while instead of failing requests.
+    """
+
+    def __init__(
+        self,
+        policy: RateLimitPolicy,
+        backend,
+        fallback: Optional[MemoryRateLimitBackend] = None,
+        lease_size: int = 1,
+        lease_ttl: float = 1.0,
+        max_denied_keys: int = 100000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.policy = policy
+        self.backend = backend
+        self.fallback = fallback or MemoryRateLimitBackend(clock=clock)
+        self.lease_size = max(1, lease_size)
+        self.lease_ttl = lease_ttl
+        self.max_denied_keys = max_denied_keys
+        self.clock = clock
+        # (key, cost) -> (retry time, denial); cheaper requests are checked separately
+        self._denied: Dict[Tuple[str, int], Tuple[float, RateLimitResult]] = {}
+        self._leases: "OrderedDict[str, _Lease]" = OrderedDict()
+        self._backend_retry_at = 0.0
+
+    async def check(self, key: str, cost: int = 1) -> RateLimitResult:
+        # A cost above the burst size could never be admitted, and the stored
+        # state needs a positive expiry, so costs are clamped to 1..burst
+        burst = self.policy.burst or self.policy.limit
+        cost = max(1, min(cost, burst))
+        now = self.clock()
+        denied = self._denied.get((key, cost))
+        if denied is not None:
+            until, cached = denied
+            if now < until:
+                RATE_LIMIT_DECISIONS.labels("local_deny").inc()
+                return RateLimitResult(
+                    allowed=False,
+                    limit=cached.limit,
+                    remaining=0,
+                    retry_after=until - now,
+                    reset_after=max(0.0, cached.reset_after - (cached.retry_after - (until - now))),
+                )
+            del self._denied[(key, cost)]
+
+        refund = 0
+        busy = False
+        lease = self._leases.pop(key, None)
+        if lease is not None:
+            if now < lease.expires_at and lease.units >= cost:
+                lease.units -= cost
+                self._leases[key] = lease
+                RATE_LIMIT_DECISIONS.labels("local_allow").inc()
+                return RateLimitResult(
+                    allowed=True,
+                    limit=lease.limit,
+                    remaining=lease.remaining + lease.units,
+                    retry_after=0.0,
+                    reset_after=max(0.0, lease.reset_after - (now - lease.reserved_at)),
+                )
+            refund = lease.units
+            busy = now < lease.expires_at
+
+        # Only clients already back within lease_ttl get units reserved ahead,
+        # so one-off requests never leave reserved units stranded on a replica
+        reserve = min(cost * self.lease_size, burst) if busy else cost
+        result = await self._check_backend(key, cost, reserve, refund, now)
+        if result.allowed:
+            RATE_LIMIT_DECISIONS.labels("allowed").inc()
+            extra = result.granted - cost
+            # Kept even when empty: it marks the client as recently seen
+            self._leases[key] = _Lease(
+                units=extra,
+                expires_at=now + self.lease_ttl,
+                reserved_at=now,
+                limit=result.limit,
+                remaining=result.remaining,
+                reset_after=result.reset_after,
+            )
+            # Reserved units are still the client's to spend
+            result.remaining += extra
+            while len(self._leases) > self.max_denied_keys:
+                # Dropping a lease forfeits its units until the key's TAT passes
+                self._leases.popitem(last=False)
+        else:
+            RATE_LIMIT_DECISIONS.labels("limited").inc()
+            if len(self._denied) >= self.max_denied_keys:
+                self._denied.clear()
+            self._denied[(key, cost)] = (now + result.retry_after, result)
+        return result
+
+    async def _check_backend(self, key: str, cost: int, reserve: int, refund: int, now: float) -> RateLimitResult:
+        if now >= self._backend_retry_at:
+            try:
+                return await self.backend.check(key, self.policy, cost, reserve=reserve, refund=refund)
+            except (RedisError, OSError) as e:
+                logger.warning("Rate limit store unavailable, limiting per replica", error=str(e))
+                self._backend_retry_at = now + 30
+        return await self.fallback.check(key, self.policy, cost, reserve=reserve, refund=refund)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+def build_rate_limiter() -> RateLimiter:
+    """Rate limiter configured from settings."""
+    policy = RateLimitPolicy(
+        limit=settings.rate_limit_requests,
+        window=settings.rate_limit_window,
+        burst=settings.rate_limit_burst,
+    )
+    if settings.rate_limit_backend == "memory":
+        backend = MemoryRateLimitBackend()
+    else:
+        backend = RedisRateLimitBackend(settings.redis_url)
+    return RateLimiter(
+        policy,
+        backend,
+        lease_size=settings.rate_limit_lease_size,
+        lease_ttl=settings.rate_limit_lease_ttl,
+    )
@@ -6,6 +6,9 @@ from app.domain.entities import Backlink
 class BacklinkProvider(ABC):
     """Base interface for backlink providers."""
     
+    # Largest share of a lookup's limit this provider may fill (set by the registry)
+    weight: float = 1.0
+    
     @abstractmethod
     async def get_backlinks(self, url: str, limit: int = 10) -> List[Backlink]:
         """Retrieve backlinks for a given URL."""
@@ -21,6 +24,7 @@ class BacklinkProvider(ABC):
     def provider_name(self) -> str:
         """Return the name of the provider."""
         pass
-
-
-
+    
+    async def close(self) -> None:
+        """Release resources held by the provider."""
+        pass
@@ -1,6 +1,8 @@
 import httpx
-from typing import List
+from typing import List, Optional
+from app.core.config import settings
 from app.domain.entities import Backlink
+from app.infrastructure.concurrency.limiter import is_overload_error
 from app.infrastructure.search_providers.base import BacklinkProvider
 import structlog
 
@@ -8,9 +10,15 @@ logger = structlog.get_logger(__name__)
 
 
 class BingBacklinkProvider(BacklinkProvider):
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        client: Optional[httpx.AsyncClient] = None,
+        base_url: Optional[str] = None
+    ):
         self.api_key = api_key
-        self.base_url = "https://api.bing.microsoft.com/v7.0/search"
+        self.client = client
+        self.base_url = base_url or settings.bing_api_url
         self.headers = {
             "Ocp-Apim-Subscription-Key": api_key,
             "Accept": "application/json"
@@ -26,7 +34,7 @@ class BingBacklinkProvider(BacklinkProvider):
     
     async def get_backlinks(self, url: str, limit: int = 10) -> List[Backlink]:
         """Get backlinks using Bing search API."""
-        if not self.is_available():
+        if not await self.is_available():
             logger.warning("Bing provider not available")
             return []
         
@@ -34,44 +42,49 @@ class BingBacklinkProvider(BacklinkProvider):
             # Search for pages linking to the target URL
             query = f'link:"{url}"'
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.base_url,
-                    params={
-                        "q": query,
-                        "count": min(limit, 50),  # Bing allows up to 50
-                        "responseFilter": "Webpages",
-                        "mkt": "en-US"
-                    },
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                backlinks = []
-                
-                if "webPages" in data and "value" in data["webPages"]:
-                    for page in data["webPages"]["value"]:
-                        if len(backlinks) >= limit:
-                            break
-                        
-                        backlink = Backlink(
-                            backlink_url=page.get("url", ""),
-                            backlink_title=page.get("name", ""),
-                            backlink_domain=self._extract_domain(page.get("url", "")),
-                            anchor_text=page.get("snippet", "")[:100] if page.get("snippet") else ""
-                        )
-                        backlinks.append(backlink)
-                
-                logger.info("Bing provider returned backlinks", 
-                           count=len(backlinks), 
-                           url=url)
-                return backlinks
+            params = {
+                "q": query,
+                "count": min(limit, 50),  # Bing allows up to 50
+                "responseFilter": "Webpages",
+                "mkt": "en-US"
+            }
+            if self.client is not None:
+                response = await self.client.get(self.base_url, params=params, headers=self.headers)
+            else:
+                async with httpx.AsyncClient() as client:
+                    response = await client.get(self.base_url, params=params, headers=self.headers)
+            response.raise_for_status()
+            
+            data = response.json()
+            backlinks = []
+            
+            if "webPages" in data and "value" in data["webPages"]:
+                for page in data["webPages"]["value"]:
+                    if len(backlinks) >= limit:
+                        break
+                    
+                    backlink = Backlink(
+                        backlink_url=page.get("url", ""),
+                        backlink_title=page.get("name", ""),
+                        backlink_domain=self._extract_domain(page.get("url", "")),
+                        anchor_text=page.get("snippet", "")[:100] if page.get("snippet") else ""
+                    )
+                    backlinks.append(backlink)
+            
+            logger.debug("Bing provider returned backlinks", 
+                       count=len(backlinks), 
+                       url=url)
+            return backlinks
                 
         except httpx.HTTPStatusError as e:
             logger.error("Bing API HTTP error", status_code=e.response.status_code, url=url)
+            # 429/5xx propagate so the provider limiter backs off
+            if is_overload_error(e):
+                raise
         except httpx.RequestError as e:
             logger.error("Bing API request error", error=str(e), url=url)
+            if is_overload_error(e):
+                raise
         except Exception as e:
             logger.error("Bing API unexpected error", error=str(e), url=url)
         
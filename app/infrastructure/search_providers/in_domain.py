@@ -1,21 +1,44 @@
-from typing import List, Set
-from urllib.parse import urljoin, urlparse
+import asyncio
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urlparse
 from app.domain.entities import Backlink
 from app.infrastructure.search_providers.base import BacklinkProvider
+from app.infrastructure.search_providers.sitemap_discovery import SitemapDiscovery, build_sitemap_discovery
+from app.infrastructure.concurrency.limiter import is_overload_error
+from app.infrastructure.concurrency.scheduler import BudgetExceeded
 from app.infrastructure.http.fetcher_httpx import HTTPFetcher
-from app.infrastructure.parsers.html import HTMLParser
+from app.infrastructure.parsers.html import FETCHABLE_SCHEMES, HTMLParser
 import structlog
-from bs4 import BeautifulSoup
 
 logger = structlog.get_logger(__name__)
 
 
 class InDomainBacklinkProvider(BacklinkProvider):
-    def __init__(self):
-        self.http_fetcher = HTTPFetcher()
-        self.html_parser = HTMLParser()
-        self.visited_urls: Set[str] = set()
-        self.max_depth = 2  # Limit crawling depth
+    """Finds backlinks by checking pages of the target's own site.
+
+    Candidate pages come from the site's sitemaps and feeds, most recently
+    modified first, and are fetched a few at a time until enough backlinks are
+    found. Sites without a sitemap are crawled by following links from
+    the home page instead.
+    """
+
+    def __init__(
+        self,
+        http_fetcher: Optional[HTTPFetcher] = None,
+        html_parser: Optional[HTMLParser] = None,
+        sitemap_discovery: Optional[SitemapDiscovery] = None,
+        max_depth: int = 2,
+        max_pages: int = 100,
+        concurrency: int = 5,
+        use_sitemaps: bool = True,
+    ):
+        self.http_fetcher = http_fetcher or HTTPFetcher()
+        self.html_parser = html_parser or HTMLParser()
+        self.sitemap_discovery = sitemap_discovery or build_sitemap_discovery(self.http_fetcher)
+        self.max_depth = max_depth  # Limit crawling depth
+        self.max_pages = max_pages  # Limit pages visited per lookup
+        self.concurrency = concurrency  # Sitemap pages fetched at once
+        self.use_sitemaps = use_sitemaps
     
     @property
     def provider_name(self) -> str:
@@ -28,43 +51,95 @@ class InDomainBacklinkProvider(BacklinkProvider):
     async def get_backlinks(self, url: str, limit: int = 10) -> List[Backlink]:
         """Find backlinks by crawling the same domain."""
         try:
-            domain = urlparse(url).netloc
+            parsed = urlparse(url)
+            domain = parsed.netloc
             if not domain:
                 return []
             
-            logger.info("Starting in-domain backlink search", url=url, domain=domain)
+            logger.debug("Starting in-domain backlink search", url=url, domain=domain)
             
-            # Start crawling from the domain root
-            root_url = f"https://{domain}"
-            backlinks = await self._crawl_domain_for_backlinks(
-                root_url, url, domain, limit, depth=0
-            )
+            # Same scheme as the target, so the site's own redirects are not paid on every fetch
+            scheme = parsed.scheme if parsed.scheme in FETCHABLE_SCHEMES else "https"
+            origin = f"{scheme}://{domain}"
+            candidates = await self.sitemap_discovery.discover(origin) if self.use_sitemaps else []
+            if candidates:
+                backlinks = await self._scan_pages(
+                    [entry.loc for entry in candidates if entry.loc != url], url, domain, limit
+                )
+            else:
+                # No sitemap: crawl from the home page. Visited pages are tracked per
+                # lookup: the provider is shared across requests, so instance-level
+                # state would leak between them. The target itself is never fetched.
+                backlinks = await self._crawl_domain_for_backlinks(
+                    f"{origin}/", url, domain, limit, depth=0, visited_urls={url}, hosts={domain}
+                )
             
-            logger.info("In-domain provider found backlinks", 
+            logger.debug("In-domain provider found backlinks", 
                        count=len(backlinks), 
                        url=url)
             return backlinks[:limit]
             
+        except BudgetExceeded:
+            raise
         except Exception as e:
             logger.error("Error in in-domain backlink search", url=url, error=str(e))
+            # Overload signals propagate so the provider limiter backs off
+            if is_overload_error(e):
+                raise
             return []
     
+    async def _scan_pages(
+        self, candidates: List[str], target_url: str, domain: str, limit: int
+    ) -> List[Backlink]:
+        """Check sitemap candidates in order, a batch at a time, until limit backlinks are found."""
+        backlinks: List[Backlink] = []
+        candidates = candidates[:self.max_pages]
+        for start in range(0, len(candidates), self.concurrency):
+            batch = candidates[start:start + self.concurrency]
+            pages = await asyncio.gather(*(self.http_fetcher.fetch_page(page_url) for page_url in batch))
+            for page_url, page_data in zip(batch, pages):
+                backlink = self._backlink_from_page(page_url, page_data, target_url, domain)
+                if backlink is not None:
+                    backlinks.append(backlink)
+            if len(backlinks) >= limit:
+                break
+        return backlinks[:limit]
+    
+    def _backlink_from_page(
+        self, page_url: str, page_data: Optional[Dict[str, Any]], target_url: str, domain: str
+    ) -> Optional[Backlink]:
+        """A backlink if the fetched page links to the target."""
+        if not page_data or target_url not in page_data["content"]:
+            return None
+        # Extract page title
+        soup = self.html_parser.parse_html(page_data["content"])
+        title = soup.find("title")
+        title_text = title.get_text(strip=True) if title else ""
+        return Backlink(
+            backlink_url=page_url,
+            backlink_title=title_text,
+            backlink_domain=domain,
+            anchor_text=f"Found link to {target_url}"
+        )
+    
     async def _crawl_domain_for_backlinks(
         self, 
         crawl_url: str, 
         target_url: str, 
         domain: str, 
         limit: int, 
-        depth: int
+        depth: int,
+        visited_urls: Set[str],
+        hosts: Set[str]
     ) -> List[Backlink]:
         """Recursively crawl domain to find pages linking to target URL."""
-        if depth > self.max_depth or len(self.visited_urls) > 100:
+        if depth > self.max_depth or len(visited_urls) > self.max_pages:
             return []
         
-        if crawl_url in self.visited_urls:
+        if crawl_url in visited_urls:
             return []
         
-        self.visited_urls.add(crawl_url)
+        visited_urls.add(crawl_url)
         backlinks = []
         
         try:
@@ -74,31 +149,27 @@ class InDomainBacklinkProvider(BacklinkProvider):
                 return backlinks
             
             # Check if this page links to our target
-            if target_url in page_data["content"]:
-                # Extract page title
-                soup = BeautifulSoup(page_data["content"], "lxml")
-                title = soup.find("title")
-                title_text = title.get_text(strip=True) if title else ""
-                
-                backlink = Backlink(
-                    backlink_url=crawl_url,
-                    backlink_title=title_text,
-                    backlink_domain=domain,
-                    anchor_text=f"Found link to {target_url}"
-                )
+            backlink = self._backlink_from_page(crawl_url, page_data, target_url, domain)
+            if backlink is not None:
                 backlinks.append(backlink)
                 
                 if len(backlinks) >= limit:
                     return backlinks
             
+            # Links are resolved against where the page actually ended up; a host
+            # reached by redirect (e.g. www.) counts as the same site
+            final_url = page_data.get("final_url") or crawl_url
+            visited_urls.add(final_url)
+            hosts.add(urlparse(final_url).netloc)
+            
             # If we haven't found enough backlinks, crawl linked pages
             if len(backlinks) < limit and depth < self.max_depth:
-                raw_links = self.html_parser.parse_links(page_data["content"], crawl_url)
+                raw_links = self.html_parser.parse_links(page_data["content"], final_url)
                 
                 # Filter to same-domain links
                 same_domain_links = [
                     link for link in raw_links 
-                    if link["domain"] == domain and not link["is_external"]
+                    if link["domain"] in hosts
                 ]
                 
                 # Recursively crawl these links
@@ -107,14 +178,14 @@ class InDomainBacklinkProvider(BacklinkProvider):
                         break
                     
                     sub_backlinks = await self._crawl_domain_for_backlinks(
-                        link["url"], target_url, domain, limit - len(backlinks), depth + 1
+                        link["url"], target_url, domain, limit - len(backlinks), depth + 1,
+                        visited_urls, hosts
                     )
                     backlinks.extend(sub_backlinks)
             
+        except BudgetExceeded:
+            raise
         except Exception as e:
             logger.error("Error crawling page", url=crawl_url, error=str(e))
         
         return backlinks
-
-
-
@@ -0,0 +1,158 @@
+"""Build an offline backlink index from CSV edge lists or WARC files.
+
+    python -m app.infrastructure.search_providers.index_builder \\
+        --csv edges.csv --warc crawl.warc.gz --output backlinks.idx
+
+CSV files need ``source_url`` and ``target_url`` columns (``anchor_text`` is
+optional). WARC input needs the optional warcio dependency.
+"""
+import argparse
+import csv
+import gzip
+import heapq
+import io
+import os
+import sys
+import tempfile
+from typing import Iterable, Iterator, List
+from urllib.parse import urldefrag, urljoin, urlparse
+from app.infrastructure.search_providers.offline_index import (
+    Edge,
+    encode_record,
+    index_key,
+    read_record,
+    write_index,
+)
+import structlog
+
+try:
+    from warcio.archiveiterator import ArchiveIterator
+except ImportError:  # pragma: no cover - optional dependency
+    ArchiveIterator = None
+
+logger = structlog.get_logger(__name__)
+
+MAX_WARC_PAYLOAD = 5 * 1024 * 1024
+
+
+def _open_text(path: str):
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def _edge(target: str, source: str, anchor: str):
+    if urlparse(target).scheme not in ("http", "https"):
+        return None
+    return index_key(target), source, " ".join(anchor.split())
+
+
+def iter_csv_edges(path: str) -> Iterator[Edge]:
+    with _open_text(path) as f:
+        reader = csv.DictReader(f)
+        missing = {"source_url", "target_url"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"{path} is missing columns: {', '.join(sorted(missing))}")
+        for row in reader:
+            edge = _edge(row["target_url"], row["source_url"], row.get("anchor_text") or "")
+            if edge is not None:
+                yield edge
+
+
+def iter_warc_edges(path: str) -> Iterator[Edge]:
+    """Yield an edge for every anchor in the HTML responses of a WARC file."""
+    if ArchiveIterator is None:
+        raise RuntimeError("WARC input requires warcio: pip install 'link-ingestor[offline-index]'")
+    from lxml import html as lxml_html
+
+    with open(path, "rb") as f:
+        for record in ArchiveIterator(f):
+            if record.rec_type != "response" or record.http_headers is None:
+                continue
+            if "html" not in (record.http_headers.get_header("Content-Type") or ""):
+                continue
+            source = record.rec_headers.get_header("WARC-Target-URI")
+            payload = record.content_stream().read(MAX_WARC_PAYLOAD)
+            if not source or not payload:
+                continue
+            try:
+                document = lxml_html.document_fromstring(payload)
+            except Exception:
+                continue
+            for anchor in document.iter("a"):
+                href = (anchor.get("href") or "").strip()
+                if not href or href.startswith("#"):
+                    continue
+                target = urldefrag(urljoin(source, href))[0]
+                edge = _edge(target, source, anchor.text_content())
+                if edge is not None:
+                    yield edge
+
+
+def _write_run(edges: List[Edge], directory: str) -> str:
+    edges.sort()
+    fd, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with os.fdopen(fd, "wb") as f:
+        for edge in edges:
+            record = encode_record(edge)
+            if record is not None:
+                f.write(record)
+    return path
+
+
+def _read_run(path: str) -> Iterator[Edge]:
+    with open(path, "rb") as f:
+        while True:
+            edge = read_record(f)
+            if edge is None:
+                return
+            yield edge
+
+
+def build_index(edges: Iterable[Edge], output: str, run_size: int = 1_000_000) -> int:
+    """External merge sort of edges into an index file; returns the edge count.
+
+    Edges are sorted in runs of run_size, spilled to temporary files and
+    merged, so dumps larger than memory can be indexed.
+    """
+    directory = os.path.dirname(os.path.abspath(output))
+    runs: List[str] = []
+    try:
+        buffer: List[Edge] = []
+        for edge in edges:
+            buffer.append(edge)
+            if len(buffer) >= run_size:
+                runs.append(_write_run(buffer, directory))
+                buffer = []
+        if buffer:
+            runs.append(_write_run(buffer, directory))
+        logger.info("Merging sorted runs", runs=len(runs), output=output)
+        return write_index(heapq.merge(*(_read_run(run) for run in runs)), output)
+    finally:
+        for run in runs:
+            os.remove(run)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build an offline backlink index")
+    parser.add_argument("--csv", action="append", default=[], help="CSV edge list (repeatable)")
+    parser.add_argument("--warc", action="append", default=[], help="WARC file (repeatable)")
+    parser.add_argument("--output", "-o", required=True, help="Index file to write")
+    parser.add_argument("--run-size", type=int, default=1_000_000, help="Edges sorted in memory per run")
+    args = parser.parse_args(argv)
+    if not args.csv and not args.warc:
+        parser.error("at least one --csv or --warc input is required")
+
+    def edges() -> Iterator[Edge]:
+        for path in args.csv:
+            yield from iter_csv_edges(path)
+        for path in args.warc:
+            yield from iter_warc_edges(path)
+
+    count = build_index(edges(), args.output, run_size=args.run_size)
+    print(f"Wrote {count} edges to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
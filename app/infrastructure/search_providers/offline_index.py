@@ -0,0 +1,197 @@
+import mmap
+import os
+import struct
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+from app.domain.entities import Backlink
+from app.domain.job_key import normalize_url
+from app.infrastructure.search_providers.base import BacklinkProvider
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# File layout:
+#   header   MAGIC, record count (u64), offset table position (u64)
+#   records  per edge: target/source/anchor lengths (3 x u16) then the UTF-8 bytes,
+#            sorted by (normalized target URL, source URL)
+#   offsets  one u64 file position per record, in record order
+MAGIC = b"LNKIDX01"
+HEADER = struct.Struct("<8sQQ")
+RECORD_HEADER = struct.Struct("<HHH")
+OFFSET = struct.Struct("<Q")
+MAX_FIELD = 0xFFFF
+MAX_ANCHOR = 1024
+
+Edge = Tuple[str, str, str]  # (normalized target URL, source URL, anchor text)
+
+
+def index_key(url: str) -> str:
+    """Key a target URL is stored and looked up under."""
+    return normalize_url(url)
+
+
+def _truncate(value: bytes, limit: int) -> bytes:
+    # Cut on a UTF-8 boundary so the stored field always decodes
+    return value[:limit].decode("utf-8", "ignore").encode("utf-8")
+
+
+def encode_record(edge: Edge) -> Optional[bytes]:
+    """Serialize one edge, or None if its URLs do not fit the format."""
+    target, source, anchor = (field.encode("utf-8") for field in edge)
+    if len(target) > MAX_FIELD or len(source) > MAX_FIELD:
+        return None
+    anchor = _truncate(anchor, MAX_ANCHOR)
+    return RECORD_HEADER.pack(len(target), len(source), len(anchor)) + target + source + anchor
+
+
+def read_record(stream: BinaryIO) -> Optional[Edge]:
+    """Read one edge written by encode_record from a sequential stream."""
+    header = stream.read(RECORD_HEADER.size)
+    if len(header) < RECORD_HEADER.size:
+        return None
+    target_len, source_len, anchor_len = RECORD_HEADER.unpack(header)
+    data = stream.read(target_len + source_len + anchor_len)
+    return (
+        data[:target_len].decode("utf-8"),
+        data[target_len:target_len + source_len].decode("utf-8"),
+        data[target_len + source_len:].decode("utf-8"),
+    )
+
+
+class LinkIndex:
+    """Read-only view of a sorted backlink index file.
+
+    The file is memory-mapped; a lookup binary-searches the offset table and
+    only touches the records it compares against, so it costs O(log n) page
+    reads and never loads the index into Python objects.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is empty, not a link index")
+        magic, self.count, self._offsets_at = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a link index")
+
+    def _offset(self, i: int) -> int:
+        return OFFSET.unpack_from(self._mm, self._offsets_at + i * OFFSET.size)[0]
+
+    def _key_at(self, i: int) -> bytes:
+        position = self._offset(i)
+        target_len = RECORD_HEADER.unpack_from(self._mm, position)[0]
+        start = position + RECORD_HEADER.size
+        return self._mm[start:start + target_len]
+
+    def _entry_at(self, i: int) -> Tuple[str, str]:
+        position = self._offset(i)
+        target_len, source_len, anchor_len = RECORD_HEADER.unpack_from(self._mm, position)
+        start = position + RECORD_HEADER.size + target_len
+        source = self._mm[start:start + source_len]
+        anchor = self._mm[start + source_len:start + source_len + anchor_len]
+        return source.decode("utf-8"), anchor.decode("utf-8")
+
+    def lookup(self, url: str, limit: int) -> List[Tuple[str, str]]:
+        """Return up to limit (source URL, anchor text) pairs linking to url."""
+        key = index_key(url).encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._key_at(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+
+        results = []
+        i = low
+        while i < self.count and len(results) < limit and self._key_at(i) == key:
+            results.append(self._entry_at(i))
+            i += 1
+        return results
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+
+def write_index(edges: Iterator[Edge], path: str) -> int:
+    """Write edges, already sorted by (target, source), as an index file.
+
+    Consecutive duplicate (target, source) pairs are dropped. Record offsets
+    are spooled to a side file so memory stays flat however many edges there are.
+    """
+    count = 0
+    offsets_path = f"{path}.offsets"
+    with open(path, "wb") as out, open(offsets_path, "w+b") as offsets:
+        out.write(HEADER.pack(MAGIC, 0, 0))
+        previous = None
+        for edge in edges:
+            identity = (edge[0], edge[1])
+            if identity == previous:
+                continue
+            record = encode_record(edge)
+            if record is None:
+                continue
+            previous = identity
+            offsets.write(OFFSET.pack(out.tell()))
+            out.write(record)
+            count += 1
+
+        offsets_at = out.tell()
+        offsets.seek(0)
+        while True:
+            chunk = offsets.read(1 << 20)
+            if not chunk:
+                break
+            out.write(chunk)
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, count, offsets_at))
+    os.remove(offsets_path)
+    return count
+
+
+class OfflineIndexBacklinkProvider(BacklinkProvider):
+    """Serves backlinks from a local index built from a crawl dump; no network."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._index: Optional[LinkIndex] = None
+
+    @property
+    def provider_name(self) -> str:
+        return "offline_index"
+
+    @property
+    def index(self) -> Optional[LinkIndex]:
+        if self._index is None and os.path.exists(self.path):
+            self._index = LinkIndex(self.path)
+            logger.info("Opened offline backlink index", path=self.path, edges=self._index.count)
+        return self._index
+
+    async def is_available(self) -> bool:
+        return self.index is not None
+
+    async def get_backlinks(self, url: str, limit: int = 10) -> List[Backlink]:
+        index = self.index
+        if index is None:
+            logger.warning("Offline backlink index not found", path=self.path)
+            return []
+        return [
+            Backlink(
+                backlink_url=source,
+                backlink_title=None,
+                backlink_domain=urlparse(source).netloc,
+                anchor_text=anchor or None
+            )
+            for source, anchor in index.lookup(url, limit)
+        ]
+
+    async def close(self) -> None:
+        if self._index is not None:
+            self._index.close()
+            self._index = None
@@ -0,0 +1,143 @@
+from dataclasses import dataclass, field
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, List, Optional
+import httpx
+from app.core.config import settings
+from app.infrastructure.http.fetcher_httpx import HTTPFetcher
+from app.infrastructure.parsers.html import HTMLParser
+from app.infrastructure.search_providers.base import BacklinkProvider
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+ENTRY_POINT_GROUP = "link_ingestor.backlink_providers"
+
+
+@dataclass
+class ProviderContext:
+    """Shared resources handed to provider factories."""
+
+    http_client: Optional[httpx.AsyncClient] = None
+    http_fetcher: Optional[HTTPFetcher] = None
+    html_parser: Optional[HTMLParser] = None
+
+
+@dataclass
+class ProviderSpec:
+    """One entry of the BACKLINK_PROVIDERS setting."""
+
+    name: str
+    order: int = 100
+    weight: float = 1.0  # Largest share of a lookup's limit the provider may fill
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+# A factory returns None when the provider cannot run with the given options
+ProviderFactory = Callable[..., Optional[BacklinkProvider]]
+
+
+def _bing(
+    context: ProviderContext,
+    api_key: Optional[str] = None,
+    base_url: Optional[str] = None
+) -> Optional[BacklinkProvider]:
+    from app.infrastructure.search_providers.bing import BingBacklinkProvider
+
+    api_key = api_key or settings.bing_api_key
+    if not api_key:
+        return None
+    return BingBacklinkProvider(api_key, client=context.http_client, base_url=base_url)
+
+
+def _in_domain(
+    context: ProviderContext,
+    max_pages: int = 100,
+    max_depth: int = 2,
+    concurrency: int = 5,
+    use_sitemaps: bool = True
+) -> BacklinkProvider:
+    from app.infrastructure.search_providers.in_domain import InDomainBacklinkProvider
+
+    return InDomainBacklinkProvider(
+        context.http_fetcher,
+        context.html_parser,
+        max_pages=max_pages,
+        max_depth=max_depth,
+        concurrency=concurrency,
+        use_sitemaps=use_sitemaps,
+    )
+
+
+def _offline_index(context: ProviderContext, path: str) -> BacklinkProvider:
+    from app.infrastructure.search_providers.offline_index import OfflineIndexBacklinkProvider
+
+    return OfflineIndexBacklinkProvider(path)
+
+
+BUILTIN_FACTORIES: Dict[str, ProviderFactory] = {
+    "bing": _bing,
+    "in_domain": _in_domain,
+    "offline_index": _offline_index,
+}
+
+
+def discover_factories() -> Dict[str, ProviderFactory]:
+    """Built-in factories plus any registered under the entry-point group."""
+    factories = dict(BUILTIN_FACTORIES)
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        eps = eps.select(group=ENTRY_POINT_GROUP)
+    else:  # Python 3.9
+        eps = eps.get(ENTRY_POINT_GROUP, [])
+    for ep in eps:
+        try:
+            factories[ep.name] = ep.load()
+        except Exception as e:
+            logger.error("Failed to load backlink provider plug-in", name=ep.name, error=str(e))
+    return factories
+
+
+def parse_specs(raw: List[Dict[str, Any]]) -> List[ProviderSpec]:
+    specs = []
+    for entry in raw:
+        entry = dict(entry)
+        name = entry.pop("name")
+        order = int(entry.pop("order", 100))
+        weight = float(entry.pop("weight", 1.0))
+        options = entry.pop("options", {})
+        # Any remaining keys are treated as factory options too
+        options.update(entry)
+        specs.append(ProviderSpec(name=name, order=order, weight=weight, options=options))
+    return sorted(specs, key=lambda spec: spec.order)
+
+
+def build_providers(
+    context: ProviderContext,
+    specs: Optional[List[ProviderSpec]] = None
+) -> List[BacklinkProvider]:
+    """Instantiate the configured providers in order.
+
+    Each spec's weight is set on its provider. Unknown names and
+    factories that fail or decline (return None) are logged and skipped.
+    """
+    if specs is None:
+        specs = parse_specs(settings.backlink_providers)
+    factories = discover_factories()
+
+    providers = []
+    for spec in specs:
+        factory = factories.get(spec.name)
+        if factory is None:
+            logger.error("Unknown backlink provider", name=spec.name)
+            continue
+        try:
+            provider = factory(context, **spec.options)
+        except Exception as e:
+            logger.error("Failed to create backlink provider", name=spec.name, error=str(e))
+            continue
+        if provider is None:
+            logger.info("Backlink provider not configured, skipping", name=spec.name)
+            continue
+        provider.weight = spec.weight
+        providers.append(provider)
+    return providers
@@ -0,0 +1,175 @@
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+import httpx
+import structlog
+from app.core.config import settings
+from app.infrastructure.concurrency.scheduler import (
+    BudgetExceeded, JobBudget, Priority, SharedJobs, default_budget
+)
+from app.infrastructure.http.fetcher_httpx import HTTPFetcher
+from app.infrastructure.parsers.html import FETCHABLE_SCHEMES
+from app.infrastructure.parsers.sitemap import FeedLinkParser, SitemapEntry, SitemapParser, robots_sitemaps
+
+logger = structlog.get_logger(__name__)
+
+# Sorts entries without a lastmod after every dated one
+_UNDATED = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def newest_first(entries: List[SitemapEntry]) -> List[SitemapEntry]:
+    """Entries by lastmod, most recent first; undated entries keep their order at the end."""
+    return sorted(entries, key=lambda entry: entry.lastmod or _UNDATED, reverse=True)
+
+
+class SitemapDiscovery:
+    """Lists a site's pages from its sitemaps and feeds.
+
+    Sitemaps are taken from the ``Sitemap:`` lines of robots.txt, or
+    ``/sitemap.xml`` when robots.txt names none. Once those are read, the
+    RSS and Atom feeds the home page links to are read too, as they list
+    the newest pages. Sitemap indexes are followed newest child first, up
+    to ``max_files`` sitemap and feed files and ``max_urls`` page URLs per
+    site. Results, including "no sitemap", are
+    cached per origin for ``cache_ttl`` seconds, and concurrent lookups for
+    the same origin share one discovery, which runs as a job of its own at
+    the most urgent priority among the callers waiting on it.
+    """
+
+    def __init__(
+        self,
+        http_fetcher: HTTPFetcher,
+        max_files: int = 10,
+        max_urls: int = 5000,
+        cache_ttl: float = 3600,
+        max_sites: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.http_fetcher = http_fetcher
+        self.max_files = max_files
+        self.max_urls = max_urls
+        self.cache_ttl = cache_ttl
+        self.max_sites = max_sites
+        self.clock = clock
+        self._cache: "OrderedDict[str, Tuple[float, List[SitemapEntry]]]" = OrderedDict()
+        self._shared = SharedJobs(budget=self._budget)
+
+    async def discover(self, origin: str) -> List[SitemapEntry]:
+        """Page entries for a site (``scheme://host``), most recently modified first."""
+        cached = self._cache.get(origin)
+        if cached is not None and cached[0] > self.clock():
+            self._cache.move_to_end(origin)
+            return cached[1]
+        return await self._shared.do(origin, lambda: self._discover(origin))
+
+    def _budget(self, priority: Priority) -> JobBudget:
+        return JobBudget(
+            max_fetches=self.max_files + 2,  # robots.txt, the home page and the files
+            max_wall_time=default_budget(priority).max_wall_time,
+        )
+
+    async def _discover(self, origin: str) -> List[SitemapEntry]:
+        # Running out of the shared job's budget ends discovery with what was found
+        scheme, host = urlsplit(origin)[:2]
+        pages: Dict[str, SitemapEntry] = {}
+        files = 0
+        try:
+            robots = await self.http_fetcher.check_robots_txt(host, scheme=scheme)
+            pending: Deque[str] = deque(robots_sitemaps(robots, origin) if robots else [])
+            if not pending:
+                pending.append(f"{origin}/sitemap.xml")
+
+            seen: Set[str] = set()
+            feeds_checked = False
+            while files < self.max_files and len(pages) < self.max_urls:
+                if not pending:
+                    if feeds_checked:
+                        break
+                    feeds_checked = True
+                    pending.extend(await self._home_page_feeds(origin))
+                    continue
+                sitemap_url = pending.popleft()
+                if sitemap_url in seen:
+                    continue
+                seen.add(sitemap_url)
+                files += 1
+                parser = await self._fetch(sitemap_url, self.max_urls - len(pages))
+                if parser is None:
+                    continue
+                # Sitemaps may only list pages of their own host
+                allowed = {host, urlsplit(sitemap_url).netloc}
+                for entry in parser.urls:
+                    # Feed links may be relative to the feed
+                    loc = urljoin(sitemap_url, entry.loc)
+                    parts = urlsplit(loc)
+                    if parts.scheme in FETCHABLE_SCHEMES and parts.netloc in allowed and loc not in pages:
+                        pages[loc] = SitemapEntry(loc, entry.lastmod)
+                pending.extend(
+                    child.loc for child in newest_first(parser.sitemaps)
+                    if urlsplit(child.loc).scheme in FETCHABLE_SCHEMES
+                )
+        except BudgetExceeded as e:
+            logger.info("Sitemap discovery stopped early", origin=origin, files=files, error=str(e))
+
+        entries = newest_first(list(pages.values()))[:self.max_urls]
+        logger.debug("Discovered sitemap pages", origin=origin, pages=len(entries), files=files)
+        self._store(origin, entries)
+        return entries
+
+    async def _fetch(self, url: str, max_entries: int) -> Optional[SitemapParser]:
+        parser = SitemapParser(max_entries=max_entries)
+        try:
+            async with self.http_fetcher.stream_page(url) as response:
+                async for chunk in response.aiter_bytes():
+                    parser.feed(chunk)
+                    if parser.done:
+                        break
+        except BudgetExceeded:
+            raise
+        except httpx.HTTPError as e:
+            logger.debug("Sitemap unavailable", url=url, error=str(e))
+            return None
+        except Exception as e:
+            logger.warning("Error reading sitemap", url=url, error=str(e))
+            return None
+        parser.close()
+        return parser
+
+    async def _home_page_feeds(self, origin: str) -> List[str]:
+        url = f"{origin}/"
+        try:
+            async with self.http_fetcher.stream_page(url) as response:
+                parser = FeedLinkParser(str(response.url))
+                async for chunk in response.aiter_bytes():
+                    parser.feed(chunk)
+                    if parser.done:
+                        break
+        except BudgetExceeded:
+            raise
+        except httpx.HTTPError as e:
+            logger.debug("Home page unavailable", url=url, error=str(e))
+            return []
+        except Exception as e:
+            logger.warning("Error reading home page", url=url, error=str(e))
+            return []
+        parser.close()
+        return parser.feeds
+
+    def _store(self, origin: str, entries: List[SitemapEntry]) -> None:
+        self._cache[origin] = (self.clock() + self.cache_ttl, entries)
+        self._cache.move_to_end(origin)
+        while len(self._cache) > self.max_sites:
+            self._cache.popitem(last=False)
+
+
+def build_sitemap_discovery(http_fetcher: HTTPFetcher) -> SitemapDiscovery:
+    """Sitemap discovery configured from settings."""
+    return SitemapDiscovery(
+        http_fetcher,
+        max_files=settings.sitemap_max_files,
+        max_urls=settings.sitemap_max_urls,
+        cache_ttl=settings.sitemap_cache_ttl,
+        max_sites=settings.sitemap_cache_max_sites,
+    )
@@ -1,46 +1,75 @@
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import asdict
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 import structlog
 from app.core.config import settings
-from app.api.v2.routers import ingest
-import time
+from app.core.logging import configure_logging
+from app.api.compression import CompressionMiddleware
+from app.api.rate_limit import RateLimitMiddleware
+from app.api.request_logging import RequestLoggingMiddleware
+from app.core.container import ServiceContainer
+from app.api.v2.routers import domains, export, ingest, schedules
 # from prometheus_fastapi_instrumentator import Instrumentator
 
 # Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
+configure_logging()
 
 logger = structlog.get_logger(__name__)
 
+# Build shared services once per process and close them on shutdown. Warm-up
+# runs after the server starts listening: /health answers at once and /ready
+# turns 200 when it is done.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    container = ServiceContainer()
+    await container.startup()
+    if settings.loop_monitor_enabled:
+        container.start_loop_monitor()
+    app.state.container = container
+    warm_up = asyncio.create_task(container.warm_up())
+    try:
+        yield
+    finally:
+        warm_up.cancel()
+        await container.shutdown()
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.app_name,
     description="Autonomous system for ingesting web pages and extracting links with backlinks",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Instrument the app with Prometheus
 # Instrumentator().instrument(app).expose(app)
 
-# Add CORS middleware
+# Add rate limiting middleware
+app.add_middleware(
+    RateLimitMiddleware,
+    costs=settings.rate_limit_costs,
+    default_cost=settings.rate_limit_default_cost,
+)
+
+# Add response compression middleware
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+    zstd_level=settings.compression_zstd_level,
+)
+
+# Add request logging middleware
+app.add_middleware(RequestLoggingMiddleware)
+
+# Add CORS middleware last so it is outermost and also covers 429 responses
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Configure appropriately for production
@@ -49,29 +78,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    # Log request
-    logger.info("Incoming request",
-                method=request.method,
-                url=str(request.url),
-                client_ip=request.client.host if request.client else None)
-    
-    response = await call_next(request)
-    
-    # Log response
-    process_time = time.time() - start_time
-    logger.info("Request completed",
-                method=request.method,
-                url=str(request.url),
-                status_code=response.status_code,
-                process_time=process_time)
-    
-    return response
-
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -86,13 +92,42 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={"detail": "Internal server error"}
     )
 
-# Health check endpoint
+# Liveness: the process is up and serving
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": settings.app_name}
 
+# Readiness: shared pools and caches are warm, so the instance can take traffic
+@app.get("/ready")
+async def readiness_check(request: Request):
+    if not request.app.state.container.is_warm:
+        return JSONResponse(status_code=503, content={"status": "warming_up", "service": settings.app_name})
+    return {"status": "ready", "service": settings.app_name}
+
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+# Event loop stall report: lag percentiles and the call sites that blocked the loop longest
+if settings.debug_endpoints_enabled:
+    @app.get("/debug/loop", include_in_schema=False)
+    async def loop_report(request: Request, limit: int = 10):
+        monitor = request.app.state.container.loop_monitor
+        if monitor is None:
+            return JSONResponse(status_code=404, content={"detail": "Loop monitor is disabled"})
+        return {
+            "interval_seconds": monitor.interval,
+            "threshold_seconds": monitor.threshold,
+            "lag_seconds": monitor.lag_percentiles(),
+            "top_sites": [asdict(site) for site in monitor.top_sites(limit)],
+        }
+
 # Include routers
 app.include_router(ingest.router, prefix="/v1/ingest", tags=["ingestion"])
+app.include_router(export.router, prefix="/v1/export", tags=["export"])
+app.include_router(domains.router, prefix="/v1/domains", tags=["domains"])
+app.include_router(schedules.router, prefix="/v1/schedules", tags=["schedules"])
 
 # Root endpoint
 @app.get("/")
@@ -101,7 +136,8 @@ async def root():
         "message": "Welcome to Link Ingestor",
         "version": "0.1.0",
         "docs": "/docs",
-        "health": "/health"
+        "health": "/health",
+        "ready": "/ready"
     }
 
 if __name__ == "__main__":
@@ -1,6 +1,17 @@
+import asyncio
+from datetime import datetime
 from celery import Celery
+from celery.signals import worker_init, worker_process_shutdown
 from app.core.config import settings
-from app.domain.services.ingest_service import IngestService
+from app.core.container import ServiceContainer, preload_parsers
+from app.core.logging import configure_logging, shutdown_logging
+from app.db.repositories.aggregates import rebuild_aggregates
+from app.db.repositories.schedule_repository import ScheduleRepository
+from app.db.session import dispose_engine, get_session_factory, init_models
+from app.infrastructure.export.arrow_export import ExportFilters, ExportUnavailable, require_pyarrow, write_export
+from app.infrastructure.concurrency.scheduler import Priority, job_scope
+
+configure_logging()
 
 # Initialize Celery app
 celery_app = Celery('link_ingestor')
@@ -13,13 +24,150 @@ celery_app.config_from_object({
     'enable_utc': True,
 })
 
+def recrawls_active() -> bool:
+    """Scheduled recrawls need the result store: it holds the schedules and records each run."""
+    return settings.recrawl_enabled and settings.persist_results
+
+if recrawls_active():
+    # Run by `celery beat`; the task spreads due recrawls over the tick
+    celery_app.conf.beat_schedule = {
+        'enqueue-due-recrawls': {
+            'task': 'enqueue_due_recrawls',
+            'schedule': float(settings.recrawl_tick_seconds),
+        },
+    }
+
+@worker_init.connect
+def preload(**kwargs):
+    """Load lazily imported libraries once in the worker parent.
+
+    Pool processes are forked after this, so they start with the parsers
+    (and pyarrow, when installed) already in memory instead of each
+    importing them on its first task.
+    """
+    preload_parsers()
+    try:
+        require_pyarrow()
+    except ExportUnavailable:
+        pass
+
+
+@worker_process_shutdown.connect
+def flush_logs(**kwargs):
+    """Flush queued log lines; pool processes exit without running atexit handlers."""
+    shutdown_logging()
+
 @celery_app.task(name='ingest_page')
 def ingest_page(url, include_backlinks=False, max_backlinks_per_link=5):
     """Celery task to ingest a page and extract links."""
-    ingest_service = IngestService()
-    result = ingest_service.ingest_page(
-        url=url,
-        include_backlinks=include_backlinks,
-        max_backlinks_per_link=max_backlinks_per_link
+    result = asyncio.run(_ingest_page(url, include_backlinks, max_backlinks_per_link))
+    return {
+        "source_url": url,
+        "status": result.job.status,
+        "total_links_found": result.total_links,
+        "total_backlinks_found": result.total_backlinks,
+        "error_message": result.job.error_message,
+    }
+
+async def _ingest_page(url, include_backlinks, max_backlinks_per_link):
+    # Each task runs on a fresh event loop, so the container is scoped to it
+    async with ServiceContainer() as container:
+        with job_scope(Priority.BULK, "worker"):
+            return await container.ingest_service.ingest_page(
+                url=url,
+                include_backlinks=include_backlinks,
+                max_backlinks_per_link=max_backlinks_per_link
+            )
+
+
+@celery_app.task(name='export_results')
+def export_results(path, kind='links', export_format='parquet', job_id=None, domain=None, since=None, until=None):
+    """Celery task to export stored links or backlinks to an Arrow/Parquet file."""
+    filters = ExportFilters(
+        job_id=job_id,
+        domain=domain,
+        since=datetime.fromisoformat(since) if since else None,
+        until=datetime.fromisoformat(until) if until else None
     )
-    return result
\ No newline at end of file
+    rows = asyncio.run(_export_results(path, kind, export_format, filters))
+    return {"path": path, "kind": kind, "format": export_format, "rows": rows}
+
+async def _export_results(path, kind, export_format, filters):
+    try:
+        return await write_export(
+            get_session_factory(), path, kind, export_format, filters, settings.export_batch_size
+        )
+    finally:
+        # The engine is bound to this task's event loop
+        await dispose_engine()
+
+
+@celery_app.task(name='rebuild_domain_stats')
+def rebuild_domain_stats():
+    """Celery task to recompute the per-domain aggregate tables from stored links."""
+    asyncio.run(_rebuild_domain_stats())
+    return {"status": "rebuilt"}
+
+async def _rebuild_domain_stats():
+    try:
+        await init_models()
+        async with get_session_factory()() as session, session.begin():
+            await rebuild_aggregates(session)
+    finally:
+        await dispose_engine()
+
+
+@celery_app.task(name='enqueue_due_recrawls')
+def enqueue_due_recrawls():
+    """Celery beat task to hand due scheduled URLs to recrawl_batch jobs.
+
+    Due URLs are claimed in next-run order, grouped into batches and the
+    batches are staggered across the tick, so a burst of due schedules
+    becomes an even trickle of work instead of a spike.
+    """
+    if not recrawls_active():
+        return {"claimed": 0, "batches": 0, "skipped": "recrawls disabled or persistence off"}
+    urls = asyncio.run(_claim_due_recrawls())
+    batch_size = max(1, settings.recrawl_batch_size)
+    batches = [urls[i:i + batch_size] for i in range(0, len(urls), batch_size)]
+    spacing = settings.recrawl_tick_seconds / len(batches) if batches else 0
+    for i, batch in enumerate(batches):
+        recrawl_batch.apply_async(args=[batch], countdown=i * spacing)
+    return {"claimed": len(urls), "batches": len(batches)}
+
+async def _claim_due_recrawls():
+    try:
+        await init_models()
+        repository = ScheduleRepository(get_session_factory())
+        return await repository.claim_due(settings.recrawl_max_per_tick, settings.recrawl_lease_seconds)
+    finally:
+        await dispose_engine()
+
+
+@celery_app.task(name='recrawl_batch')
+def recrawl_batch(urls):
+    """Celery task to re-ingest a batch of scheduled URLs incrementally.
+
+    Storing each result moves the URL's schedule forward (see
+    IngestionRepository.save_result); failed runs are retried when their
+    lease expires.
+    """
+    if not recrawls_active():
+        return []
+    results = asyncio.run(_recrawl_batch(urls))
+    return [
+        {"source_url": url, "status": result.job.status, "total_links_found": result.total_links}
+        for url, result in zip(urls, results)
+    ]
+
+async def _recrawl_batch(urls):
+    async with ServiceContainer() as container:
+        async def recrawl(url):
+            # Each URL is its own job with its own budget
+            with job_scope(Priority.BULK, "recrawl"):
+                return await container.ingest_service.ingest_page(
+                    url=url,
+                    include_backlinks=settings.recrawl_include_backlinks,
+                    incremental=True
+                )
+        return await asyncio.gather(*(recrawl(url) for url in urls))
@@ -0,0 +1 @@
+"""Load-test harness: a mock web/search farm and a ramping load generator."""
@@ -0,0 +1,339 @@
+"""Open-loop load generation, process sampling and saturation search."""
+import asyncio
+import math
+import os
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None
+
+# Request kinds the mix can contain
+ENDPOINTS = ("ingest", "summary", "async")
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse a request mix such as ``ingest=2,summary=5,async=1`` into weights."""
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint in mix: {name!r} (expected one of {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Request mix needs at least one endpoint with a positive weight")
+    return mix
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _ms(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value * 1000, 2)
+
+
+@dataclass
+class ProcessSample:
+    at: float
+    rss_mb: float
+    open_sockets: int
+    open_fds: int
+
+
+def _child_pids(pid: int) -> List[int]:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def sample_process(pid: int) -> Optional[ProcessSample]:
+    """RSS and socket/fd counts of a process and its children (uvicorn workers).
+
+    Returns None if the process cannot be read.
+    """
+    try:
+        if psutil is not None:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+            return ProcessSample(
+                at=time.monotonic(),
+                rss_mb=sum(p.memory_info().rss for p in processes) / 2**20,
+                open_sockets=sum(len(p.net_connections(kind="all")) for p in processes),
+                open_fds=sum(p.num_fds() for p in processes) if hasattr(root, "num_fds") else 0,
+            )
+        # Linux without psutil: read /proc directly
+        rss_kb = sockets = fds = 0
+        for process_id in [pid] + _child_pids(pid):
+            with open(f"/proc/{process_id}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        rss_kb += int(line.split()[1])
+                        break
+            fd_dir = f"/proc/{process_id}/fd"
+            for fd in os.listdir(fd_dir):
+                fds += 1
+                try:
+                    if os.readlink(os.path.join(fd_dir, fd)).startswith("socket:"):
+                        sockets += 1
+                except OSError:
+                    continue
+        return ProcessSample(at=time.monotonic(), rss_mb=rss_kb / 1024, open_sockets=sockets, open_fds=fds)
+    except (OSError, ValueError):
+        return None
+    except Exception:  # psutil.Error and friends
+        return None
+
+
+@dataclass
+class StepResult:
+    offered_rps: float
+    duration: float
+    sent: int = 0
+    completed: int = 0  # Within the step, i.e. before its deadline
+    drained: int = 0  # Sent during the step, completed after its deadline
+    backlog_midway: int = 0  # Outstanding halfway through the step
+    backlog: int = 0  # Outstanding at the deadline
+    errors: int = 0
+    shed: int = 0  # Not sent because max_in_flight requests were already outstanding
+    achieved_rps: float = 0.0
+    error_rate: float = 0.0
+    latency_ms: Dict[str, Dict[str, Optional[float]]] = field(default_factory=dict)
+    status_codes: Dict[str, int] = field(default_factory=dict)
+    loop_lag_ms: Dict[str, Optional[float]] = field(default_factory=dict)
+    rss_mb_max: Optional[float] = None
+    open_sockets_max: Optional[int] = None
+    open_fds_max: Optional[int] = None
+    samples: List[Dict[str, float]] = field(default_factory=list)
+    saturated: bool = False
+    saturation_reason: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# p99 latency (seconds) per request kind above which a step counts as saturated
+DEFAULT_P99_SLO = {"ingest": 15.0, "summary": 1.0, "async": 0.5}
+
+
+def parse_slo(spec: str) -> Dict[str, float]:
+    """Parse per-endpoint p99 limits such as ``ingest=15,summary=1``, on top of the defaults."""
+    slo = dict(DEFAULT_P99_SLO)
+    for part in filter(None, spec.split(",")):
+        name, _, seconds = part.partition("=")
+        if name.strip() not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint in SLO: {name!r}")
+        slo[name.strip()] = float(seconds)
+    return slo
+
+
+@dataclass
+class SaturationCriteria:
+    """When a step counts as saturated.
+
+    Throughput is judged by backlog growth rather than by comparing achieved
+    and offered rates, which differ by Poisson noise alone (about 10% at
+    100 arrivals). A server that keeps up has a steady number of requests
+    outstanding (Poisson, so its variance equals its mean); one that falls
+    behind has more outstanding at the end of the step than halfway through.
+    Growth beyond ``backlog_sigmas`` standard deviations counts.
+    """
+
+    backlog_sigmas: float = 3.0
+    max_error_rate: float = 0.01
+    max_p99: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_P99_SLO))
+
+    def check(self, step: StepResult) -> Optional[str]:
+        if step.shed:
+            return f"{step.shed} requests shed at the in-flight cap"
+        growth = step.backlog - step.backlog_midway
+        if growth > self.backlog_sigmas * math.sqrt(step.backlog + step.backlog_midway) + 1:
+            return f"backlog grew from {step.backlog_midway} to {step.backlog} requests"
+        if step.error_rate > self.max_error_rate:
+            return f"error rate {step.error_rate:.1%}"
+        for kind, limit in self.max_p99.items():
+            p99 = step.latency_ms.get(kind, {}).get("p99")
+            if p99 is not None and p99 > limit * 1000:
+                return f"{kind} p99 {p99:.0f} ms over {limit * 1000:.0f} ms"
+        return None
+
+
+RequestFactory = Callable[[str, random.Random], Tuple[str, str, dict]]
+
+
+class LoadGenerator:
+    """Drives an app at a fixed request rate and measures what it sustains.
+
+    Arrivals are open-loop (Poisson at the offered rate) so a slow server
+    cannot slow the generator down and hide its own queueing. Event-loop lag
+    is approximated by the latency of ``/health`` probes, which do no work
+    beyond being scheduled on the loop.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        mix: Dict[str, float],
+        request_factory: RequestFactory,
+        pid: Optional[int] = None,
+        max_in_flight: int = 1000,
+        timeout: float = 30.0,
+        probe_interval: float = 0.1,
+        sample_interval: float = 0.5,
+        seed: int = 1,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.kinds = list(mix)
+        self.weights = [mix[kind] for kind in self.kinds]
+        self.request_factory = request_factory
+        self.pid = pid
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.probe_interval = probe_interval
+        self.sample_interval = sample_interval
+        self.rng = random.Random(seed)
+
+    async def run_step(self, client: httpx.AsyncClient, rps: float, duration: float) -> StepResult:
+        step = StepResult(offered_rps=rps, duration=duration)
+        latencies: Dict[str, List[float]] = {kind: [] for kind in self.kinds}
+        lags: List[float] = []
+        samples: List[ProcessSample] = []
+        in_flight: set = set()
+        deadline = time.monotonic() + duration
+
+        async def one(kind: str) -> None:
+            method, path, options = self.request_factory(kind, self.rng)
+            start = time.monotonic()
+            try:
+                response = await client.request(method, path, **options)
+                code = str(response.status_code)
+                ok = response.status_code < 400
+            except httpx.HTTPError as e:
+                code, ok = type(e).__name__, False
+            finished = time.monotonic()
+            elapsed = finished - start
+            step.status_codes[code] = step.status_codes.get(code, 0) + 1
+            if finished <= deadline:
+                step.completed += 1
+            else:
+                step.drained += 1
+            latencies[kind].append(elapsed)
+            if not ok:
+                step.errors += 1
+
+        async def probe() -> None:
+            while True:
+                start = time.monotonic()
+                try:
+                    await client.get("/health")
+                    lags.append(time.monotonic() - start)
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(self.probe_interval)
+
+        async def sample() -> None:
+            while self.pid is not None:
+                result = await asyncio.to_thread(sample_process, self.pid)
+                if result is not None:
+                    samples.append(result)
+                await asyncio.sleep(self.sample_interval)
+
+        async def midway() -> None:
+            await asyncio.sleep(duration / 2)
+            step.backlog_midway = len(in_flight)
+
+        background = [asyncio.create_task(probe()), asyncio.create_task(sample()), asyncio.create_task(midway())]
+        try:
+            next_at = time.monotonic()
+            while True:
+                next_at += self.rng.expovariate(rps)
+                if next_at >= deadline:
+                    break
+                await asyncio.sleep(max(0.0, next_at - time.monotonic()))
+                if len(in_flight) >= self.max_in_flight:
+                    step.shed += 1
+                    continue
+                kind = self.rng.choices(self.kinds, self.weights)[0]
+                task = asyncio.create_task(one(kind))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+                step.sent += 1
+            await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+            step.backlog = step.sent - step.completed
+        finally:
+            for task in background:
+                task.cancel()
+            # Requests sent during the step are given until the client timeout
+            # to finish; any still running after that count as not completed
+            if in_flight:
+                await asyncio.wait(list(in_flight), timeout=self.timeout)
+                for task in in_flight:
+                    task.cancel()
+
+        step.achieved_rps = round(step.completed / duration, 2)
+        finished = step.completed + step.drained
+        step.error_rate = step.errors / finished if finished else 0.0
+        every = [value for values in latencies.values() for value in values]
+        for kind, values in list(latencies.items()) + [("all", every)]:
+            step.latency_ms[kind] = {
+                "count": len(values),
+                "p50": _ms(percentile(values, 50)),
+                "p90": _ms(percentile(values, 90)),
+                "p99": _ms(percentile(values, 99)),
+                "max": _ms(max(values) if values else None),
+            }
+        step.loop_lag_ms = {
+            "p50": _ms(percentile(lags, 50)),
+            "p99": _ms(percentile(lags, 99)),
+            "max": _ms(max(lags) if lags else None),
+        }
+        if samples:
+            step.rss_mb_max = round(max(s.rss_mb for s in samples), 1)
+            step.open_sockets_max = max(s.open_sockets for s in samples)
+            step.open_fds_max = max(s.open_fds for s in samples)
+            start = samples[0].at
+            step.samples = [
+                {"t": round(s.at - start, 2), "rss_mb": round(s.rss_mb, 1), "sockets": s.open_sockets, "fds": s.open_fds}
+                for s in samples
+            ]
+        return step
+
+    async def ramp(
+        self,
+        start_rps: float,
+        factor: float,
+        max_rps: float,
+        step_duration: float,
+        criteria: SaturationCriteria,
+        on_step: Optional[Callable[[StepResult], None]] = None,
+    ) -> List[StepResult]:
+        """Raise the offered rate step by step until the app saturates or max_rps is reached."""
+        limits = httpx.Limits(max_connections=self.max_in_flight + 10, max_keepalive_connections=self.max_in_flight)
+        steps: List[StepResult] = []
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=limits) as client:
+            rps = start_rps
+            while rps <= max_rps:
+                step = await self.run_step(client, rps, step_duration)
+                reason = criteria.check(step)
+                step.saturated = reason is not None
+                step.saturation_reason = reason
+                steps.append(step)
+                if on_step is not None:
+                    on_step(step)
+                if step.saturated:
+                    break
+                rps = round(rps * factor, 2)
+        return steps
@@ -0,0 +1,214 @@
+"""Capacity test for the API: ramp load until it saturates and report what it sustained.
+
+    python -m benchmarks.loadtest --mix ingest=1,summary=4,async=1 --output report.json
+
+By default the mock farm (benchmarks.mock_farm) and the app (uvicorn
+app.main:app) are started as subprocesses, with the app's DNS and Bing
+endpoint pointed at the farm. Pass ``--target`` to drive an app that is
+already running instead (add ``--pid`` to sample its RSS and sockets).
+
+Each step offers a fixed request rate for ``--step-duration`` seconds and
+records sustained RPS, latency percentiles per endpoint, event-loop lag
+(``/health`` probe latency), RSS and open sockets. The rate is multiplied
+by ``--factor`` until a step saturates (throughput falls behind, errors
+or p99 latency exceed their limits); the report names the highest rate
+sustained before that.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.loadgen import LoadGenerator, SaturationCriteria, StepResult, parse_mix, parse_slo
+from benchmarks.mock_farm import FARM_DOMAIN, MockFarm
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {process.returncode} before becoming ready")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout:.0f}s")
+
+
+@contextmanager
+def _process(args: List[str], env: Dict[str, str], ready_url: str) -> Iterator[subprocess.Popen]:
+    process = subprocess.Popen(args, env=env)
+    try:
+        _wait_ready(ready_url, process)
+        yield process
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def app_environment(farm_port: int, args: argparse.Namespace) -> Dict[str, str]:
+    """Settings for an app under test that only talks to the mock farm."""
+    env = dict(os.environ)
+    env.update({
+        "DNS_RESOLVER": "static",
+        "DNS_STATIC_HOSTS": json.dumps({f"*.{FARM_DOMAIN}": ["127.0.0.1"]}),
+        "BING_API_KEY": "load-test",
+        "BING_API_URL": f"http://search.{FARM_DOMAIN}:{farm_port}/v7.0/search",
+        "BACKLINK_PROVIDERS": json.dumps([{"name": "bing", "order": 10}]),
+        "RATE_LIMIT_ENABLED": "false",
+        "PERSIST_RESULTS": "false",
+        "LOG_LEVEL": "WARNING",
+        "DEBUG_ENDPOINTS_ENABLED": "true",
+    })
+    if args.no_redis:
+        env["INGEST_COALESCING_ENABLED"] = "false"
+    return env
+
+
+def request_factory(farm: MockFarm, args: argparse.Namespace):
+    ingest_body = {
+        "include_backlinks": not args.links_only,
+        "max_backlinks_per_link": args.max_backlinks_per_link,
+    }
+
+    def make(kind: str, rng: random.Random) -> Tuple[str, str, dict]:
+        url = farm.random_page_url(rng)
+        if kind == "summary":
+            return "GET", "/v1/ingest/summary", {"params": {"url": url}}
+        path = "/v1/ingest/async" if kind == "async" else "/v1/ingest/"
+        return "POST", path, {"json": dict(ingest_body, url=url)}
+
+    return make
+
+
+def print_step(step: StepResult) -> None:
+    latency = step.latency_ms["all"]
+    print(
+        f"offered {step.offered_rps:8.1f} rps  achieved {step.achieved_rps:8.1f}  backlog {step.backlog:5d}  "
+        f"err {step.error_rate:6.1%}  p50 {latency['p50'] or 0:8.1f} ms  p99 {latency['p99'] or 0:8.1f} ms  "
+        f"lag p99 {step.loop_lag_ms['p99'] or 0:7.1f} ms  rss {step.rss_mb_max or 0:7.1f} MB  "
+        f"sockets {step.open_sockets_max or 0:5d}"
+        + (f"  SATURATED: {step.saturation_reason}" if step.saturated else ""),
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def build_report(args: argparse.Namespace, mix: Dict[str, float], steps: List[StepResult]) -> dict:
+    sustained = [step for step in steps if not step.saturated]
+    best = max(sustained, key=lambda step: step.achieved_rps) if sustained else None
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "mix": mix,
+        "slo_p99_seconds": parse_slo(args.slo),
+        "step_duration": args.step_duration,
+        "farm": {"latency": args.farm_latency, "search_latency": args.search_latency, "sites": args.sites},
+        "sustained_rps": best.achieved_rps if best else 0.0,
+        "sustained_p99_ms": best.latency_ms["all"]["p99"] if best else None,
+        "saturated_at_rps": steps[-1].offered_rps if steps and steps[-1].saturated else None,
+        "saturation_reason": steps[-1].saturation_reason if steps and steps[-1].saturated else None,
+        "steps": [step.to_dict() for step in steps],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Ramp load against the API until it saturates")
+    parser.add_argument("--mix", default="ingest=1,summary=4,async=1", help="Request mix weights")
+    parser.add_argument("--start-rps", type=float, default=5.0)
+    parser.add_argument("--factor", type=float, default=1.5, help="Rate multiplier between steps")
+    parser.add_argument("--max-rps", type=float, default=2000.0)
+    parser.add_argument("--step-duration", type=float, default=20.0, help="Seconds per step")
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument(
+        "--slo", default="", help="p99 limits in seconds per endpoint, e.g. ingest=15,summary=1,async=0.5"
+    )
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--max-backlinks-per-link", type=int, default=3)
+    parser.add_argument("--links-only", action="store_true", help="Ingest without backlink lookups")
+    parser.add_argument("--target", help="Base URL of an already running app (skips starting one)")
+    parser.add_argument("--pid", type=int, help="PID of the --target app, to sample RSS and sockets")
+    parser.add_argument("--farm-port", type=int, help="Port of an already running mock farm")
+    parser.add_argument("--farm-latency", type=float, default=0.05)
+    parser.add_argument("--search-latency", type=float, default=0.1)
+    parser.add_argument("--sites", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the started app")
+    parser.add_argument("--no-redis", action="store_true", help="Disable ingestion coalescing (no Redis needed)")
+    parser.add_argument("--output", "-o", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+    mix = parse_mix(args.mix)
+
+    farm_port = args.farm_port or _free_port()
+    farm = MockFarm(port=farm_port, sites=args.sites)
+    criteria = SaturationCriteria(max_error_rate=args.max_error_rate, max_p99=parse_slo(args.slo))
+
+    def run(base_url: str, pid: Optional[int]) -> List[StepResult]:
+        generator = LoadGenerator(
+            base_url, mix, request_factory(farm, args), pid=pid, max_in_flight=args.max_in_flight
+        )
+        return asyncio.run(generator.ramp(
+            args.start_rps, args.factor, args.max_rps, args.step_duration, criteria, on_step=print_step
+        ))
+
+    python = sys.executable
+    farm_args = [
+        python, "-m", "benchmarks.mock_farm", "--port", str(farm_port), "--sites", str(args.sites),
+        "--latency", str(args.farm_latency), "--search-latency", str(args.search_latency),
+    ]
+    with _maybe_process(None if args.farm_port else farm_args, dict(os.environ), f"http://127.0.0.1:{farm_port}/robots.txt"):
+        if args.target:
+            steps = run(args.target, args.pid)
+        else:
+            app_port = _free_port()
+            app_args = [
+                python, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(app_port),
+                "--log-level", "warning", "--no-access-log", "--workers", str(args.workers),
+            ]
+            with _process(app_args, app_environment(farm_port, args), f"http://127.0.0.1:{app_port}/health") as app:
+                steps = run(f"http://127.0.0.1:{app_port}", app.pid)
+
+    report = build_report(args, mix, steps)
+    print(
+        f"Sustained {report['sustained_rps']} rps (p99 {report['sustained_p99_ms']} ms); "
+        f"saturated at {report['saturated_at_rps']} rps: {report['saturation_reason']}",
+        file=sys.stderr,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+    return 0
+
+
+@contextmanager
+def _maybe_process(args: Optional[List[str]], env: Dict[str, str], ready_url: str) -> Iterator[None]:
+    if args is None:
+        yield
+        return
+    with _process(args, env, ready_url):
+        yield
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""Local stand-in for the web and the search API, for load tests.
+
+Serves a synthetic link graph of ``--sites`` sites under ``*.farm.test`` plus
+a Bing-compatible search endpoint, from one port:
+
+    python -m benchmarks.mock_farm --port 9100 --latency 0.05
+
+Point the app at it with ``DNS_RESOLVER=static``,
+``DNS_STATIC_HOSTS='{"*.farm.test": ["127.0.0.1"]}'`` and
+``BING_API_URL=http://search.farm.test:9100/v7.0/search``. Pages are
+deterministic per URL, so runs are comparable.
+"""
+import argparse
+import asyncio
+import json
+import random
+import zlib
+from typing import List
+from urllib.parse import parse_qs
+
+FARM_DOMAIN = "farm.test"
+
+
+class MockFarm:
+    """ASGI app serving farm pages, robots.txt and search results."""
+
+    def __init__(
+        self,
+        port: int,
+        sites: int = 50,
+        pages_per_site: int = 200,
+        links_per_page: int = 40,
+        latency: float = 0.05,
+        search_latency: float = 0.1,
+        error_rate: float = 0.0,
+    ):
+        self.port = port
+        self.sites = sites
+        self.pages_per_site = pages_per_site
+        self.links_per_page = links_per_page
+        self.latency = latency
+        self.search_latency = search_latency
+        self.error_rate = error_rate
+
+    def page_url(self, site: int, page: int) -> str:
+        return f"http://site-{site}.{FARM_DOMAIN}:{self.port}/page/{page}"
+
+    def random_page_url(self, rng: random.Random) -> str:
+        return self.page_url(rng.randrange(self.sites), rng.randrange(self.pages_per_site))
+
+    async def _delay(self, mean: float, rng: random.Random) -> None:
+        if mean > 0:
+            # Long-tailed like real servers: most responses are fast, a few are slow
+            await asyncio.sleep(rng.lognormvariate(0, 0.75) * mean * 0.75)
+
+    def _render_page(self, host: str, path: str) -> bytes:
+        rng = random.Random(zlib.crc32(f"{host}{path}".encode()))
+        nav = "".join(f'<a href="/page/{i}">Section {i}</a>' for i in range(8))
+        body: List[str] = []
+        for i in range(self.links_per_page):
+            if rng.random() < 0.3:
+                href = self.random_page_url(rng)
+                text = f"External reference {i} about topic {rng.randrange(1000)}"
+            else:
+                href = f"/page/{rng.randrange(self.pages_per_site)}"
+                text = rng.choice(["Read more", f"Article {i} on subject {rng.randrange(1000)}", ""])
+            body.append(f'<p>Paragraph {i} {"lorem ipsum " * 20}<a href="{href}">{text}</a></p>')
+        html = (
+            f"<html><head><title>{host}{path}</title>"
+            f'<meta name="description" content="Synthetic page {path}"></head><body>'
+            f"<nav>{nav}</nav><main>{''.join(body)}</main>"
+            f'<footer><a href="/privacy">Privacy</a><a href="mailto:info@{host}">Contact</a></footer>'
+            "</body></html>"
+        )
+        return html.encode()
+
+    def _search(self, query: str) -> bytes:
+        params = parse_qs(query)
+        target = params.get("q", [""])[0]
+        count = int(params.get("count", ["10"])[0])
+        rng = random.Random(zlib.crc32(target.encode()))
+        pages = [
+            {"url": self.random_page_url(rng), "name": f"Result {i}", "snippet": "Synthetic result"}
+            for i in range(count)
+        ]
+        return json.dumps({"webPages": {"value": pages}}).encode()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        rng = random.Random()
+        path = scope["path"]
+        host = dict(scope["headers"]).get(b"host", b"").decode().split(":")[0]
+        status, content_type = 200, b"text/html; charset=utf-8"
+        if path == "/robots.txt":
+            body = b"User-agent: *\nAllow: /\n"
+            content_type = b"text/plain"
+        elif path.startswith("/v7.0/search"):
+            await self._delay(self.search_latency, rng)
+            body = self._search(scope["query_string"].decode())
+            content_type = b"application/json"
+        elif self.error_rate and rng.random() < self.error_rate:
+            status, body = 503, b"Service Unavailable"
+        else:
+            await self._delay(self.latency, rng)
+            body = self._render_page(host, path)
+
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def main(argv=None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the mock web and search farm")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--sites", type=int, default=50)
+    parser.add_argument("--pages-per-site", type=int, default=200)
+    parser.add_argument("--links-per-page", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean page latency (seconds)")
+    parser.add_argument("--search-latency", type=float, default=0.1, help="Mean search latency (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of page requests answered 503")
+    args = parser.parse_args(argv)
+
+    farm = MockFarm(
+        port=args.port,
+        sites=args.sites,
+        pages_per_site=args.pages_per_site,
+        links_per_page=args.links_per_page,
+        latency=args.latency,
+        search_latency=args.search_latency,
+        error_rate=args.error_rate,
+    )
+    uvicorn.run(farm, host="127.0.0.1", port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Startup-time benchmark: import cost per module, and time until the API is live and ready.
+
+    python -m benchmarks.startup --module app.main --runs 5 --top 25
+    python -m benchmarks.startup --serve --output startup.json
+
+Each run imports ``--module`` in a fresh interpreter under ``python -X
+importtime`` and the per-module self and cumulative times are reported as
+medians over the runs, along with self time summed per top-level package.
+With ``--serve`` the app is also started under uvicorn a few times and the
+seconds until ``/health`` (live) and ``/ready`` (warm) answer 200 are
+measured.
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+# "import time:  self [us] | cumulative | imported package" (stderr of python -X importtime)
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass
+class ModuleTiming:
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+@dataclass
+class ImportReport:
+    module: str
+    runs: int
+    total_ms: float
+    modules: List[ModuleTiming] = field(default_factory=list)
+    packages_ms: Dict[str, float] = field(default_factory=dict)
+
+
+def parse_importtime(output: str) -> Dict[str, ModuleTiming]:
+    """Per-module timings from ``-X importtime`` output, in milliseconds."""
+    timings: Dict[str, ModuleTiming] = {}
+    for line in output.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        timings[module] = ModuleTiming(
+            module=module,
+            self_ms=int(self_us) / 1000,
+            cumulative_ms=int(cumulative_us) / 1000,
+            depth=max(0, (len(indent) - 1) // 2),
+        )
+    return timings
+
+
+def measure_imports(module: str, runs: int, env: Dict[str, str]) -> ImportReport:
+    """Import module in ``runs`` fresh interpreters and take per-module medians."""
+    samples: List[Dict[str, ModuleTiming]] = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+        samples.append(parse_importtime(result.stderr))
+
+    modules: List[ModuleTiming] = []
+    for name, first in samples[-1].items():
+        seen = [sample[name] for sample in samples if name in sample]
+        modules.append(ModuleTiming(
+            module=name,
+            self_ms=round(statistics.median(t.self_ms for t in seen), 2),
+            cumulative_ms=round(statistics.median(t.cumulative_ms for t in seen), 2),
+            depth=first.depth,
+        ))
+
+    packages: Dict[str, float] = {}
+    for timing in modules:
+        package = timing.module.split(".")[0]
+        packages[package] = round(packages.get(package, 0.0) + timing.self_ms, 2)
+
+    total = next((t.cumulative_ms for t in modules if t.module == module), 0.0)
+    return ImportReport(
+        module=module,
+        runs=runs,
+        total_ms=total,
+        modules=sorted(modules, key=lambda t: -t.cumulative_ms),
+        packages_ms=dict(sorted(packages.items(), key=lambda item: -item[1])),
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(url: str, process: subprocess.Popen, started: float, timeout: float) -> Optional[float]:
+    while time.monotonic() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"App exited with code {process.returncode} during startup")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return round(time.monotonic() - started, 3)
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.01)
+    return None
+
+
+def measure_serve(runs: int, env: Dict[str, str], timeout: float) -> List[Dict[str, Optional[float]]]:
+    """Seconds from spawning uvicorn until /health and /ready answer 200."""
+    results = []
+    for _ in range(runs):
+        port = _free_port()
+        started = time.monotonic()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--log-level", "warning", "--no-access-log"],
+            env=env,
+        )
+        try:
+            live = _wait_for(f"http://127.0.0.1:{port}/health", process, started, timeout)
+            ready = _wait_for(f"http://127.0.0.1:{port}/ready", process, started, timeout)
+            results.append({"live_seconds": live, "ready_seconds": ready})
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure import time per module and time to ready")
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=25, help="Modules to print, by cumulative time")
+    parser.add_argument("--serve", action="store_true", help="Also time uvicorn startup until /health and /ready")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for /ready")
+    parser.add_argument("--output", "-o", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    env.setdefault("LOG_LEVEL", "WARNING")
+    report = measure_imports(args.module, args.runs, env)
+    print(f"import {report.module}: {report.total_ms:.1f} ms (median of {report.runs})", file=sys.stderr)
+    for timing in report.modules[:args.top]:
+        print(
+            f"{timing.cumulative_ms:9.1f} ms  {timing.self_ms:8.1f} ms self  {'  ' * timing.depth}{timing.module}",
+            file=sys.stderr,
+        )
+    print("self time per package:", file=sys.stderr)
+    for package, ms in list(report.packages_ms.items())[:args.top]:
+        print(f"{ms:9.1f} ms  {package}", file=sys.stderr)
+
+    result = asdict(report)
+    if args.serve:
+        result["serve"] = measure_serve(args.runs, env, args.timeout)
+        for run in result["serve"]:
+            print(f"live after {run['live_seconds']} s, ready after {run['ready_seconds']} s", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+import pytest
+
+from app.infrastructure.ratelimit.gcra import MemoryRateLimitBackend, RateLimitPolicy, RateLimiter
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingBackend(MemoryRateLimitBackend):
+    def __init__(self, clock):
+        super().__init__(clock=clock)
+        self.calls = 0
+
+    async def check(self, *args, **kwargs):
+        self.calls += 1
+        return await super().check(*args, **kwargs)
+
+
+class FailingBackend:
+    async def check(self, *args, **kwargs):
+        raise OSError("connection refused")
+
+    async def close(self):
+        pass
+
+
+# 10 cost units per 10 seconds: one unit comes back every second
+POLICY = RateLimitPolicy(limit=10, window=10.0)
+
+
+def make_limiter(clock, lease_size=4, lease_ttl=1.0):
+    backend = CountingBackend(clock)
+    return RateLimiter(POLICY, backend, lease_size=lease_size, lease_ttl=lease_ttl, clock=clock), backend
+
+
+@pytest.mark.asyncio
+async def test_denies_past_burst_until_retry_after():
+    clock = FakeClock()
+    limiter, _ = make_limiter(clock, lease_size=1)
+
+    results = [await limiter.check("ip:a") for _ in range(11)]
+
+    assert [r.allowed for r in results] == [True] * 10 + [False]
+    assert results[-1].retry_after == pytest.approx(1.0)
+    clock.now += 1.0
+    assert (await limiter.check("ip:a")).allowed
+
+
+@pytest.mark.asyncio
+async def test_cost_is_charged_in_units():
+    clock = FakeClock()
+    limiter, _ = make_limiter(clock, lease_size=1)
+
+    assert (await limiter.check("ip:a", cost=7)).remaining == 3
+    assert not (await limiter.check("ip:a", cost=7)).allowed
+    assert (await limiter.check("ip:a", cost=3)).allowed
+
+
+@pytest.mark.asyncio
+async def test_lease_serves_repeat_requests_locally():
+    clock = FakeClock()
+    limiter, backend = make_limiter(clock)
+
+    results = [await limiter.check("ip:a") for _ in range(12)]
+
+    assert sum(r.allowed for r in results) == 10
+    assert [r.remaining for r in results[:10]] == list(range(9, -1, -1))
+    assert backend.calls < 10
+
+
+@pytest.mark.asyncio
+async def test_one_off_request_reserves_only_its_cost():
+    clock = FakeClock()
+    limiter, backend = make_limiter(clock)
+
+    result = await limiter.check("ip:a", cost=2)
+
+    assert result.granted == 2
+    assert backend._tat["ip:a"] - clock.now == pytest.approx(2.0)
+
+
+@pytest.mark.asyncio
+async def test_unspent_lease_is_refunded():
+    clock = FakeClock()
+    limiter, backend = make_limiter(clock, lease_ttl=0.5)
+    await limiter.check("ip:a")
+    await limiter.check("ip:a")  # Reserves 4 units, spends 1
+
+    clock.now += 0.6  # Lease expired with 3 units unspent
+    result = await limiter.check("ip:a", cost=8)
+
+    # 2 units spent and 0.6 regenerated; without the refund only 5 would be free
+    assert result.allowed
+    assert backend.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_lease_never_admits_past_quota_near_the_limit():
+    clock = FakeClock()
+    limiter, _ = make_limiter(clock)
+
+    assert (await limiter.check("ip:a", cost=7)).allowed
+    assert (await limiter.check("ip:a", cost=2)).allowed
+    assert not (await limiter.check("ip:a", cost=2)).allowed
+    assert (await limiter.check("ip:a", cost=1)).allowed
+    assert not (await limiter.check("ip:a", cost=1)).allowed
+
+
+@pytest.mark.asyncio
+async def test_denial_is_cached_locally():
+    clock = FakeClock()
+    limiter, backend = make_limiter(clock, lease_size=1)
+    for _ in range(11):
+        await limiter.check("ip:a")
+    calls = backend.calls
+
+    result = await limiter.check("ip:a")
+
+    assert not result.allowed
+    assert backend.calls == calls
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_memory_when_backend_fails():
+    clock = FakeClock()
+    limiter = RateLimiter(POLICY, FailingBackend(), lease_size=1, clock=clock)
+
+    results = [await limiter.check("ip:a") for _ in range(11)]
+
+    assert [r.allowed for r in results] == [True] * 10 + [False]
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.concurrency.scheduler import (
+    SHARED_TENANT, JobBudget, Priority, SharedJobs, current_job, job_scope
+)
+
+
+def budget(priority: Priority) -> JobBudget:
+    return JobBudget(max_fetches=10 if priority == Priority.INTERACTIVE else 100)
+
+
+async def join(shared: SharedJobs, priority: Priority, tenant: str, work):
+    with job_scope(priority, tenant) as own:
+        result = await shared.do("key", work)
+        # The caller's own scope is left untouched
+        assert current_job.get() is own
+        return result
+
+
+@pytest.mark.asyncio
+async def test_shared_job_is_promoted_by_a_more_urgent_caller():
+    shared = SharedJobs(budget=budget)
+    started = asyncio.Event()
+    release = asyncio.Event()
+    jobs = []
+
+    async def work():
+        jobs.append(current_job.get())
+        started.set()
+        await release.wait()
+        return "done"
+
+    background = asyncio.ensure_future(join(shared, Priority.BACKGROUND, "a", work))
+    await started.wait()
+    assert jobs[0].priority == Priority.BACKGROUND
+    assert jobs[0].tenant == "a"
+
+    interactive = asyncio.ensure_future(join(shared, Priority.INTERACTIVE, "b", work))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await background == await interactive == "done"
+    assert len(jobs) == 1
+    assert jobs[0].priority == Priority.INTERACTIVE
+    assert jobs[0].tenant == SHARED_TENANT
+    # The larger of the two budgets, so the background caller still gets its result
+    assert jobs[0].budget.max_fetches == 100
+    assert len(shared) == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_job_is_not_the_callers_job():
+    shared = SharedJobs(budget=budget)
+
+    async def work():
+        job = current_job.get()
+        job.fetches += 1
+        return job
+
+    with job_scope(Priority.INTERACTIVE, "a") as own:
+        job = await shared.do("key", work)
+
+    assert job is not own
+    assert own.fetches == 0
+    assert job.tenant == "a"
+    # A later call starts a fresh job
+    assert (await shared.do("key", work)) is not job
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+from app.infrastructure.parsers.sitemap import FeedLinkParser, SitemapParser
+
+
+def parse(document: bytes) -> SitemapParser:
+    parser = SitemapParser()
+    parser.feed(document)
+    parser.close()
+    return parser
+
+
+def test_rss_items_are_page_entries():
+    parser = parse(
+        b"<rss><channel><link>https://a.example/</link>"
+        b"<item><link>https://a.example/post</link>"
+        b"<pubDate>Mon, 05 Oct 2026 10:00:00 +0200</pubDate></item>"
+        b"</channel></rss>"
+    )
+
+    assert [entry.loc for entry in parser.urls] == ["https://a.example/post"]
+    assert parser.urls[0].lastmod == datetime(2026, 10, 5, 8, 0, tzinfo=timezone.utc)
+
+
+def test_atom_entries_use_the_alternate_link_and_updated():
+    parser = parse(
+        b'<feed xmlns="http://www.w3.org/2005/Atom"><link href="https://a.example/"/>'
+        b'<entry><link rel="edit" href="/edit/1"/><link href="/post"/>'
+        b"<published>2026-01-01T00:00:00Z</published><updated>2026-02-01T00:00:00Z</updated></entry>"
+        b"</feed>"
+    )
+
+    assert [entry.loc for entry in parser.urls] == ["/post"]
+    assert parser.urls[0].lastmod == datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+
+def test_feed_links_are_read_from_the_head_only():
+    parser = FeedLinkParser("https://a.example/blog/")
+    parser.feed(
+        b'<html><head><link rel="stylesheet" href="/site.css">'
+        b'<link rel="alternate" type="application/rss+xml" href="feed.xml">'
+        b'<link rel="alternate" type="application/atom+xml" href="javascript:void(0)">'
+        b'</head><body><link rel="alternate" type="application/atom+xml" href="/late"></body></html>'
+    )
+    parser.close()
+
+    assert parser.feeds == ["https://a.example/blog/feed.xml"]